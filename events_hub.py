@@ -1,3 +1,5 @@
+import threading
+
 import pygame as pg
 
 from utils import Queue
@@ -14,6 +16,8 @@ class Event:
     CUBE_SHUFFLE = "CUBE_SHUFFLE"
     CUBE_STATE_CHANGED = "CUBE_STATE_CHANGED"
 
+    SOLVER_FINISHED = "SOLVER_FINISHED"
+
     CAMERA_MOVE = "CAMERA_MOVE"
     CAMERA_MOVE_ABOUT = "CAMERA_MOVE_ABOUT"
     CAMERA_RESET = "CAMERA_RESET"
@@ -39,6 +43,10 @@ class Event:
         return f"<Event: {self.__dict__}>"
 
 
+# Events which do not change the scene, so no frame has to be drawn for them
+NOT_DRAWN_EVENTS = {Event.NEWFRAME, Event.SOLVER_FINISHED}
+
+
 class EventsHub:
     """Implements an event aggregator to gather events from both interfaces as well as the application itself.
     Similar to an Observer pattern.
@@ -57,21 +65,33 @@ class EventsHub:
     def __init__(self):
         self._events = Queue()
         self._callbacks = {}
+        self._raised = threading.Event()  # Set when an event is raised, to wake up wait
 
     def raise_event(self, event):
         self._events.put(event)
+        self._raised.set()
+
+    def wait(self, timeout=None):
+        """Block until an event is raised (from any thread) or timeout (in seconds) is elapsed."""
+        self._raised.wait(timeout)
+        self._raised.clear()
 
     def add_callback(self, event_name, callback):
         self._callbacks.setdefault(event_name, []).append(callback)
 
     def handle_events(self):
+        """Run the callbacks of all pending events. Returns whether any of them may change the scene (is not in
+        NOT_DRAWN_EVENTS)."""
+        handled = False
         while not self._events.empty():
             event = self._events.pop()
+            handled |= event.type not in NOT_DRAWN_EVENTS
             if event.type in [Event.QUIT, Event.NEWFRAME]:
                 # print("Handling", event, self._callbacks.get(event.type, []))
                 pass
             for callback in self._callbacks.get(event.type, []):
                 callback(event)
+        return handled
 
 
 if __name__ == '__main__':
@@ -1,4 +1,5 @@
 # All threading logic is done here
+import argparse
 from threading import Thread
 
 import pygame as pg
@@ -11,19 +12,34 @@ from events_hub import EventsHub, Event
 from utils import profile
 
 
-def run_cube_sim():
-    """Run main pygame loop, and handle events at each loop."""
-    global cube, event_hub, app
+FPS = 30
+IDLE_TIMEOUT = 0.05  # Seconds between two reads of pygame inputs while idle
+
+
+def run_cube_sim(fps=FPS):
+    """Run main pygame loop, and handle events at each loop.
+    Frames are only drawn while the cube or the camera moves, after events changing the scene, or when the window
+    was exposed or resized: otherwise the loop waits for events.
+    fps caps the frame rate while drawing, 0 for no cap (benchmarks)."""
+    global cube, camera, event_hub, app
     app.setup()
     clock = pg.time.Clock()
     clock.tick()
 
+    redraw = True
     while not app.closed:
-        app.draw_frame(cube)
-
-        dt = clock.tick(30)
-        app.event_hub.raise_event(Event(origin=Event.APPLICATION, type=Event.NEWFRAME, dt=dt))
-        event_hub.handle_events()
+        draw = redraw or cube.is_animating() or camera.is_moving() or app.is_interacting()
+        exposed = False
+        if draw:
+            dt = clock.tick(fps)
+            event_hub.raise_event(Event(origin=Event.APPLICATION, type=Event.NEWFRAME, dt=dt))
+        else:
+            event_hub.wait(IDLE_TIMEOUT)
+            exposed = app.gather_events()
+            clock.tick()  # Time spent idle is not animated
+        redraw = event_hub.handle_events() or exposed
+        if draw and not app.closed:
+            app.draw_frame(cube)
 
 
 def run_controls_ui():
@@ -31,6 +47,10 @@ def run_controls_ui():
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="RubiksCube Simulator")
+    parser.add_argument("--fps", type=int, default=FPS, help="Maximum frame rate while animating, 0 for no cap")
+    args = parser.parse_args()
+
     with profile(on=False):
         event_hub = EventsHub()
         cube = RubiksCubeDrawer(event_hub)
@@ -42,7 +62,7 @@ if __name__ == '__main__':
         app = OpenGLApp(event_hub)
         dash = Dashboard(event_hub)
 
-        tCube = Thread(target=run_cube_sim)
+        tCube = Thread(target=run_cube_sim, args=(args.fps,))
         tCube.start()
 
         run_controls_ui()  # Tkinter needs to be called from main thread
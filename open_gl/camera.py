@@ -39,6 +39,10 @@ class Camera:
     def rotate_about(self, rot_vect):
         self.camera_rot = Rotation.from_rotvec(rot_vect) * self.camera_rot
 
+    def is_moving(self):
+        """Whether the camera turns by itself on each frame."""
+        return self.rot_delta.magnitude() > 0
+
     def toggle_cube_rot(self):
         if np.linalg.norm(self.rot_delta.as_rotvec()) < 0.01:
             self.rot_delta = Rotation.from_rotvec([0, self.SLOW_ROT_SPEED, 0])
@@ -2,6 +2,7 @@ import numpy as np
 from OpenGL.GL import *
 from scipy.spatial.transform.rotation import Rotation
 
+from open_gl.cube_mesh import FACE_COLORS
 from utils import Color
 
 
@@ -17,9 +18,7 @@ class Cube:
     EDGES = [(0, 1), (0, 2), (0, 4), (1, 3), (1, 5), (2, 3), (2, 6),
              (3, 7), (4, 5), (4, 6), (5, 7), (6, 7)]
 
-    COLORS = {"U": Color.WHITE, "D": Color.YELLOW,
-              "L": Color.BLUE, "R": Color.GREEN,
-              "F": Color.ORANGE, "B": Color.RED}
+    COLORS = FACE_COLORS
 
     base_verticies = np.array([(x, y, z) for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)]) / 2
 
@@ -0,0 +1,74 @@
+"""Static mesh of a RubiksCube, made of its 54 visible stickers (see cube_renderer), without any OpenGL call:
+it is shared by the OpenGL and the software renderers.
+
+The mesh is built from the position and direction of each sticker (rubiks_cube.facelets.STICKERS, computed
+from RubiksCube.ORDERED_CUBES_POSITIONS and the colored faces of the cubes). Its N_QUADS quads are:
+ - the body: a black square under each sticker, covering the face of its cube (interior faces are never drawn)
+ - the stickers, whose colors are the only data which change with the state
+ - the cut planes: for each face, two black squares between its layer and the middle layer, one turning with the
+   layer and one not, which close the cube while the layer turns (only drawn then)
+"""
+import numpy as np
+
+from rubiks_cube.constants import FACE_ORDER
+from rubiks_cube.core import get_normal
+from rubiks_cube.facelets import STICKERS, N_FACELETS
+from utils import Color
+
+FACE_COLORS = {"U": Color.WHITE, "D": Color.YELLOW,
+               "L": Color.BLUE, "R": Color.GREEN,
+               "F": Color.ORANGE, "B": Color.RED}
+STICKER_COLORS = np.array([FACE_COLORS[face] for face in FACE_ORDER], dtype=np.float32)
+STICKER_SIZE = 0.9  # Relative to the size of a cube
+STICKER_LIFT = 0.002  # Stickers are drawn slightly above the body, so that they are not hidden by it
+N_QUADS = 2 * N_FACELETS + 2 * len(FACE_ORDER)  # Body, stickers, cut planes
+N_REST_QUADS = 2 * N_FACELETS  # Quads drawn when no layer turns: no cut planes
+
+
+def _square(center, normal, half_size):
+    """4 corners of the square of given center and half size, orthogonal to normal (an axis)."""
+    u, v = np.eye(3)[np.asarray(normal) == 0] * half_size
+    return [center - u - v, center + u - v, center + u + v, center - u + v]
+
+
+def build_mesh(offset):
+    """Vertices of the N_QUADS quads, as a (4 * N_QUADS, 3) array. offset is the distance between two cubes."""
+    half = offset / 2
+    quads = [_square(position * offset + direction * half, direction, half) for position, direction in STICKERS]
+    quads += [_square(position * offset + direction * (half + STICKER_LIFT), direction, STICKER_SIZE / 2)
+              for position, direction in STICKERS]
+    for face in FACE_ORDER:
+        normal = get_normal(face)
+        quads += 2 * [_square(normal * half, normal, 3 * half)]
+    return np.array(quads, dtype=np.float32).reshape(-1, 3)
+
+
+def _quad_normals():
+    """Outward normal of each quad: the side from which it can be seen."""
+    normals = [direction for _, direction in STICKERS] * 2
+    for face in FACE_ORDER:
+        normals += [-get_normal(face), get_normal(face)]  # The cut plane of the layer faces the middle layer
+    return np.array(normals, dtype=np.float64)
+
+
+QUAD_NORMALS = _quad_normals()
+
+
+def quad_colors(facelets):
+    """Colors of the N_QUADS quads for facelets (see rubiks_cube.facelets), as a (N_QUADS, 3) array,
+    or (N, N_QUADS, 3) for a (N, 54) array of facelets."""
+    colors = np.empty(facelets.shape[:-1] + (N_QUADS, 3), dtype=np.float32)
+    colors[:] = Color.HIDDEN
+    colors[..., N_FACELETS:2 * N_FACELETS, :] = STICKER_COLORS[facelets]
+    return colors
+
+
+def _layer_quads(face):
+    """Indices of the quads turning with face, then of the other quads (cut planes included)."""
+    in_layer = np.array([position @ get_normal(face) == 1 for position, _ in STICKERS])
+    quads = np.arange(2 * N_FACELETS).reshape(2, N_FACELETS)
+    cut = 2 * N_FACELETS + 2 * FACE_ORDER.index(face)
+    return np.append(quads[:, in_layer], cut), np.append(quads[:, ~in_layer], cut + 1)
+
+
+LAYER_QUADS = {face: _layer_quads(face) for face in FACE_ORDER}
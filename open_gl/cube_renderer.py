@@ -0,0 +1,74 @@
+"""Retained mode drawing of a RubiksCube, from the static mesh of its 54 visible stickers (see cube_mesh).
+
+The vertices and colors of the mesh are in two vertex buffer objects. At rest the cube is drawn with one
+glDrawArrays call. During a face animation, the quads of the layer are drawn with glDrawElements under a rotation of
+the model matrix, the other quads without it: the cost of a frame does not depend on the number of cubes which move.
+When a move is over, only the colors are uploaded again.
+Buffers are only created on the first draw, when an OpenGL context exists.
+"""
+import numpy as np
+from OpenGL.GL import *
+
+from open_gl.cube_mesh import N_REST_QUADS, LAYER_QUADS, build_mesh, quad_colors
+from rubiks_cube.constants import FACE_ORDER
+from rubiks_cube.core import get_normal
+from rubiks_cube.facelets import SOLVED_FACELETS, state_str_to_facelets
+
+
+def _vertex_indices(quads):
+    return (4 * quads[:, None] + np.arange(4)).ravel().astype(np.uint32)
+
+
+# Indices of the vertices of the quads turning with face, then of the other quads
+LAYER_INDICES = {face: [_vertex_indices(quads) for quads in LAYER_QUADS[face]] for face in FACE_ORDER}
+
+
+class CubeRenderer:
+    """Vertex buffers of the mesh, colored by set_state."""
+    def __init__(self, offset=1.02):
+        self.positions = build_mesh(offset)
+        self.colors = np.repeat(quad_colors(SOLVED_FACELETS), 4, axis=0)
+        self._buffers = None  # (positions, colors) buffer ids
+        self._dirty = True  # Whether colors changed since they were last uploaded
+
+    def set_state(self, state_str):
+        self.colors = np.repeat(quad_colors(state_str_to_facelets(state_str)), 4, axis=0)
+        self._dirty = True
+
+    def _upload(self):
+        if self._buffers is None:
+            self._buffers = glGenBuffers(2)
+            glBindBuffer(GL_ARRAY_BUFFER, self._buffers[0])
+            glBufferData(GL_ARRAY_BUFFER, self.positions.nbytes, self.positions, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, self._buffers[1])
+        glBufferData(GL_ARRAY_BUFFER, self.colors.nbytes, self.colors, GL_DYNAMIC_DRAW)
+        self._dirty = False
+
+    def draw(self, face=None, angle=0):
+        """Draw the cube, the layer of face (if any) rotated by angle degrees around its normal."""
+        if self._dirty:
+            self._upload()
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, self._buffers[0])
+        glVertexPointer(3, GL_FLOAT, 0, None)
+        glBindBuffer(GL_ARRAY_BUFFER, self._buffers[1])
+        glColorPointer(3, GL_FLOAT, 0, None)
+        if face is None:
+            glDrawArrays(GL_QUADS, 0, 4 * N_REST_QUADS)  # No cut planes
+        else:
+            layer, others = LAYER_INDICES[face]
+            glDrawElements(GL_QUADS, len(others), GL_UNSIGNED_INT, others)
+            glPushMatrix()
+            glRotatef(angle, *get_normal(face))
+            glDrawElements(GL_QUADS, len(layer), GL_UNSIGNED_INT, layer)
+            glPopMatrix()
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    def delete(self):
+        if self._buffers is not None:
+            glDeleteBuffers(2, self._buffers)
+            self._buffers = None
+            self._dirty = True
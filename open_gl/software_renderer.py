@@ -0,0 +1,258 @@
+"""Headless rendering of RubiksCube scenes with a NumPy software rasteriser: no display, no OpenGL.
+
+The mesh of cube_mesh is drawn as in the OpenGL window (perspective of OpenGLApp.setup, camera at CAMERA_DISTANCE
+rotated as Camera.camera_rot, layers turning as in RubiksCubeDrawer) into frames: (height, width, 3) uint8 arrays.
+
+Quads facing the camera are rasterised with a z-buffer into a map of the quad seen at each pixel, which depends on
+the view and on the turning layer, not on the colors. A frame is then a color lookup in this map: frames of many
+states seen from the same view only rasterise once (render_many), so thumbnails of large scramble libraries are cheap.
+Frames are supersampled (samples x samples points per pixel) to smooth the edges.
+
+PNG files are written with zlib only. GIF and MP4 animations need imageio (and pyav or imageio-ffmpeg for MP4),
+numbered PNG files do not:
+    python -m open_gl.software_renderer thumbnails scrambles.txt thumbnails/ --size 128
+    python -m open_gl.software_renderer animation solve.gif --moves "R U R' U'"
+"""
+import argparse
+import struct
+import time
+import zlib
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+from scipy.spatial.transform import Rotation
+
+from open_gl.cube_mesh import N_QUADS, N_REST_QUADS, LAYER_QUADS, QUAD_NORMALS, build_mesh, quad_colors
+from rubiks_cube.core import get_normal
+from rubiks_cube.facelets import move_facelets, state_str_to_facelets, state_strs_to_facelets
+from rubiks_cube.moves import Move, parse_moves
+from rubiks_cube.rubikscube import RubiksCube
+from utils import Color
+
+FOV_Y = 30  # Degrees, as in OpenGLApp.setup
+CAMERA_DISTANCE = 10
+DEG_PER_SEC = 100  # Speed of face animations, as FaceRotationAnimation
+DEFAULT_VIEW = Rotation.from_euler("yx", [-45, 30], degrees=True)  # Shows the U, F and R faces
+NO_QUAD = N_QUADS  # Quad of the pixels of the background in quad maps
+RenderStats = namedtuple("RenderStats", ["frames", "seconds", "fps"])
+
+
+def _triangles(quads):
+    """Indices of the vertices of the 2 triangles of each quad, as a (2 * len(quads), 3) array, and their quads."""
+    corners = 4 * np.repeat(quads, 2)[:, None]
+    return corners + np.tile([[0, 1, 2], [0, 2, 3]], (len(quads), 1)), np.repeat(quads, 2)
+
+
+class SoftwareRenderer:
+    """Renders frames of width x height pixels, seen by a camera with given rotation (a scipy Rotation,
+    see Camera.camera_rot). The view of a renderer does not change: create another one for another view."""
+    def __init__(self, width=256, height=256, rotation=DEFAULT_VIEW, samples=2, background=Color.BLACK,
+                 offset=1.02):
+        self.width = width
+        self.height = height
+        self.samples = samples
+        self.rotation = rotation
+        self.background = np.array(background, dtype=np.float32)
+        self.vertices = build_mesh(offset).astype(np.float64)
+        self._rest_coverage = None  # Coverage when no layer turns, computed on first use
+
+    def _project(self, vertices):
+        """Pixel coordinates (x, y) of vertices in the supersampled frame, and their inverse depth."""
+        view = self.rotation.apply(vertices)
+        depth = CAMERA_DISTANCE - view[:, 2]
+        focal = 1 / np.tan(np.radians(FOV_Y) / 2)
+        height = self.height * self.samples
+        x = (1 + focal * height / (self.width * self.samples) * view[:, 0] / depth) * self.width * self.samples / 2
+        y = (1 - focal * view[:, 1] / depth) * height / 2
+        return x, y, 1 / depth
+
+    def quad_map(self, face=None, angle=0):
+        """Supersampled (height, width) array of the quad seen at each point (NO_QUAD for the background),
+        with the layer of face (if any) rotated by angle degrees around its normal."""
+        if face is None:
+            return self._rasterise(self.vertices, QUAD_NORMALS, np.arange(N_REST_QUADS))
+        vertices, normals = self.vertices.copy(), QUAD_NORMALS.copy()
+        layer, others = LAYER_QUADS[face]
+        turn = Rotation.from_rotvec(np.radians(angle) * get_normal(face))
+        layer_vertices = (4 * layer[:, None] + np.arange(4)).ravel()
+        vertices[layer_vertices] = turn.apply(vertices[layer_vertices])
+        normals[layer] = turn.apply(normals[layer])
+        return self._rasterise(vertices, normals, np.concatenate([layer, others]))
+
+    def _rasterise(self, vertices, normals, quads):
+        width, height = self.width * self.samples, self.height * self.samples
+        # Back face culling: quads whose outward normal points away from the camera are hidden
+        camera = self.rotation.inv().apply([0, 0, CAMERA_DISTANCE])
+        centers = vertices.reshape(-1, 4, 3).mean(axis=1)
+        quads = quads[np.einsum("ij,ij->i", normals[quads], camera - centers[quads]) > 0]
+        x, y, inverse_depth = self._project(vertices)
+        triangles, triangle_quads = _triangles(quads)
+        tx, ty = x[triangles], y[triangles]
+        area = (tx[:, 1] - tx[:, 0]) * (ty[:, 2] - ty[:, 0]) - (tx[:, 2] - tx[:, 0]) * (ty[:, 1] - ty[:, 0])
+        keep = area != 0  # Triangles seen edge on cover no pixel
+        triangles, triangle_quads, tx, ty, area = triangles[keep], triangle_quads[keep], tx[keep], ty[keep], area[keep]
+        # Barycentric coordinates are affine in pixel coordinates: w = a * px + b * py + c, and so is the inverse depth
+        tx1, ty1 = np.roll(tx, -1, axis=1), np.roll(ty, -1, axis=1)  # Next vertex
+        tx2, ty2 = np.roll(tx, -2, axis=1), np.roll(ty, -2, axis=1)
+        a, b, c = np.stack([ty1 - ty2, tx2 - tx1, tx1 * ty2 - tx2 * ty1]) / area[:, None]
+        tz = inverse_depth[triangles]
+        za, zb, zc = (a * tz).sum(axis=1), (b * tz).sum(axis=1), (c * tz).sum(axis=1)
+        x0 = np.clip(np.floor(tx.min(axis=1)), 0, width).astype(int)
+        x1 = np.clip(np.ceil(tx.max(axis=1)), 0, width).astype(int)
+        y0 = np.clip(np.floor(ty.min(axis=1)), 0, height).astype(int)
+        y1 = np.clip(np.ceil(ty.max(axis=1)), 0, height).astype(int)
+
+        quad_map = np.full((height, width), NO_QUAD, dtype=np.uint8)
+        z_buffer = np.zeros((height, width))  # Inverse depth of the closest quad, 0 is infinitely far
+        for t in np.flatnonzero((x0 < x1) & (y0 < y1)):
+            px = np.arange(x0[t], x1[t]) + 0.5
+            py = (np.arange(y0[t], y1[t]) + 0.5)[:, None]
+            inside = ((a[t, 0] * px + (b[t, 0] * py + c[t, 0]) >= 0)
+                      & (a[t, 1] * px + (b[t, 1] * py + c[t, 1]) >= 0)
+                      & (a[t, 2] * px + (b[t, 2] * py + c[t, 2]) >= 0))
+            z = za[t] * px + (zb[t] * py + zc[t])
+            region = np.s_[y0[t]:y1[t], x0[t]:x1[t]]
+            visible = inside & (z > z_buffer[region])
+            z_buffer[region][visible] = z[visible]
+            quad_map[region][visible] = triangle_quads[t]
+        return quad_map
+
+    def _coverage(self, face=None, angle=0):
+        """Quad map reduced to pixels: (quad of each pixel, flat indices of the pixels seeing several quads,
+        (n, samples ** 2) quads seen by each of them)."""
+        if face is None and self._rest_coverage is not None:
+            return self._rest_coverage
+        s = self.samples
+        points = self.quad_map(face, angle).reshape(self.height, s, self.width, s).swapaxes(1, 2)
+        points = points.reshape(self.height * self.width, s * s)
+        mixed = np.flatnonzero((points != points[:, :1]).any(axis=1))
+        coverage = (points[:, 0].reshape(self.height, self.width), mixed, points[mixed])
+        if face is None:
+            self._rest_coverage = coverage
+        return coverage
+
+    def _palettes(self, facelets):
+        """Colors (0 to 255) of the quads and of the background, for one or several states."""
+        colors = quad_colors(facelets)
+        background = np.broadcast_to(self.background, colors.shape[:-2] + (1, 3))
+        return np.concatenate([colors, background], axis=-2) * 255
+
+    @staticmethod
+    def _shade(coverage, palette):
+        pixel_quads, mixed, mixed_quads = coverage
+        frame = palette[pixel_quads]
+        frame.reshape(-1, 3)[mixed] = palette[mixed_quads].mean(axis=1)
+        return np.rint(frame).astype(np.uint8)
+
+    def render(self, state_str, face=None, angle=0):
+        """Frame of state_str, with the layer of face (if any) rotated by angle degrees around its normal."""
+        return self._shade(self._coverage(face, angle), self._palettes(state_str_to_facelets(state_str)))
+
+    def render_many(self, state_strs, batch_size=256):
+        """Yields the frames of state_strs at rest, rasterised once and colored batch_size states at a time."""
+        coverage = self._coverage()
+        state_strs = list(state_strs)
+        for start in range(0, len(state_strs), batch_size):
+            for palette in self._palettes(state_strs_to_facelets(state_strs[start:start + batch_size])):
+                yield self._shade(coverage, palette)
+
+    def animation_frames(self, state_str, moves, fps=30):
+        """Yields the frames of moves applied to state_str, animated as in the OpenGL window at fps frames per second,
+        then a frame of the final state."""
+        facelets = state_str_to_facelets(state_str)
+        for move in moves:
+            move = Move(move)
+            target = 90 * (1 + (move.power == 2))
+            n = max(1, round(target / DEG_PER_SEC * fps))
+            sign = 1 if move.power == 3 else -1  # As FaceRotationAnimation.angle
+            palette = self._palettes(facelets)
+            for k in range(n):
+                yield self._shade(self._coverage(move.face, sign * target * k / n), palette)
+            facelets = move_facelets(facelets, move)
+        yield self._shade(self._coverage(), self._palettes(facelets))
+
+
+def encode_png(frame, level=6):
+    """PNG file of a (height, width, 3) uint8 frame, as bytes."""
+    height, width, _ = frame.shape
+    rows = np.concatenate([np.zeros((height, 1), dtype=np.uint8), frame.reshape(height, -1)], axis=1)  # Filter 0
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)  # 8 bits RGB
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(rows.tobytes(), level))
+            + chunk(b"IEND", b""))
+
+
+def write_png(path, frame):
+    Path(path).write_bytes(encode_png(frame))
+
+
+def _stats(frames, start):
+    seconds = time.perf_counter() - start
+    return RenderStats(frames, seconds, frames / seconds if seconds > 0 else float("inf"))
+
+
+def export_thumbnails(state_strs, out_dir, renderer=None, batch_size=256):
+    """Write a PNG file per state in out_dir, named after its index in state_strs. Returns RenderStats."""
+    renderer = renderer or SoftwareRenderer()
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    n = 0
+    for n, frame in enumerate(renderer.render_many(state_strs, batch_size), 1):
+        write_png(out_dir / f"{n - 1:06d}.png", frame)
+    return _stats(n, start)
+
+
+def export_animation(path, state_str, moves, renderer=None, fps=30):
+    """Write the animation of moves applied to state_str as a GIF or MP4 file (needs imageio), or as numbered PNG
+    files if path has no suffix (a directory). Returns RenderStats."""
+    renderer = renderer or SoftwareRenderer()
+    path = Path(path)
+    start = time.perf_counter()
+    frames = renderer.animation_frames(state_str, moves, fps)
+    if not path.suffix:
+        path.mkdir(parents=True, exist_ok=True)
+        n = 0
+        for n, frame in enumerate(frames, 1):
+            write_png(path / f"{n - 1:06d}.png", frame)
+        return _stats(n, start)
+
+    try:
+        import imageio.v3 as iio  # Optional dependency, only for GIF and MP4
+    except ImportError as e:
+        raise ImportError(f"Writing {path.suffix} files needs imageio: pip install imageio") from e
+
+    frames = np.stack(list(frames))
+    if path.suffix.lower() == ".gif":
+        iio.imwrite(path, frames, duration=1000 / fps, loop=0)
+    else:
+        iio.imwrite(path, frames, fps=fps)
+    return _stats(len(frames), start)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Render RubiksCube images without a display.")
+    parser.add_argument("--size", type=int, default=256, help="Width and height of the frames, in pixels")
+    parser.add_argument("--samples", type=int, default=2, help="Supersampling factor (1 for none)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    thumbnails = subparsers.add_parser("thumbnails", help="Write a PNG file per state")
+    thumbnails.add_argument("states", help="File with a state string per line")
+    thumbnails.add_argument("out_dir")
+    animation = subparsers.add_parser("animation", help="Write the animation of a move sequence")
+    animation.add_argument("out", help="GIF or MP4 file, or directory for numbered PNG files")
+    animation.add_argument("--moves", required=True, help="Moves, e.g. \"R U R' U'\"")
+    animation.add_argument("--state", default=RubiksCube.SOLVED_STR, help="Initial state string")
+    animation.add_argument("--fps", type=int, default=30)
+    args = parser.parse_args()
+
+    renderer = SoftwareRenderer(args.size, args.size, samples=args.samples)
+    if args.command == "thumbnails":
+        states = [line.strip() for line in Path(args.states).read_text().splitlines() if line.strip()]
+        stats = export_thumbnails(states, args.out_dir, renderer)
+    else:
+        stats = export_animation(args.out, args.state, parse_moves(args.moves), renderer, args.fps)
+    print(f"{stats.frames} frames in {stats.seconds:.2f}s ({stats.fps:.1f} frames/s)")
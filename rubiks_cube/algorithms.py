@@ -0,0 +1,92 @@
+"""This module contains helpers to manipulate algorithms (sequences of moves):
+symmetries of an algorithm, and compilation of an algorithm into a single permutation."""
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from rubiks_cube.constants import Z, FACE_MOVES, MOVE_INDEX
+from rubiks_cube.core import get_rot, get_permutation, get_cube_ids_on_face
+from rubiks_cube.cubic_mathematics import MUL_TABLE
+from rubiks_cube.cubie import CubieCube
+from rubiks_cube.facelets import FACELET_MOVES, N_FACELETS
+from rubiks_cube.moves import Move
+from utils import angle
+
+
+def _quarter_turns_about_y(normal):
+    """Number of quarter turns about Y sending Z to normal."""
+    return round(angle(Z, normal, ignore_axis=1) / np.pi * 2) % 4
+
+
+def _rotate_moves(moves, quarter_turns):
+    return [Move(m).rotated_about_y[quarter_turns] for m in moves]
+
+
+def rotate_moves_about_y(moves, normal):
+    return _rotate_moves(moves, _quarter_turns_about_y(normal))
+
+
+def flip_left_right(moves):
+    return [Move(m).flipped_left_right for m in moves]
+
+
+def flip_up_down(moves):
+    return [Move(m).flipped_up_down for m in moves]
+
+
+# Result of compiling an algorithm, for each representation of RubiksCube:
+#  - facelets: permutation of the 54 facelets
+#  - cubie: CubieCube to multiply the state with
+#  - cubes: (permutation of the 26 cubes, index of the rotation applied to the cube at each new position)
+CompiledMoves = namedtuple("CompiledMoves", ["moves", "facelets", "cubie", "cubes"])
+
+
+def _compute_cubes_move(move):
+    face, reverse, double = move.face, move.power == 3, move.power == 2
+    return get_cube_ids_on_face(face), get_rot(face, reverse, double).index, get_permutation(face, reverse, double)
+
+
+_CUBES_MOVES = [_compute_cubes_move(Move(m)) for m in FACE_MOVES]
+
+
+def compose_moves(moves, cubie=True, cubes=True):
+    """Compile a sequence of moves, without caching.
+    Computing the cubie and cubes parts can be skipped (they are then None)."""
+    moves = tuple(moves)
+    indices = [MOVE_INDEX[m] for m in moves]
+    facelets = np.arange(N_FACELETS)
+    for i in indices:
+        facelets = facelets[FACELET_MOVES[i]]
+    cubie_cube = None
+    if cubie:
+        cubie_cube = CubieCube()
+        for i in indices:
+            cubie_cube.move(i)
+    cubes_part = None
+    if cubes:
+        cubes_perm = np.arange(26)
+        cubes_rot = np.zeros(26, dtype=int)
+        for i in indices:
+            ids, rot, permutation = _CUBES_MOVES[i]
+            cubes_rot[ids] = MUL_TABLE[rot, cubes_rot[ids]]
+            cubes_perm = cubes_perm[permutation]
+            cubes_rot = cubes_rot[permutation]
+        cubes_part = (cubes_perm, cubes_rot)
+    return CompiledMoves(moves, facelets, cubie_cube, cubes_part)
+
+
+@lru_cache(maxsize=1024)
+def _compile(moves):
+    return compose_moves(moves)
+
+
+def compile_moves(moves, rotate_about=None, flip=False):
+    """Compile a sequence of moves into a single permutation (cached).
+    The sequence can first be flipped left / right, then rotated about Y so that F is sent to rotate_about."""
+    moves = list(moves)
+    if flip:
+        moves = flip_left_right(moves)
+    if rotate_about is not None:
+        moves = _rotate_moves(moves, _quarter_turns_about_y(rotate_about))
+    return _compile(tuple(moves))
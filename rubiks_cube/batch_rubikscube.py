@@ -0,0 +1,72 @@
+import numpy as np
+
+from rubiks_cube.algorithms import compile_moves
+from rubiks_cube.constants import ALL_MOVES, FACE_MOVES, MOVE_INDEX
+from rubiks_cube.facelets import FACELET_MOVES, SOLVED_FACELETS, facelets_to_state_strs, state_strs_to_facelets
+
+
+def moves_to_indices(moves):
+    """Converts a move, or an array of moves (strings or indexes in FACE_MOVES), to move indexes."""
+    if isinstance(moves, str):
+        return MOVE_INDEX[moves]
+    moves = np.asarray(moves)
+    if moves.dtype.kind in "iu":
+        return moves
+    unique, inverse = np.unique(moves, return_inverse=True)
+    return np.array([MOVE_INDEX[m] for m in unique])[inverse].reshape(moves.shape)
+
+
+class BatchRubiksCube:
+    """This class represents N rubiks cubes at once, as a (N, 54) array of facelets
+    (see rubiks_cube.facelets), so that a move is applied to all of them with a single gather.
+    """
+    SHUFFLE_MOVES = np.array([MOVE_INDEX[m] for m in ALL_MOVES])
+
+    def __init__(self, n=1, facelets=None):
+        self.facelets = np.tile(SOLVED_FACELETS, (n, 1)) if facelets is None else facelets
+
+    @staticmethod
+    def from_state_strings(state_strs):
+        return BatchRubiksCube(facelets=state_strs_to_facelets(state_strs))
+
+    def __len__(self):
+        return len(self.facelets)
+
+    def __repr__(self):
+        return f"<BatchRubiksCube: {len(self)} cubes>"
+
+    @property
+    def state_strings(self):
+        return facelets_to_state_strs(self.facelets)
+
+    def move(self, moves):
+        """Apply a single move to all cubes, or one move per cube if moves is an array of length N."""
+        moves = moves_to_indices(moves)
+        if np.ndim(moves) == 0:
+            self.facelets = self.facelets[:, FACELET_MOVES[moves]]
+        else:
+            self.facelets = np.take_along_axis(self.facelets, FACELET_MOVES[moves], axis=1)
+
+    def apply(self, moves):
+        """Apply a sequence of moves, either shared by all cubes (list of moves)
+        or given per cube as a (N, n_moves) array."""
+        moves = moves_to_indices(moves)
+        if np.ndim(moves) == 1:
+            for move in moves:
+                self.move(move)
+        else:
+            for column in moves.T:
+                self.move(column)
+
+    def apply_algorithm(self, moves, rotate_about=None, flip=False):
+        """Apply a sequence of moves to all cubes with a single gather (see rubiks_cube.algorithms)."""
+        self.facelets = self.facelets[:, compile_moves(moves, rotate_about, flip).facelets]
+
+    def shuffle(self, n=30):
+        """Apply n random moves to each cube, and returns the (N, n) array of moves applied."""
+        moves = np.random.choice(self.SHUFFLE_MOVES, (len(self), n))
+        self.apply(moves)
+        return np.array(FACE_MOVES)[moves]
+
+    def is_solved(self):
+        return (self.facelets == SOLVED_FACELETS).all(axis=1)
@@ -3,6 +3,9 @@ import numpy as np
 X, Y, Z = np.eye(3, dtype=np.int8)
 ALL_MOVES = ["F", "F'", "R", "R'", "L", "L'", "U", "U'", "D", "D'", "B", "B'"]
 FACE_ORDER = ["U", "R", "F", "D", "L", "B"]
+# All 18 face turns (half turn metric), in the order used by move tables
+FACE_MOVES = [face + suffix for face in FACE_ORDER for suffix in ("", "2", "'")]
+MOVE_INDEX = {move: i for i, move in enumerate(FACE_MOVES)}
 NORMAL_FOR_FACE = {
     "F": Z, "B": -Z, "L": -X, "R": X, "U": Y, "D": -Y
 }
\ No newline at end of file
@@ -1,10 +1,9 @@
 """This module contains some fundamental functions regarding rubiks_cube states and representation."""
-from functools import lru_cache
-
 import numpy as np
 
 from rubiks_cube.constants import Z, X, Y, FACE_ORDER, NORMAL_FOR_FACE
 from rubiks_cube.cubic_mathematics import CubicRotation, invert_permutation
+from rubiks_cube.moves import Move
 
 
 def state_str_to_state_description(state_str):
@@ -62,8 +61,8 @@ def get_face_for_normal(normal):
 offset_for_direction = {tuple(Y): 0, tuple(X): 9, tuple(Z): 18, tuple(-Y): 27, tuple(-X): 36, tuple(-Z): 45}
 
 
-def get_color_from_state_str(state_str, pos, direction):
-    """Return color letter corresponding to sticker on cube as position pos and in direction direction."""
+def _compute_facelet_index(pos, direction):
+    """Return index in state string of the sticker on cube at position pos and in direction direction."""
     direction = direction.astype(np.int8)
     axis = np.where(direction != 0)[0][0]
     assert pos[axis] == direction[axis]  # Check valid face for cube
@@ -73,9 +72,64 @@ def get_color_from_state_str(state_str, pos, direction):
     face_offset = offset_for_direction[tuple(direction)]
     up_offset = 3 * (1 - np.dot(pos, up))
     right_offset = np.dot(right, pos) + 1
-    index = int(face_offset + up_offset + right_offset)
+    return int(face_offset + up_offset + right_offset)
+
+
+def _vector_id(vect):
+    """Index of a vector with coordinates in (-1, 0, 1), in 0..26"""
+    return 9 * (vect[0] + 1) + 3 * (vect[1] + 1) + (vect[2] + 1)
+
+
+def _compute_facelet_index_tables():
+    table = np.full((27, 27), -1, dtype=np.int16)  # [position id, direction id]
+    index_for_sticker = {}
+    for x in (-1, 0, 1):
+        for y in (-1, 0, 1):
+            for z in (-1, 0, 1):
+                pos = np.array([x, y, z])
+                for axis in np.where(pos != 0)[0]:
+                    direction = np.zeros(3, dtype=np.int8)
+                    direction[axis] = pos[axis]
+                    index = _compute_facelet_index(pos, direction)
+                    table[_vector_id(pos), _vector_id(direction)] = index
+                    index_for_sticker[(x, y, z, *direction.tolist())] = index
+    return table, index_for_sticker
+
+
+# Index in state string of all 54 stickers, either from (x, y, z, dx, dy, dz) or from [position id, direction id]
+FACELET_INDEX_TABLE, FACELET_INDEX = _compute_facelet_index_tables()
+
+
+def get_facelet_index(pos, direction):
+    """Return index in state string of the sticker on cube at position pos and in direction direction."""
+    index = FACELET_INDEX.get((*pos, *direction))
+    if index is None:
+        raise ValueError(f"No sticker on cube {pos} in direction {direction}")
+    return index
+
+
+def get_facelet_indices(positions, directions):
+    """Batched version of get_facelet_index, for (N, 3) arrays of positions and directions."""
+    positions = np.asarray(positions, dtype=int)
+    directions = np.asarray(directions, dtype=int)
+    indices = FACELET_INDEX_TABLE[_vector_id(positions.T), _vector_id(directions.T)]
+    if (indices < 0).any():
+        raise ValueError("Some positions have no sticker in the given direction")
+    return indices
+
+
+def get_color_from_state_str(state_str, pos, direction):
+    """Return color letter corresponding to sticker on cube as position pos and in direction direction."""
+    return state_str[get_facelet_index(pos, direction)]
+
 
-    return state_str[index]
+def get_colors_from_state_str(state, positions, directions):
+    """Batched version of get_color_from_state_str. state can be a state string, in which case a string
+    of color letters is returned, or a facelets array (see rubiks_cube.facelets)."""
+    indices = get_facelet_indices(positions, directions)
+    if isinstance(state, str):
+        return "".join([state[i] for i in indices])
+    return state[indices]
 
 
 def get_rot_from_basis(basis):
@@ -103,15 +157,10 @@ def get_rot_from_basis(basis):
     return CubicRotation(np.array(basis).T)
 
 
-@lru_cache(maxsize=18)
 def neg_move(move):
     if len(move) == 0:
         return ""
-    if "2" in move:
-        return move
-    elif "'" in move:
-        return move[0]
-    return move + "'"
+    return Move(move).inverse
 
 
 CUBIC_ROT_FOR_FACE = {
@@ -1,9 +1,11 @@
-import kociemba
+from functools import lru_cache
+
 import numpy as np
 
 from rubiks_cube.constants import FACE_ORDER
-from rubiks_cube.core import get_normal, get_face_for_normal, get_color_from_state_str, get_rot_from_basis
-from rubiks_cube.cubic_mathematics import CubicRotation
+from rubiks_cube.core import get_normal, get_facelet_index, get_rot_from_basis
+from rubiks_cube.cubic_mathematics import CubicRotation, CUBIE_POSITIONS
+from rubiks_cube.cubie import CubieCube
 
 
 class Cube:
@@ -21,9 +23,7 @@ class Cube:
         self.rotation = rot * self.rotation
 
     def get_color_on_face(self, face):
-        normal = get_normal(face)
-        from_normal = self.rotation.inv().apply(normal)
-        return get_face_for_normal(from_normal)
+        return self.rotation.inv().apply_to_face(face)
 
     def __eq__(self, other):
         return self.rotation == other.rotation and self.colors == other.colors and self.id == other.id
@@ -54,42 +54,53 @@ def generate_cubes():
     return np.array(cubes)
 
 
-def generate_cubes_from_state_str(state_str, check=False):
-    if check:
-        try:
-            kociemba.solve(state_str)
-        except ValueError as e:
-            raise ValueError(f"Invalid state string {state_str}")
-
-    base = np.eye(3)
-    cubes = [None] * 26
-    i = 0
+def _compute_facelets_for_positions():
+    """Returns the facelet indices of the stickers of each of the 26 cubes (ordered by axis)."""
+    base = np.eye(3, dtype=np.int8)
+    facelets = []
     for x in (-1, 0, 1):
         for y in (-1, 0, 1):
             for z in (-1, 0, 1):
                 if x == y == z == 0:  # Skip center cube
                     continue
                 pos = np.array([x, y, z])
+                facelets.append(tuple(get_facelet_index(pos, pos[axis] * base[axis])
+                                      for axis in np.where(pos != 0)[0]))
+    return facelets
 
-                colors = [False] * 6
-                basis = [None] * 3
-                for axis in np.where(pos != 0)[0]:
-                    color = get_color_from_state_str(state_str, pos, pos[axis] * base[axis])
-                    norm = get_normal(color)
-                    basis[axis] = norm * pos[axis]
-                    colors[FACE_ORDER.index(color)] = True
-
-                rot = get_rot_from_basis(basis)
-                original_pos = rot.apply(pos)
-                ox, oy, oz = original_pos
-                id = 9 * (ox + 1) + 3 * (oy + 1) + (oz + 1)
-                index = 9 * (x + 1) + 3 * (y + 1) + (z + 1)
-                if index > 13:
-                    index = index - 1
-                if id > 13:
-                    id = id - 1
-                cube = Cube(initial_rotation=rot.inv(), colors=colors, id=id)
-                cubes[index] = cube
-                i += 1
-    return np.array(cubes)
 
+FACELETS_FOR_POSITION = _compute_facelets_for_positions()
+
+
+@lru_cache(maxsize=None)
+def _decode_cube(index, stickers):
+    """Returns (rotation, colors, id) of the cube at position index showing given sticker colors.
+    Only 486 (position, stickers) pairs are valid, so this is computed once for each of them."""
+    pos = CUBIE_POSITIONS[index]
+    colors = [False] * 6
+    basis = [None] * 3
+    for axis, color in zip(np.where(pos != 0)[0], stickers):
+        basis[axis] = get_normal(color) * pos[axis]
+        colors[FACE_ORDER.index(color)] = True
+
+    rot = get_rot_from_basis(basis)  # Raises ValueError for impossible stickers
+    ox, oy, oz = rot.apply(pos)
+    id = 9 * (ox + 1) + 3 * (oy + 1) + (oz + 1)
+    if id > 13:
+        id = id - 1
+    return rot.inv(), tuple(colors), int(id)
+
+
+def generate_cubes_from_state_str(state_str, check=False):
+    if check:
+        CubieCube.from_state_str(state_str, check=True)
+
+    cubes = []
+    for index, facelets in enumerate(FACELETS_FOR_POSITION):
+        stickers = "".join([state_str[f] for f in facelets])
+        try:
+            rot, colors, id = _decode_cube(index, stickers)
+        except (ValueError, KeyError):
+            raise ValueError(f"Invalid state string {state_str}: impossible cube {stickers}")
+        cubes.append(Cube(initial_rotation=rot, colors=list(colors), id=id))
+    return np.array(cubes)
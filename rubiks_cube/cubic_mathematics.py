@@ -1,20 +1,89 @@
 import numpy as np
-from scipy.spatial.transform.rotation import Rotation
 
-from rubiks_cube.constants import X, Y, Z
+from rubiks_cube.constants import X, Y, Z, FACE_ORDER, NORMAL_FOR_FACE
+
+# Positions of the 26 cubies, ordered as in RubiksCube.ORDERED_CUBES_POSITIONS
+CUBIE_POSITIONS = [np.array([x, y, z]) for x in (-1, 0, 1) for y in (-1, 0, 1) for z in (-1, 0, 1)
+                   if not (x == y == z == 0)]
+_INDEX_FOR_POSITION = {tuple(p): i for i, p in enumerate(CUBIE_POSITIONS)}
+_INDEX_FOR_FACE = {f: i for i, f in enumerate(FACE_ORDER)}
+
+
+def _compute_rotation_matrices():
+    """Returns the 24 rotations matrices of the cube, identity first."""
+    generators = [np.array([[1, 0, 0], [0, 0, -1], [0, 1, 0]]),   # Quarter turn about X
+                  np.array([[0, 0, 1], [0, 1, 0], [-1, 0, 0]]),   # Quarter turn about Y
+                  np.array([[0, -1, 0], [1, 0, 0], [0, 0, 1]])]   # Quarter turn about Z
+    matrices = [np.eye(3, dtype=int)]
+    seen = {matrices[0].tobytes()}
+    for m in matrices:  # Breadth first closure, matrices grows while iterating
+        for g in generators:
+            new = np.dot(g, m)
+            if new.tobytes() not in seen:
+                seen.add(new.tobytes())
+                matrices.append(new)
+    return np.array(matrices)
+
+
+ROTATION_MATRICES = _compute_rotation_matrices()
+ROTATION_MATRICES.flags.writeable = False
+N_ROTATIONS = len(ROTATION_MATRICES)
+_INDEX_FOR_MATRIX = {tuple(m.ravel()): i for i, m in enumerate(ROTATION_MATRICES)}
+
+# MUL_TABLE[i, j] is the index of R_i * R_j
+MUL_TABLE = np.array([[_INDEX_FOR_MATRIX[tuple(np.dot(a, b).ravel())] for b in ROTATION_MATRICES]
+                      for a in ROTATION_MATRICES])
+INV_TABLE = np.array([_INDEX_FOR_MATRIX[tuple(m.T.ravel())] for m in ROTATION_MATRICES])
+# POSITION_TABLE[i, p] is the index of R_i applied on cubie position p, same for FACE_TABLE with FACE_ORDER
+POSITION_TABLE = np.array([[_INDEX_FOR_POSITION[tuple(np.dot(m, p))] for p in CUBIE_POSITIONS]
+                           for m in ROTATION_MATRICES])
+_INDEX_FOR_NORMAL = {tuple(NORMAL_FOR_FACE[f]): i for i, f in enumerate(FACE_ORDER)}
+FACE_TABLE = np.array([[_INDEX_FOR_NORMAL[tuple(np.dot(m, NORMAL_FOR_FACE[f]))] for f in FACE_ORDER]
+                       for m in ROTATION_MATRICES])
+
+# Lists are faster than arrays for scalar lookups
+_MUL = MUL_TABLE.tolist()
+_INV = INV_TABLE.tolist()
+_FACE_LETTER = [[FACE_ORDER[j] for j in row] for row in FACE_TABLE.tolist()]
 
 
 class CubicRotation:
-    def __init__(self, matrix=None):
-        # if matrix is not None and np.sum((matrix < 1) & (matrix > 0)) > 0:
-        #     print("Warning: rounding matrix", matrix)
-        self.matrix = matrix.astype(int) if matrix is not None else np.eye(3, dtype=int)
+    """One of the 24 rotations of the cube.
+    Instances are interned and identified by their index in ROTATION_MATRICES, so that composition,
+    inversion and application to faces or cubie positions are table lookups.
+    Matrices are still accepted and returned for interoperability (eg with the OpenGL drawer).
+    """
+    __slots__ = ("index",)
+
+    def __new__(cls, matrix=None):
+        if matrix is None:
+            return _ROTATIONS[0]
+        key = tuple(np.rint(matrix).astype(int).ravel())
+        if key not in _INDEX_FOR_MATRIX:
+            raise ValueError(f"Not a cubic rotation: {matrix}")
+        return _ROTATIONS[_INDEX_FOR_MATRIX[key]]
+
+    @staticmethod
+    def from_index(index):
+        return _ROTATIONS[index]
 
     @staticmethod
     def from_rotvec(rotvec):
-        if np.linalg.norm(rotvec) < np.pi - 1e-6:
-            print(f"Warning: rotvec too small? {rotvec}")
-        return CubicRotation(Rotation.from_rotvec(rotvec).as_matrix())
+        """Rotation about one of the axis, of a multiple of pi/2."""
+        rotvec = np.asarray(rotvec, dtype=float)
+        quarter_turns = int(np.rint(np.linalg.norm(rotvec) / (np.pi / 2)))
+        if quarter_turns % 4 == 0:
+            return _ROTATIONS[0]
+        axis = np.rint(rotvec / np.linalg.norm(rotvec)).astype(int)
+        if np.abs(axis).sum() != 1:
+            raise ValueError(f"Not a cubic rotation vector: {rotvec}")
+        cos, sin = [(1, 0), (0, 1), (-1, 0), (0, -1)][quarter_turns % 4]
+        cross = np.array([[0, -axis[2], axis[1]], [axis[2], 0, -axis[0]], [-axis[1], axis[0], 0]])
+        return CubicRotation(cos * np.eye(3) + sin * cross + (1 - cos) * np.outer(axis, axis))
+
+    @property
+    def matrix(self):
+        return ROTATION_MATRICES[self.index]
 
     def as_matrix(self):
         return self.matrix
@@ -22,16 +91,23 @@ class CubicRotation:
     def apply(self, vect) -> np.ndarray:
         return np.dot(self.matrix, vect)
 
+    def apply_to_face(self, face):
+        """Returns the face where the normal of given face is sent."""
+        return _FACE_LETTER[self.index][_INDEX_FOR_FACE[face]]
+
+    def apply_to_position(self, position_index):
+        """Returns the index (in CUBIE_POSITIONS) where the cubie position of given index is sent."""
+        return POSITION_TABLE[self.index, position_index]
+
     def inv(self):
-        return CubicRotation(self.matrix.T)
+        return _ROTATIONS[_INV[self.index]]
 
     @staticmethod
     def identity():
-        return CubicRotation(np.eye(3))
+        return _ROTATIONS[0]
 
     def __mul__(self, other):
-        # assert isinstance(other, CubicRotation)
-        return CubicRotation(np.dot(self.matrix, other.matrix))
+        return _ROTATIONS[_MUL[self.index][other.index]]
 
     def __repr__(self):
         return f"CubicRotation({self.matrix.__str__()})"
@@ -40,8 +116,25 @@ class CubicRotation:
         return self.matrix.__str__()
 
     def __eq__(self, other):
-        return np.array_equal(self.matrix, other.matrix)
+        if not isinstance(other, CubicRotation):
+            return NotImplemented
+        return self.index == other.index
+
+    def __hash__(self):
+        return self.index
+
+    def __reduce__(self):
+        # Keep instances interned when pickled
+        return CubicRotation.from_index, (self.index,)
+
+
+def _create_rotation(index):
+    rot = object.__new__(CubicRotation)
+    rot.index = index
+    return rot
+
 
+_ROTATIONS = [_create_rotation(i) for i in range(N_ROTATIONS)]
 
 CubicRotation.rx = CubicRotation.from_rotvec(np.pi / 2 * X)
 CubicRotation.ry = CubicRotation.from_rotvec(np.pi / 2 * Y)
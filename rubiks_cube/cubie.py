@@ -0,0 +1,201 @@
+"""This module contains the cubie level representation of a rubiks_cube:
+corner / edge permutation and orientation stored as small integer arrays.
+
+Conventions are the ones of Kociemba's two-phase algorithm:
+ - corners: URF, UFL, ULB, UBR, DFR, DLF, DBL, DRB
+ - edges: UR, UF, UL, UB, DR, DF, DL, DB, FR, FL, BL, BR
+ - a move table entry `cp[i]` is the corner which *replaces* the one at position i.
+"""
+import numpy as np
+
+from rubiks_cube.constants import FACE_ORDER, MOVE_INDEX
+from rubiks_cube.facelets import SOLVED_FACELETS, state_str_to_facelets
+
+N_CORNERS = 8
+N_EDGES = 12
+
+# Facelet indices (in the state string) of each corner / edge position, and their colors when solved
+CORNER_FACELETS = [[8, 9, 20], [6, 18, 38], [0, 36, 47], [2, 45, 11],
+                   [29, 26, 15], [27, 44, 24], [33, 53, 42], [35, 17, 51]]
+EDGE_FACELETS = [[5, 10], [7, 19], [3, 37], [1, 46], [32, 16], [28, 25],
+                 [30, 43], [34, 52], [23, 12], [21, 41], [50, 39], [48, 14]]
+CORNER_COLORS = [["U", "R", "F"], ["U", "F", "L"], ["U", "L", "B"], ["U", "B", "R"],
+                 ["D", "F", "R"], ["D", "L", "F"], ["D", "B", "L"], ["D", "R", "B"]]
+EDGE_COLORS = [["U", "R"], ["U", "F"], ["U", "L"], ["U", "B"], ["D", "R"], ["D", "F"],
+               ["D", "L"], ["D", "B"], ["F", "R"], ["F", "L"], ["B", "L"], ["B", "R"]]
+
+# Clockwise quarter turns: (cp, co, ep, eo)
+_BASIC_MOVES = {
+    "U": ([3, 0, 1, 2, 4, 5, 6, 7], [0, 0, 0, 0, 0, 0, 0, 0],
+          [3, 0, 1, 2, 4, 5, 6, 7, 8, 9, 10, 11], [0] * 12),
+    "R": ([4, 1, 2, 0, 7, 5, 6, 3], [2, 0, 0, 1, 1, 0, 0, 2],
+          [8, 1, 2, 3, 11, 5, 6, 7, 4, 9, 10, 0], [0] * 12),
+    "F": ([1, 5, 2, 3, 0, 4, 6, 7], [1, 2, 0, 0, 2, 1, 0, 0],
+          [0, 9, 2, 3, 4, 8, 6, 7, 1, 5, 10, 11], [0, 1, 0, 0, 0, 1, 0, 0, 1, 1, 0, 0]),
+    "D": ([0, 1, 2, 3, 5, 6, 7, 4], [0, 0, 0, 0, 0, 0, 0, 0],
+          [0, 1, 2, 3, 5, 6, 7, 4, 8, 9, 10, 11], [0] * 12),
+    "L": ([0, 2, 6, 3, 4, 1, 5, 7], [0, 1, 2, 0, 0, 2, 1, 0],
+          [0, 1, 10, 3, 4, 5, 9, 7, 8, 2, 6, 11], [0] * 12),
+    "B": ([0, 1, 3, 7, 4, 5, 2, 6], [0, 0, 1, 2, 0, 0, 2, 1],
+          [0, 1, 2, 11, 4, 5, 6, 10, 8, 9, 3, 7], [0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 1, 1]),
+}
+
+
+class CubieCube:
+    """Rubiks cube state as corner / edge permutation and orientation arrays."""
+    def __init__(self, cp=None, co=None, ep=None, eo=None):
+        self.cp = np.arange(N_CORNERS, dtype=np.int8) if cp is None else np.asarray(cp, dtype=np.int8)
+        self.co = np.zeros(N_CORNERS, dtype=np.int8) if co is None else np.asarray(co, dtype=np.int8)
+        self.ep = np.arange(N_EDGES, dtype=np.int8) if ep is None else np.asarray(ep, dtype=np.int8)
+        self.eo = np.zeros(N_EDGES, dtype=np.int8) if eo is None else np.asarray(eo, dtype=np.int8)
+
+    def __repr__(self):
+        return f"<CubieCube: cp={self.cp} co={self.co} ep={self.ep} eo={self.eo}>"
+
+    def __eq__(self, other):
+        return (np.array_equal(self.cp, other.cp) and np.array_equal(self.co, other.co)
+                and np.array_equal(self.ep, other.ep) and np.array_equal(self.eo, other.eo))
+
+    def copy(self):
+        return CubieCube(self.cp.copy(), self.co.copy(), self.ep.copy(), self.eo.copy())
+
+    def multiply(self, other):
+        """Apply other (seen as a move) on top of self, in place."""
+        self.co = (self.co[other.cp] + other.co) % 3
+        self.cp = self.cp[other.cp]
+        self.eo = (self.eo[other.ep] + other.eo) % 2
+        self.ep = self.ep[other.ep]
+
+    def move(self, move):
+        """Apply one of the 18 face turns, given as a string ("F", "R2", "U'") or an index in FACE_MOVES."""
+        i = MOVE_INDEX[move] if isinstance(move, str) else move
+        p = CORNER_PERM_MOVES[i]
+        self.co = (self.co[p] + CORNER_ORI_MOVES[i]) % 3
+        self.cp = self.cp[p]
+        p = EDGE_PERM_MOVES[i]
+        self.eo = (self.eo[p] + EDGE_ORI_MOVES[i]) % 2
+        self.ep = self.ep[p]
+
+    def is_solved(self):
+        return (np.array_equal(self.cp, SOLVED_CP) and not self.co.any()
+                and np.array_equal(self.ep, SOLVED_EP) and not self.eo.any())
+
+    def to_state_str(self):
+        facelets = [face for face in FACE_ORDER for _ in range(9)]
+        for i in range(N_CORNERS):
+            corner, ori = self.cp[i], self.co[i]
+            for n in range(3):
+                facelets[CORNER_FACELETS[i][(n + ori) % 3]] = CORNER_COLORS[corner][n]
+        for i in range(N_EDGES):
+            edge, ori = self.ep[i], self.eo[i]
+            for n in range(2):
+                facelets[EDGE_FACELETS[i][(n + ori) % 2]] = EDGE_COLORS[edge][n]
+        return "".join(facelets)
+
+    @staticmethod
+    def from_state_str(state_str, check=False):
+        """Decode a state string, raising a ValueError if check is True and the state is not valid."""
+        facelets = state_str_to_facelets(state_str)
+        if len(facelets) != 54 or facelets.max() >= len(FACE_ORDER):
+            raise ValueError(f"Invalid state string {state_str}: should be 54 letters among {FACE_ORDER}")
+        cube = CubieCube(*facelets_to_cubie_arrays(facelets))
+        if check:
+            error = cube.get_error()
+            if error is None and state_str[4::9] != "".join(FACE_ORDER):
+                error = "Centers are not in place"
+            if error is not None:
+                raise ValueError(f"Invalid state string {state_str}: {error}")
+        return cube
+
+    def get_error(self):
+        """Returns why the cube is not solvable, or None if it is (checks are cheap, unlike solving it)."""
+        if (self.cp < 0).any() or (self.ep < 0).any():
+            return "Some corners or edges have impossible colors"
+        if len(set(self.cp.tolist())) != N_CORNERS:
+            return "Not all corners exist exactly once"
+        if len(set(self.ep.tolist())) != N_EDGES:
+            return "Not all edges exist exactly once"
+        if self.co.sum() % 3 != 0:
+            return "Twist error: one corner has to be twisted"
+        if self.eo.sum() % 2 != 0:
+            return "Flip error: one edge has to be flipped"
+        if perm_parity(self.cp) != perm_parity(self.ep):
+            return "Parity error: two corners or two edges have to be exchanged"
+        return None
+
+
+def perm_parity(perm):
+    perm = np.asarray(perm).tolist()
+    return sum(perm[j] < perm[i] for i in range(len(perm)) for j in range(i + 1, len(perm))) % 2
+
+
+def _compute_lookup(piece_colors):
+    """Returns a table giving, from the color ids read on a piece position (in base 6),
+    piece * n_orientations + orientation, or -1 for impossible colors."""
+    n = len(piece_colors[0])
+    table = np.full(6 ** n, -1, dtype=np.int8)
+    for piece, colors in enumerate(piece_colors):
+        ids = [FACE_ORDER.index(c) for c in colors]
+        for ori in range(n):
+            # Color read on k-th facelet of the position is colors[(k - ori) % n]
+            key = sum(ids[(k - ori) % n] * 6 ** (n - 1 - k) for k in range(n))
+            table[key] = piece * n + ori
+    return table
+
+
+_CORNER_LOOKUP = _compute_lookup(CORNER_COLORS)
+_EDGE_LOOKUP = _compute_lookup(EDGE_COLORS)
+_CORNER_FACELETS = np.array(CORNER_FACELETS)
+_EDGE_FACELETS = np.array(EDGE_FACELETS)
+
+
+def facelets_to_cubie_arrays(facelets):
+    """Returns (cp, co, ep, eo) arrays from a facelets array (see rubiks_cube.facelets),
+    or from a (N, 54) array of facelets. Pieces with impossible colors get -1 for permutation."""
+    facelets = facelets.astype(np.int16)
+    corners = _CORNER_LOOKUP[facelets[..., _CORNER_FACELETS] @ np.array([36, 6, 1], dtype=np.int16)]
+    edges = _EDGE_LOOKUP[facelets[..., _EDGE_FACELETS] @ np.array([6, 1], dtype=np.int16)]
+    cp, co = corners // 3, corners % 3
+    ep, eo = edges // 2, edges % 2
+    cp[corners < 0] = -1
+    ep[edges < 0] = -1
+    return cp, co, ep, eo
+
+
+_CORNER_COLOR_IDS = np.array([[FACE_ORDER.index(c) for c in colors] for colors in CORNER_COLORS], dtype=np.uint8)
+_EDGE_COLOR_IDS = np.array([[FACE_ORDER.index(c) for c in colors] for colors in EDGE_COLORS], dtype=np.uint8)
+
+
+def cubie_arrays_to_facelets(cp, co, ep, eo):
+    """Facelets array of (cp, co, ep, eo), the inverse of facelets_to_cubie_arrays. Also works on (N, 8) and
+    (N, 12) arrays, then returns a (N, 54) array. Pieces may appear several times, each one is drawn where it is."""
+    cp, co, ep, eo = (np.asarray(a, dtype=np.int64) for a in (cp, co, ep, eo))
+    facelets = np.broadcast_to(SOLVED_FACELETS, cp.shape[:-1] + SOLVED_FACELETS.shape).copy()
+    for pieces, oris, piece_facelets, colors in [(cp, co, _CORNER_FACELETS, _CORNER_COLOR_IDS),
+                                                 (ep, eo, _EDGE_FACELETS, _EDGE_COLOR_IDS)]:
+        n_positions, n = piece_facelets.shape
+        # As in CubieCube.to_state_str, color k of the piece is on facelet (k + ori) % n of its position
+        indices = piece_facelets[np.arange(n_positions)[:, None], (np.arange(n) + oris[..., None]) % n]
+        np.put_along_axis(facelets, indices.reshape(*cp.shape[:-1], -1), colors[pieces].reshape(*cp.shape[:-1], -1),
+                          axis=-1)
+    return facelets
+
+
+SOLVED_CP = np.arange(N_CORNERS, dtype=np.int8)
+SOLVED_EP = np.arange(N_EDGES, dtype=np.int8)
+
+
+def _compute_move_tables():
+    """Returns the (18, 8) / (18, 12) permutation and orientation tables for all face turns."""
+    cubes = []
+    for face in FACE_ORDER:
+        basic = CubieCube(*_BASIC_MOVES[face])
+        cube = CubieCube()
+        for _ in range(3):  # Same order as FACE_MOVES: face, face2, face'
+            cube.multiply(basic)
+            cubes.append(cube.copy())
+    return (np.array([c.cp for c in cubes]), np.array([c.co for c in cubes]),
+            np.array([c.ep for c in cubes]), np.array([c.eo for c in cubes]))
+
+
+CORNER_PERM_MOVES, CORNER_ORI_MOVES, EDGE_PERM_MOVES, EDGE_ORI_MOVES = _compute_move_tables()
@@ -0,0 +1,166 @@
+"""This module contains a compact integer encoding of rubiks_cube states.
+
+A state is mapped to 4 coordinates computed on its cubie representation (see rubiks_cube.cubie):
+ - corner permutation: rank of cp among the 8! permutations
+ - corner twist: co[:7] read in base 3 (last twist is implied)
+ - edge permutation: rank of ep among the 12! permutations
+ - edge flip: eo[:11] read in base 2 (last flip is implied)
+
+Those are then packed into a single key. Since corners and edges permutations have the same parity,
+only half of the edge permutations are needed. There are NUM_STATES ~ 4.3e19 reachable states, which
+is more than 2**64: keys are Python ints of KEY_BITS = 66 bits, that can be stored as KEY_BYTES bytes.
+"""
+from math import factorial
+
+import numpy as np
+
+from rubiks_cube.cubie import CubieCube, N_CORNERS, N_EDGES, perm_parity, facelets_to_cubie_arrays
+from rubiks_cube.facelets import rotate_facelets_all
+
+N_CORNER_PERM = factorial(N_CORNERS)
+N_CORNER_TWIST = 3 ** (N_CORNERS - 1)
+N_EDGE_PERM = factorial(N_EDGES)
+N_EDGE_FLIP = 2 ** (N_EDGES - 1)
+NUM_STATES = N_CORNER_PERM * N_CORNER_TWIST * N_EDGE_PERM // 2 * N_EDGE_FLIP
+KEY_BITS = NUM_STATES.bit_length()
+KEY_BYTES = (KEY_BITS + 7) // 8
+
+
+def perm_to_coord(perm):
+    """Lehmer rank of a permutation (list or 1D array)."""
+    perm = np.asarray(perm).tolist()
+    n = len(perm)
+    coord = 0
+    for i in range(n - 1):
+        coord = coord * (n - i) + sum(perm[j] < perm[i] for j in range(i + 1, n))
+    return coord
+
+
+def coord_to_perm(coord, n):
+    digits = []
+    for base in range(1, n + 1):
+        coord, d = divmod(coord, base)
+        digits.append(d)
+    remaining = list(range(n))
+    return [remaining.pop(d) for d in reversed(digits)]
+
+
+def ori_to_coord(ori, base):
+    """Reads all orientations but the last one (which is implied) as a number in given base."""
+    coord = 0
+    for o in np.asarray(ori).tolist()[:-1]:
+        coord = coord * base + o
+    return coord
+
+
+def coord_to_ori(coord, n, base):
+    ori = [0] * n
+    for i in range(n - 2, -1, -1):
+        coord, ori[i] = divmod(coord, base)
+    ori[-1] = -sum(ori) % base
+    return ori
+
+
+def cubie_to_coords(cubie: CubieCube):
+    """Returns (corner permutation, corner twist, edge permutation, edge flip) coordinates."""
+    return (perm_to_coord(cubie.cp), ori_to_coord(cubie.co, 3),
+            perm_to_coord(cubie.ep), ori_to_coord(cubie.eo, 2))
+
+
+def coords_to_cubie(corner_perm, corner_twist, edge_perm, edge_flip):
+    return CubieCube(coord_to_perm(corner_perm, N_CORNERS), coord_to_ori(corner_twist, N_CORNERS, 3),
+                     coord_to_perm(edge_perm, N_EDGES), coord_to_ori(edge_flip, N_EDGES, 2))
+
+
+def coords_to_key(corner_perm, corner_twist, edge_perm, edge_flip):
+    # Last Lehmer digit of edge_perm (its parity bit) is implied by corners parity
+    key = corner_perm * N_CORNER_TWIST + corner_twist
+    key = key * (N_EDGE_PERM // 2) + edge_perm // 2
+    return key * N_EDGE_FLIP + edge_flip
+
+
+def key_to_coords(key):
+    key, edge_flip = divmod(key, N_EDGE_FLIP)
+    key, half_edge_perm = divmod(key, N_EDGE_PERM // 2)
+    corner_perm, corner_twist = divmod(key, N_CORNER_TWIST)
+    parity = perm_parity(coord_to_perm(corner_perm, N_CORNERS))
+    edge_perm = 2 * half_edge_perm
+    if perm_parity(coord_to_perm(edge_perm, N_EDGES)) != parity:
+        edge_perm += 1
+    return corner_perm, corner_twist, edge_perm, edge_flip
+
+
+def encode(cubie: CubieCube):
+    return coords_to_key(*cubie_to_coords(cubie))
+
+
+def decode(key) -> CubieCube:
+    return coords_to_cubie(*key_to_coords(key))
+
+
+def encode_state_str(state_str):
+    return encode(CubieCube.from_state_str(state_str))
+
+
+def decode_state_str(key):
+    return decode(key).to_state_str()
+
+
+def key_to_bytes(key):
+    """Fixed size big endian representation, which sorts like the keys."""
+    return key.to_bytes(KEY_BYTES, "big")
+
+
+def key_from_bytes(data):
+    return int.from_bytes(data, "big")
+
+
+def perms_to_coords(perms):
+    """Vectorized version of perm_to_coord, for a (N, n) array of permutations."""
+    perms = np.asarray(perms)
+    n = perms.shape[1]
+    coords = np.zeros(len(perms), dtype=np.int64)
+    for i in range(n - 1):
+        coords = coords * (n - i) + (perms[:, i + 1:] < perms[:, i:i + 1]).sum(axis=1)
+    return coords
+
+
+def oris_to_coords(oris, base):
+    """Vectorized version of ori_to_coord, for a (N, n) array of orientations."""
+    oris = np.asarray(oris)
+    coords = np.zeros(len(oris), dtype=np.int64)
+    for i in range(oris.shape[1] - 1):
+        coords = coords * base + oris[:, i]
+    return coords
+
+
+def encode_facelets(facelets):
+    """Keys of a (N, 54) array of facelets (see rubiks_cube.facelets), as a list of ints."""
+    cp, co, ep, eo = facelets_to_cubie_arrays(facelets)
+    coords = zip(perms_to_coords(cp).tolist(), oris_to_coords(co, 3).tolist(),
+                 perms_to_coords(ep).tolist(), oris_to_coords(eo, 2).tolist())
+    return [coords_to_key(*c) for c in coords]
+
+
+def canonical_key(facelets):
+    """Smallest key among the 24 rotations of the state (colors relabelled, see rubiks_cube.facelets.rotate_facelets),
+    which all are at the same distance from solved. Returns (key, index of the rotation giving it)."""
+    keys = encode_facelets(rotate_facelets_all(facelets))
+    rotation = min(range(len(keys)), key=keys.__getitem__)
+    return keys[rotation], rotation
+
+
+_EDGE_KEYS = N_EDGE_PERM // 2 * N_EDGE_FLIP  # Number of keys for a given corners state
+_LOW_32 = (1 << 32) - 1
+
+
+def encode_cubie_arrays(cp, co, ep, eo):
+    """Vectorized keys of (N, 8) / (N, 12) cubie arrays (see rubiks_cube.cubie), split as two arrays
+    (hi, lo) with key = hi << 64 | lo, since keys do not fit in 64 bits. Sorting by (hi, lo) sorts by key."""
+    corners = perms_to_coords(cp) * N_CORNER_TWIST + oris_to_coords(co, 3)
+    edges = perms_to_coords(ep) // 2 * N_EDGE_FLIP + oris_to_coords(eo, 2)
+    # key = corners * _EDGE_KEYS + edges, computed with 32 bits limbs so that nothing overflows int64
+    low = corners * (_EDGE_KEYS & _LOW_32) + edges
+    high = corners * (_EDGE_KEYS >> 32) + (low >> 32)
+    lo = ((high & _LOW_32) << 32 | low & _LOW_32).astype(np.uint64)
+    return (high >> 32).astype(np.uint8), lo
@@ -0,0 +1,97 @@
+"""This module contains the facelet level representation of a rubiks_cube:
+an array of 54 color ids (index in FACE_ORDER), in the same order as the state string.
+
+Each face turn is then a single permutation of those 54 stickers, precomputed from the cube geometry.
+"""
+import numpy as np
+
+from rubiks_cube.constants import FACE_ORDER, FACE_MOVES, MOVE_INDEX
+from rubiks_cube.core import FACELET_INDEX, get_facelet_index, get_normal, get_rot
+from rubiks_cube.cubic_mathematics import CubicRotation, FACE_TABLE, N_ROTATIONS
+
+N_FACELETS = 54
+
+_ID_FOR_LETTER = np.full(256, 255, dtype=np.uint8)
+for _i, _face in enumerate(FACE_ORDER):
+    _ID_FOR_LETTER[ord(_face)] = _i
+_LETTER_FOR_ID = np.frombuffer("".join(FACE_ORDER).encode("ascii"), dtype=np.uint8)
+
+
+def state_str_to_facelets(state_str):
+    return _ID_FOR_LETTER[np.frombuffer(state_str.encode("ascii"), dtype=np.uint8)]
+
+
+def facelets_to_state_str(facelets):
+    return _LETTER_FOR_ID[facelets].tobytes().decode("ascii")
+
+
+def state_strs_to_facelets(state_strs):
+    """Batch version of state_str_to_facelets, returns a (N, 54) array."""
+    data = "".join(state_strs).encode("ascii")
+    return _ID_FOR_LETTER[np.frombuffer(data, dtype=np.uint8)].reshape(-1, N_FACELETS)
+
+
+def facelets_to_state_strs(facelets):
+    """Batch version of facelets_to_state_str, from a (N, 54) array."""
+    data = _LETTER_FOR_ID[facelets].tobytes().decode("ascii")
+    return [data[i:i + N_FACELETS] for i in range(0, len(data), N_FACELETS)]
+
+
+def _compute_stickers():
+    """Returns the (position, direction) of each of the 54 stickers, ordered as in the state string."""
+    stickers = [None] * N_FACELETS
+    for (x, y, z, dx, dy, dz), index in FACELET_INDEX.items():
+        stickers[index] = (np.array([x, y, z]), np.array([dx, dy, dz], dtype=np.int8))
+    return stickers
+
+
+STICKERS = _compute_stickers()
+
+
+def _compute_facelet_permutation(move):
+    """Returns perm such that facelets[perm] is the state after move."""
+    face = move[0]
+    rot = get_rot(face, "'" in move, "2" in move)
+    normal = get_normal(face)
+    perm = np.arange(N_FACELETS)
+    for i, (pos, direction) in enumerate(STICKERS):
+        if np.dot(pos, normal) == 1:
+            perm[get_facelet_index(rot.apply(pos), rot.apply(direction))] = i
+    return perm
+
+
+FACELET_MOVES = np.array([_compute_facelet_permutation(m) for m in FACE_MOVES])
+SOLVED_FACELETS = np.repeat(np.arange(6, dtype=np.uint8), 9)
+
+
+def move_facelets(facelets, move):
+    """Returns new facelets array after applying move (a string or an index in FACE_MOVES)."""
+    i = MOVE_INDEX[move] if isinstance(move, str) else move
+    return facelets[FACELET_MOVES[i]]
+
+
+def _compute_rotation_permutation(rot):
+    """Returns perm such that facelets[perm] is the cube rotated as a whole by rot."""
+    perm = np.arange(N_FACELETS)
+    for i, (pos, direction) in enumerate(STICKERS):
+        perm[get_facelet_index(rot.apply(pos), rot.apply(direction))] = i
+    return perm
+
+
+# Whole cube rotations, indexed like CubicRotation.index
+ROTATION_FACELETS = np.array([_compute_rotation_permutation(CubicRotation.from_index(r)) for r in range(N_ROTATIONS)])
+_ROTATION_COLORS = FACE_TABLE.astype(np.uint8)
+# ROTATION_MOVES[r, m] is the index of the image of move m by rotation r, ie the move m' such that
+# rotate_facelets(move_facelets(facelets, m), r) == move_facelets(rotate_facelets(facelets, r), m')
+ROTATION_MOVES = FACE_TABLE[:, np.arange(len(FACE_MOVES)) // 3] * 3 + np.arange(len(FACE_MOVES)) % 3
+
+
+def rotate_facelets(facelets, rotation):
+    """Rotate the cube as a whole (rotation is a CubicRotation index) and relabel colors so that centers are
+    in place again. The result is a state at the same distance from solved. Also works on (N, 54) arrays."""
+    return _ROTATION_COLORS[rotation][facelets[..., ROTATION_FACELETS[rotation]]]
+
+
+def rotate_facelets_all(facelets):
+    """All the 24 rotations of a facelets array (see rotate_facelets), as a (24, 54) array."""
+    return np.take_along_axis(_ROTATION_COLORS, facelets[ROTATION_FACELETS], axis=1)
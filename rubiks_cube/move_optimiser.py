@@ -0,0 +1,156 @@
+"""This module shortens move sequences, whatever the solver which produced them.
+
+MoveOptimiser repeats two passes until the sequence stops shrinking:
+ - normalisation: consecutive moves on one axis commute (L R L' is R), they are merged per face, cancelled when
+   they add up to nothing, and sorted in FACE_ORDER (R L, never L R), which exposes further cancellations
+ - peephole: each window of at most `window` moves is replaced by the shortest sequence with the same effect,
+   if it is shorter. Shortest sequences of at most IDENTITY_DEPTH moves come from a breadth first search,
+   keyed by the facelets permutation of the sequence (see rubiks_cube.facelets).
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from rubiks_cube.constants import FACE_MOVES, FACE_ORDER
+from rubiks_cube.facelets import FACELET_MOVES, N_FACELETS
+from rubiks_cube.moves import Move, get_move
+
+MOVES = [Move(m) for m in FACE_MOVES]
+IDENTITY_DEPTH = 4
+DEFAULT_WINDOW = 12
+OptimiserInfo = namedtuple("OptimiserInfo", ["calls", "moves_in", "moves_out", "saved"])
+
+_FACE_RANK = {face: i for i, face in enumerate(FACE_ORDER)}
+# The effect of a sequence is the inverse of its facelets permutation, as bytes: two sequences with the same effect
+# are equivalent. Inverse permutations of the moves are bytes.translate tables, so that
+# effect.translate(_TRANSLATIONS[m]) is the effect of the sequence followed by m, computed with a single C call
+_IDENTITY = bytes(range(N_FACELETS))
+_TRANSLATIONS = [bytes(np.argsort(p).tolist()) + bytes(range(N_FACELETS, 256)) for p in FACELET_MOVES]
+
+
+def _is_canonical(move, last_move):
+    """Same rule as normalise_moves: no two moves on a face, opposite faces in FACE_ORDER order."""
+    return last_move is None or move.axis != last_move.axis or _FACE_RANK[move.face] > _FACE_RANK[last_move.face]
+
+
+@lru_cache(maxsize=None)
+def shortest_sequences(depth=IDENTITY_DEPTH):
+    """Dict of the effect of all sequences of at most depth moves -> shortest sequence (tuple of Moves) with this
+    effect. About 47k entries for depth 4."""
+    table = {_IDENTITY: ()}
+    frontier = [(_IDENTITY, ())]
+    for _ in range(depth):
+        next_frontier = []
+        for effect, sequence in frontier:
+            last_move = sequence[-1] if sequence else None
+            for move in MOVES:
+                if not _is_canonical(move, last_move):
+                    continue
+                new_effect = effect.translate(_TRANSLATIONS[move.index])
+                if new_effect not in table:
+                    table[new_effect] = sequence + (move,)
+                    next_frontier.append((new_effect, table[new_effect]))
+        frontier = next_frontier
+    return table
+
+
+def _merge(block, move):
+    """Normalised form of a normalised block of moves on one axis, followed by a move on this axis."""
+    powers = {}
+    for m in block + (move,):
+        powers[m.face] = powers.get(m.face, 0) + m.power
+    return tuple(get_move(face, power) for face, power in sorted(powers.items(), key=lambda fp: _FACE_RANK[fp[0]])
+                 if power % 4 != 0)
+
+
+def _compute_merged():
+    """Dict of all (normalised block on one axis + a move on this axis) -> normalised block."""
+    merged = {}
+    for move in MOVES:
+        same_axis = [m for m in MOVES if m.axis == move.axis]
+        blocks = [(m,) for m in same_axis] + [(m1, m2) for m1 in same_axis for m2 in same_axis
+                                                 if _FACE_RANK[m1.face] < _FACE_RANK[m2.face]]
+        for block in blocks:
+            merged[block + (move,)] = _merge(block, move)
+    return merged
+
+
+_MERGED = _compute_merged()
+
+
+def normalise_moves(moves):
+    """Merge and cancel the moves which commute (same axis), and sort them in FACE_ORDER. Returns a list of Moves."""
+    res = []
+    for move in moves:
+        move = Move(move)
+        # Trailing block of res on the same axis: at most one move per face, in FACE_ORDER
+        if res and res[-1].axis == move.axis:
+            if len(res) > 1 and res[-2].axis == move.axis:
+                res[-2:] = _MERGED[res[-2], res[-1], move]
+            else:
+                res[-1:] = _MERGED[res[-1], move]
+        else:
+            res.append(move)
+    return res
+
+
+def peephole(moves, window=DEFAULT_WINDOW, depth=IDENTITY_DEPTH):
+    """Replace windows of at most window moves by a shorter sequence with the same effect, if one of at most depth
+    moves exists. At each position the replacement saving the most moves is used. Returns a list of Moves."""
+    get_shorter = shortest_sequences(depth).get
+    res = list(moves)
+    translations = [_TRANSLATIONS[m.index] for m in res]
+    i = 0
+    while i < len(res):
+        effect = _IDENTITY
+        best = None  # (end of window, shorter sequence)
+        saved = 0
+        for length, translation in enumerate(translations[i:i + window], 1):
+            effect = effect.translate(translation)
+            shorter = get_shorter(effect)
+            if shorter is not None and length - len(shorter) > saved:
+                saved = length - len(shorter)
+                best = (i + length, shorter)
+        if best is None:
+            i += 1
+        else:
+            end, shorter = best
+            res[i:end] = shorter
+            translations[i:end] = [_TRANSLATIONS[m.index] for m in shorter]
+            i = max(0, i - window + 1)  # Windows overlapping the replacement may now be shortened
+    return res
+
+
+class MoveOptimiser:
+    """Shortens move sequences (see module docstring), counting the moves saved."""
+    def __init__(self, window=DEFAULT_WINDOW, depth=IDENTITY_DEPTH):
+        self.window = window
+        self.depth = depth
+        self.calls = 0
+        self.moves_in = 0
+        self.moves_out = 0
+
+    @property
+    def saved(self):
+        return self.moves_in - self.moves_out
+
+    def info(self):
+        return OptimiserInfo(self.calls, self.moves_in, self.moves_out, self.saved)
+
+    def optimise(self, moves):
+        """Returns an equivalent list of Moves, never longer than moves."""
+        res = normalise_moves(moves)
+        while True:
+            shorter = peephole(res, self.window, self.depth)
+            if len(shorter) == len(res):
+                break
+            res = normalise_moves(shorter)
+        self.calls += 1
+        self.moves_in += len(moves)
+        self.moves_out += len(res)
+        return res
+
+
+def optimise_moves(moves, window=DEFAULT_WINDOW, depth=IDENTITY_DEPTH):
+    return MoveOptimiser(window, depth).optimise(moves)
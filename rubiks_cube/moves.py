@@ -0,0 +1,86 @@
+"""This module contains the Move type, for the 18 face turns, and a parser for whole algorithms."""
+import re
+from functools import lru_cache
+
+from rubiks_cube.constants import FACE_MOVES, FACE_ORDER
+
+SUFFIX_FOR_POWER = {1: "", 2: "2", 3: "'"}
+
+
+class Move(str):
+    """One of the 18 face turns.
+    Moves are str, so they can be used anywhere a move string is expected, but there are only 18 interned
+    instances (Move("R'") is Move("R'")) carrying precomputed attributes, to avoid parsing strings again:
+     - face: "U", "R", "F", "D", "L" or "B"
+     - power: number of clockwise quarter turns (1, 2 or 3)
+     - index: index in FACE_MOVES, and so in all move tables (see rubiks_cube.facelets / rubiks_cube.cubie)
+     - axis: 0 for U / D, 1 for R / L, 2 for F / B
+     - inverse, flipped_left_right, flipped_up_down: images of the move (as Move)
+     - rotated_about_y: images of the move when rotating the cube by 0 to 3 quarter turns about Y
+    """
+    def __new__(cls, name):
+        move = MOVES.get(name)
+        if move is None:
+            raise ValueError(f"Unknown move {name!r}")
+        return move
+
+    def __reduce__(self):
+        return Move, (str(self),)
+
+    def __repr__(self):
+        return f"Move({str(self)!r})"
+
+
+def _create_move(name):
+    move = str.__new__(Move, name)
+    move.face = name[0]
+    move.power = {"": 1, "2": 2, "'": 3}[name[1:]]
+    move.index = FACE_MOVES.index(name)
+    move.axis = FACE_ORDER.index(move.face) % 3
+    return move
+
+
+MOVES = {name: _create_move(name) for name in FACE_MOVES}
+
+
+def get_move(face, power):
+    """Returns the Move turning face by power clockwise quarter turns (power modulo 4 should not be 0)."""
+    return MOVES[face + SUFFIX_FOR_POWER[power % 4]]
+
+
+def _add_symmetries():
+    side_faces = ["F", "L", "B", "R"]
+    swap_left_right = {"L": "R", "R": "L"}
+    swap_up_down = {"U": "D", "D": "U"}
+    for move in MOVES.values():
+        move.inverse = get_move(move.face, -move.power)
+        move.flipped_left_right = get_move(swap_left_right.get(move.face, move.face), -move.power)
+        move.flipped_up_down = get_move(swap_up_down.get(move.face, move.face), -move.power)
+        if move.face in side_faces:
+            i = side_faces.index(move.face)
+            move.rotated_about_y = tuple(get_move(side_faces[(i + k) % 4], move.power) for k in range(4))
+        else:
+            move.rotated_about_y = (move,) * 4
+
+
+_add_symmetries()
+
+_TOKEN_RE = re.compile(r"[URFDLB](?:2'?|')?")
+_ALGORITHM_RE = re.compile(r"\s*(?:[URFDLB](?:2'?|')?\s*)*")
+_MOVE_FOR_TOKEN = {**MOVES, **{f + "2'": MOVES[f + "2"] for f in FACE_ORDER}}
+
+
+@lru_cache(maxsize=1024)
+def _parse(algorithm):
+    if _ALGORITHM_RE.fullmatch(algorithm) is None:
+        raise ValueError(f"Invalid algorithm {algorithm!r}")
+    return tuple(_MOVE_FOR_TOKEN[token] for token in _TOKEN_RE.findall(algorithm))
+
+
+def parse_moves(algorithm):
+    """Parse an algorithm in standard ("R U R' U2") or compact ("RUR'U2") notation into a list of Moves."""
+    return list(_parse(algorithm))
+
+
+def format_moves(moves, compact=False):
+    return ("" if compact else " ").join(moves)
@@ -1,12 +1,18 @@
+from collections import deque
 from typing import List
 
 import kociemba
 import numpy as np
 from colorama import Back
 
+from rubiks_cube.algorithms import compile_moves, compose_moves
 from rubiks_cube.constants import ALL_MOVES, FACE_ORDER
 from rubiks_cube.core import get_cube_ids_on_face, state_str_to_state_description, get_rot, get_permutation
 from rubiks_cube.cube import generate_cubes, generate_cubes_from_state_str, Cube
+from rubiks_cube.cubic_mathematics import CubicRotation
+from rubiks_cube.cubie import CubieCube
+from rubiks_cube.facelets import FACELET_MOVES, SOLVED_FACELETS, facelets_to_state_str, state_str_to_facelets
+from rubiks_cube.moves import Move, parse_moves
 
 
 class RubiksCube:
@@ -16,10 +22,19 @@ class RubiksCube:
      - list of colors:  UUUUUULLLURRURRURRFFFFFFFFFRRRDDDDDDLLDLLDLLDBBBBBBBBB
      - list of 26 3D positions and rotations (one per cube) - ORDERED
      - history of moves: FL'RU'...
+     - corner / edge permutation and orientation arrays (CubieCube)
+     - array of 54 facelets color ids, from which the state string is materialised (and cached) on access
      Some important primitive:
      - List of cubes on one face (needed for animation)
      - Cubes permutation
+
+    The facelets array is always kept up to date (one permutation per move). Besides, three backends
+    are available to track the state when moving faces:
+     - "cubes" (default): one Cube object per position, needed by the OpenGL drawer
+     - "cubie": a CubieCube, much cheaper to move, but self.cubes is not available
+     - "facelets": nothing more than the facelets array, cheapest when only the state string is needed
     """
+    BACKENDS = ("cubes", "cubie", "facelets")
     SOLVED_STR = "UUUUUUUUURRRRRRRRRFFFFFFFFFDDDDDDDDDLLLLLLLLLBBBBBBBBB"
     TERM_COLORS = {"U": "\033[48;5;15m", "R": Back.GREEN, "F": "\033[48;5;202m",
                    "D": "\033[48;5;11m", "L": Back.BLUE, "B": "\033[48;5;196m"}
@@ -29,11 +44,29 @@ class RubiksCube:
                                for z in (-1, 0, 1)
                                if not (x == y == z == 0)]
 
-    def __init__(self, state=None):
-        self.cubes: List[Cube] = generate_cubes()
-        # self._compute_state_string()
-        self.state_string = state if state is not None else self.SOLVED_STR
-        self.history_moves = []
+    def __init__(self, state=None, backend="cubes", history_size=None):
+        """history_size caps the number of moves kept in history_moves (None for no limit, 0 to disable it)."""
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend {backend}, should be one of {self.BACKENDS}")
+        self.backend = backend
+        self.cubes: List[Cube] = generate_cubes() if backend == "cubes" else None
+        self.cubie: CubieCube = CubieCube() if backend == "cubie" else None
+        self.facelets = SOLVED_FACELETS.copy()
+        self._state_string = self.SOLVED_STR
+        self.history_moves = deque(maxlen=history_size)
+        if state is not None:
+            self.load_state(state)
+
+    @property
+    def state_string(self):
+        if self._state_string is None:
+            self._state_string = facelets_to_state_str(self.facelets)
+        return self._state_string
+
+    @state_string.setter
+    def state_string(self, state_str):
+        self.facelets = state_str_to_facelets(state_str)
+        self._state_string = state_str
 
     def __repr__(self):
         return f"<Cube: {self.state_string}>"
@@ -62,6 +95,12 @@ class RubiksCube:
         return self.cubes[get_cube_ids_on_face(face)]
 
     def _compute_state_string(self):
+        """Recompute state string (and facelets) from the backend model, rather than from the facelets."""
+        if self.backend == "cubie":
+            self.state_string = self.cubie.to_state_str()
+            return
+        if self.backend == "facelets":
+            return
         state_str = ""
         # TODO iterate over cubes rather than faces
         for face in FACE_ORDER:
@@ -72,10 +111,21 @@ class RubiksCube:
         self.state_string = state_str
 
     def move(self, f, lazy=False):
-        self.history_moves.append(f)
-        face = f[0]
-        reverse = "'" in f
-        double = "2" in f
+        """Move face f. lazy is kept for compatibility only: the state string is now always
+        materialised from the facelets on next access."""
+        move = Move(f)
+        self.history_moves.append(move)
+        i = move.index
+        self.facelets = self.facelets[FACELET_MOVES[i]]
+        self._state_string = None
+        if self.backend == "cubie":
+            self.cubie.move(i)
+            return
+        if self.backend == "facelets":
+            return
+        face = move.face
+        reverse = move.power == 3
+        double = move.power == 2
         # Apply rotation to all cubes
         rot = get_rot(face, reverse, double)
         for c in self.get_cubes_on_face(face):
@@ -83,23 +133,53 @@ class RubiksCube:
         # Permute cubes order
         permutation = get_permutation(face, reverse, double)
         self.cubes = self.cubes[permutation]
-        if not lazy:
-            self._compute_state_string()
+
+    def apply(self, moves, record_history=True):
+        """Apply a sequence of moves (a list, or an algorithm string like "R U R' U2" or "RUR'U2")
+        in a single pass, the state string is only materialised on next access."""
+        if isinstance(moves, str):
+            moves = parse_moves(moves)
+        compiled = compose_moves(moves, cubie=self.backend == "cubie", cubes=self.backend == "cubes")
+        self._apply_compiled(compiled, record_history)
+
+    def apply_algorithm(self, moves, rotate_about=None, flip=False, record_history=True):
+        """Apply a sequence of moves at once, with its cached compiled permutation (see rubiks_cube.algorithms).
+        Meant for algorithms applied over and over, use apply for one-off sequences."""
+        self._apply_compiled(compile_moves(moves, rotate_about, flip), record_history)
+
+    def _apply_compiled(self, compiled, record_history):
+        if record_history:
+            self.history_moves.extend(compiled.moves)
+        self.facelets = self.facelets[compiled.facelets]
+        self._state_string = None
+        if self.backend == "cubie":
+            self.cubie.multiply(compiled.cubie)
+        elif self.backend == "cubes":
+            permutation, rotations = compiled.cubes
+            self.cubes = self.cubes[permutation]
+            for c, r in zip(self.cubes, rotations.tolist()):
+                if r != 0:
+                    c.rotate(CubicRotation.from_index(r))
 
     def shuffle(self, n=30):
         possible_moves = ALL_MOVES
         moves = np.random.choice(possible_moves, n)
-        for move in moves:
-            self.move(move)
+        self.apply(moves)
         return moves
 
     def is_solved(self):
         return self.state_string == RubiksCube.SOLVED_STR
 
-    def load_state(self, state_str):
-        self.cubes = generate_cubes_from_state_str(state_str)
+    def load_state(self, state_str, check=False):
+        """Load given state, raising a ValueError if check is True and the state is not solvable."""
+        if self.backend == "cubie":
+            self.cubie = CubieCube.from_state_str(state_str, check=check)
+        elif self.backend == "cubes":
+            self.cubes = generate_cubes_from_state_str(state_str, check=check)
+        elif check:
+            CubieCube.from_state_str(state_str, check=True)
         self.state_string = state_str
-        self.history_moves = []
+        self.history_moves.clear()
 
 
 if __name__ == '__main__':
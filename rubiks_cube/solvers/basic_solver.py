@@ -1,93 +1,56 @@
+"""Beginner method solver: white cross, white corners, second crown, yellow cross, then yellow corners.
+
+Each stage looks at a few stickers of the state string, and picks an algorithm for the case it finds. The geometry
+(which sticker to look at, how to rotate an algorithm to a given side) only depends on the case, so it is resolved
+once at import, into tables of sticker indices and case -> algorithm (tuple of Moves). Solving is then pure Python:
+string indexing, dict lookups, and one precompiled permutation of the state string per algorithm.
+"""
+from itertools import product
+from operator import itemgetter
+
 import numpy as np
-from scipy.spatial.transform.rotation import Rotation
 
-from rubiks_cube.core import get_color_from_state_str, Y, X, Z, get_normal, get_face_for_normal, neg_move
+from rubiks_cube.algorithms import rotate_moves_about_y, flip_left_right, flip_up_down, compose_moves
+from rubiks_cube.constants import FACE_ORDER
+from rubiks_cube.core import get_facelet_index, Y, X, Z, get_normal, get_face_for_normal, neg_move
+from rubiks_cube.move_optimiser import MoveOptimiser
+from rubiks_cube.moves import Move
 from rubiks_cube.rubikscube import RubiksCube
+from rubiks_cube.solvers.metrics import stage_timer, solve_timer
+from rubiks_cube.solvers.near_solved_table import solve_near_solved
 from utils import angle, profile, rotate_list
 
+SIDE_FACES = ["F", "R", "B", "L"]
+# (x, z, normal of the side sticker) of the edges around the Y axis, and (x, z) of the corners
+EDGE_SLOTS = [(-1, 0, -X), (1, 0, X), (0, -1, -Z), (0, 1, Z)]
+CORNER_SLOTS = [(x, z) for x in (-1, 1) for z in (-1, 1)]
 
-def is_white_cross_done(state_str):
-    for x in (-1, 1):
-        pos = np.array([x, 1, 0])
-        # print(pos, get_color_from_state_str(state_str, pos, Y), get_color_from_state_str(state_str, pos, x * X), get_face_for_normal(x * X))
-        if get_color_from_state_str(state_str, pos, Y) != "U" or \
-                get_color_from_state_str(state_str, pos, x * X) != get_face_for_normal(x * X):
-            return False
-    for z in (-1, 1):
-        pos = np.array([0, 1, z])
-        if get_color_from_state_str(state_str, pos, Y) != "U" or \
-                get_color_from_state_str(state_str, pos, z * Z) != get_face_for_normal(z * Z):
-            return False
-    return True
-
-
-def is_white_corners_done(state_str):
-    for x in (-1, 1):
-        for z in (-1, 1):
-            pos = np.array([x, 1, z])
-            cu = get_color_from_state_str(state_str, pos, Y)
-            cx = get_color_from_state_str(state_str, pos, x*X)
-            cz = get_color_from_state_str(state_str, pos, z*Z)
-            if cu != "U" or cx != get_face_for_normal(x*X) or cz != get_face_for_normal(z*Z):
-                return False
-    return True
-
-
-def is_second_crown_done(state_str):
-    for x in (-1, 1):
-        for z in (-1, 1):
-            pos = np.array([x, 0, z])
-            cx = get_color_from_state_str(state_str, pos, x*X)
-            cz = get_color_from_state_str(state_str, pos, z*Z)
-            if cx != get_face_for_normal(x * X) or cz != get_face_for_normal(z * Z):
-                return False
-    return True
-
-
-def is_yellow_cross_done(state_str):
-    for n in (X, -X, Z, -Z):
-        pos = np.array([0, -1, 0]) + n
-        c_down = get_color_from_state_str(state_str, pos, -Y)
-        if c_down != "D":
-            return False
-    return True
 
+def _index(pos, direction):
+    return get_facelet_index(np.asarray(pos), direction)
 
-def is_yellow_cross_oriented(state_str):
-    for n in (X, -X, Z, -Z):
-        pos = np.array([0, -1, 0]) + n
-        c_down = get_color_from_state_str(state_str, pos, -Y)
-        c_side = get_color_from_state_str(state_str, pos, n)
-        if c_down != "D" or get_face_for_normal(n) != c_side:
-            return False
-    return True
 
+def _moves(moves):
+    return tuple(Move(m) for m in moves)
 
-def is_yellow_corners_positioned(state_str):
-    side_faces = ["F", "R", "B", "L"]
-    for i, f in enumerate(side_faces):
-        n = get_normal(f)
-        m = np.cross(Y, n)
-        pos = -Y + n + m
-        corner = {
-            get_color_from_state_str(state_str, pos, -Y),
-            get_color_from_state_str(state_str, pos, n),
-            get_color_from_state_str(state_str, pos, m)
-        }
-        aim_corner = {"D", side_faces[i], side_faces[(i + 1) % 4]}
-        if aim_corner != corner:
-            return False
-    return True
 
+def _rotated(moves, normal):
+    return _moves(rotate_moves_about_y(moves, normal))
 
-def is_yellow_corners_oriented(state_str):
-    return state_str == RubiksCube.SOLVED_STR
+
+def _done_checker(stickers):
+    """Function telling whether all the (facelet index, color) of stickers are in place."""
+    getter = itemgetter(*[i for i, _ in stickers])
+    expected = tuple(c for _, c in stickers)
+
+    def is_done(state_str):
+        return getter(state_str) == expected
+    return is_done
 
 
 def _get_up_turn(v1, v2):
     theta = angle(v1, v2, ignore_axis=1)
     theta = (np.round(theta / np.pi * 2) * 90) % 360
-    # print(f"{theta=}")
     m1 = []
     if theta == 90:
         m1 = ["U"]
@@ -99,165 +62,179 @@ def _get_up_turn(v1, v2):
     return m1, m3
 
 
+# U turns bringing a piece from above the side of normal(face) to above the side of normal(to_face), and back
+_UP_TURNS = {(face, to_face): tuple(map(_moves, _get_up_turn(get_normal(face), get_normal(to_face))))
+             for face in FACE_ORDER for to_face in FACE_ORDER}
+
+is_white_cross_done = _done_checker(
+    [(_index([x, 1, z], Y), "U") for x, z, _ in EDGE_SLOTS]
+    + [(_index([x, 1, z], n), get_face_for_normal(n)) for x, z, n in EDGE_SLOTS])
+
+is_white_corners_done = _done_checker(
+    [(_index([x, 1, z], Y), "U") for x, z in CORNER_SLOTS]
+    + [(_index([x, 1, z], x * X), get_face_for_normal(x * X)) for x, z in CORNER_SLOTS]
+    + [(_index([x, 1, z], z * Z), get_face_for_normal(z * Z)) for x, z in CORNER_SLOTS])
+
+is_second_crown_done = _done_checker(
+    [(_index([x, 0, z], x * X), get_face_for_normal(x * X)) for x, z in CORNER_SLOTS]
+    + [(_index([x, 0, z], z * Z), get_face_for_normal(z * Z)) for x, z in CORNER_SLOTS])
+
+is_yellow_cross_done = _done_checker([(_index(-Y + n, -Y), "D") for n in (X, -X, Z, -Z)])
+
+is_yellow_cross_oriented = _done_checker(
+    [(_index(-Y + n, -Y), "D") for n in (X, -X, Z, -Z)]
+    + [(_index(-Y + n, n), get_face_for_normal(n)) for n in (X, -X, Z, -Z)])
+
+
+# Facelet indices of the D, side and next side stickers of the D corners below each side face, in SIDE_FACES order
+_YELLOW_CORNERS = [(_index(-Y + get_normal(f) + np.cross(Y, get_normal(f)), -Y),
+                    _index(-Y + get_normal(f) + np.cross(Y, get_normal(f)), get_normal(f)),
+                    _index(-Y + get_normal(f) + np.cross(Y, get_normal(f)), np.cross(Y, get_normal(f))))
+                   for f in SIDE_FACES]
+_AIM_CORNERS = [frozenset(("D", SIDE_FACES[i], SIDE_FACES[(i + 1) % 4])) for i in range(4)]
+
+
+def _yellow_corners(state_str):
+    return [frozenset((state_str[a], state_str[b], state_str[c])) for a, b, c in _YELLOW_CORNERS]
+
+
+def is_yellow_corners_positioned(state_str):
+    return _yellow_corners(state_str) == _AIM_CORNERS
+
+
+def is_yellow_corners_oriented(state_str):
+    return state_str == RubiksCube.SOLVED_STR
+
+
+def _compute_white_cross_tables():
+    # Edges of the second crown holding a U sticker: (index of sticker along X, along Z, moves for (i, color))
+    # where i is 0 if the U sticker is along Z (color is the one along X), 1 otherwise
+    middle = []
+    for x, z in CORNER_SLOTS:
+        pos = np.array([x, 0, z])
+        moves = {}
+        for i in (0, 1):
+            n, u = [x * X, z * Z][i], [x * X, z * Z][1 - i]
+            m2 = get_face_for_normal(n)
+            if np.cross(n, u)[1] > 0:
+                m2 += "'"
+            for color in FACE_ORDER:
+                m1, m3 = _UP_TURNS[get_face_for_normal(n), color]
+                moves[i, color] = m1 + _moves([m2]) + m3
+        middle.append((_index(pos, x * X), _index(pos, z * Z), moves))
+    # Down edges: (side sticker, down sticker, moves for side color if U is down, moves if U is on the side)
+    down = []
+    for x, z, n in EDGE_SLOTS:
+        pos = np.array([x, -1, z])
+        face = get_face_for_normal(n)
+        down_moves = {color: _UP_TURNS[color, face][0] + _moves([face + "2"]) + _UP_TURNS[color, face][1]
+                      for color in FACE_ORDER}
+        m1, m3 = _UP_TURNS["U", face]
+        side_moves = m1 + _moves([face, "U", get_face_for_normal(np.cross(n, Y)), "U'"]) + m3
+        down.append((_index(pos, n), _index(pos, -Y), down_moves, side_moves))
+    # Up edges: (side sticker, its color when in place)
+    up = [(_index([x, 1, z], n), get_face_for_normal(n)) for x, z, n in EDGE_SLOTS]
+    return middle, down, up
+
+
+_WHITE_CROSS_MIDDLE, _WHITE_CROSS_DOWN, _WHITE_CROSS_UP = _compute_white_cross_tables()
+
+
 def white_cross(state_str):
     # Start with 2nd crown edges
-    for x in (-1, 1):
-        for z in (-1, 1):
-            pos = np.array([x, 0, z])
-            cols = [get_color_from_state_str(state_str, pos, x * X), get_color_from_state_str(state_str, pos, z * Z)]
-            if "U" in cols:
-                # print("2nd crown")
-                i = [c != "U" for c in cols].index(True)
-                col = cols[i]
-                n = [x * X, z * Z][i]
-                v = get_normal(col)
-                # print(n, v)
-                u = [x * X, z * Z][1 - i]
-
-                m1, m3 = _get_up_turn(n, v)
-
-                m2 = get_face_for_normal(n)
-                if np.cross(n, u)[1] > 0:
-                    m2 += "'"
-                # print(m1, m2, m3)
-
-                return m1 + [m2] + m3
-
+    for ix, iz, moves in _WHITE_CROSS_MIDDLE:
+        cx, cz = state_str[ix], state_str[iz]
+        if cx == "U":
+            return moves[1, cz]
+        if cz == "U":
+            return moves[0, cx]
     # Then down edges
-    for x, z, n in [(-1, 0, -X), (1, 0, X), (0, -1, -Z), (0, 1, Z)]:
-        pos = np.array([x, -1, z])
-        c_side = get_color_from_state_str(state_str, pos, n)
-        c_down = get_color_from_state_str(state_str, pos, -Y)
-        if c_down == "U":
-            # print("Down - down")
-            m1, m3 = _get_up_turn(get_normal(c_side), n)
-            m2 = get_face_for_normal(n) + "2"
-            # print(m1, m2, m3)
-            return m1 + [m2] + m3
+    for i_side, i_down, down_moves, side_moves in _WHITE_CROSS_DOWN:
+        c_side = state_str[i_side]
+        if state_str[i_down] == "U":
+            return down_moves[c_side]
         elif c_side == "U":
-            # print("Down - side")
-            m1, m3 = _get_up_turn(get_normal(c_side), n)
-            m = get_face_for_normal(n)
-            mm = get_face_for_normal(np.cross(n, Y))
-            m2 = [m, "U", mm, "U'"]
+            return side_moves
+    # Then up edges (if misplaced)
+    for i, face in _WHITE_CROSS_UP:
+        if state_str[i] != face:
+            return (Move(face),)  # Simply get it out
+    raise ValueError("No move found, it cross done?")
 
-            return m1 + m2 + m3
 
-    # Then up edges (if misplaced)
-    for x, z, n in [(-1, 0, -X), (1, 0, X), (0, -1, -Z), (0, 1, Z)]:
+def _compute_white_corners_tables():
+    # Down corners: (sticker along X, along Z, down sticker, moves for (U along X, other side color),
+    # moves for the color along X if U is down)
+    down = []
+    for x, z in CORNER_SLOTS:
+        pos = np.array([x, -1, z])
+        side_moves = {}
+        for u_along_x in (True, False):
+            n = x * X if u_along_x else z * Z
+            v = z * Z if u_along_x else x * X
+            m2 = [get_face_for_normal(n), "D"]
+            if np.cross(v, n)[1] > 0:
+                m2[0] += "'"
+                m2[1] += "'"
+            m2.append(neg_move(m2[0]))
+            for color in FACE_ORDER:
+                m1, m3 = _UP_TURNS[color, get_face_for_normal(v)]
+                side_moves[u_along_x, color] = m1 + _moves(m2) + m3
+        f = get_face_for_normal(x * X)
+        m2 = [f, "D'", neg_move(f)]
+        if x * z > 0:
+            m2 = [neg_move(m) for m in m2]
+        down_moves = {color: _UP_TURNS[color, get_face_for_normal(z * Z)][0] + _moves(m2)
+                      + _UP_TURNS[color, get_face_for_normal(z * Z)][1] for color in FACE_ORDER}
+        down.append((_index(pos, x * X), _index(pos, z * Z), _index(pos, -Y), side_moves, down_moves))
+    # Up corners: (up sticker, sticker along X, along Z, their colors when in place, moves for U along X)
+    up = []
+    for x, z in CORNER_SLOTS:
         pos = np.array([x, 1, z])
-        # print(pos, get_color_from_state_str(state_str, pos, n))
-        if get_color_from_state_str(state_str, pos, n) != get_face_for_normal(n):
-            # print("Misplaced", pos, n)
-            return [get_face_for_normal(n)]  # Simply get it out
+        moves = {}
+        for u_along_x in (True, False):
+            n = x * X if u_along_x else z * Z
+            v = z * Z if u_along_x else x * X
+            m2 = [get_face_for_normal(n), "D", neg_move(get_face_for_normal(n))]
+            if np.cross(v, n)[1] > 0:
+                m2 = [neg_move(m) for m in m2]
+            moves[u_along_x] = _moves(m2)
+        up.append((_index(pos, Y), _index(pos, x * X), _index(pos, z * Z),
+                   get_face_for_normal(x * X), get_face_for_normal(z * Z), moves))
+    return down, up
 
-    raise ValueError("No move found, it cross done?")
+
+_WHITE_CORNERS_DOWN, _WHITE_CORNERS_UP = _compute_white_corners_tables()
 
 
 def white_corners(state_str):
     # Down corners
-    for x in (-1, 1):
-        for z in (-1, 1):
-            pos = np.array([x, -1, z])
-            csx = get_color_from_state_str(state_str, pos, x * X)
-            csz = get_color_from_state_str(state_str, pos, z * Z)
-            c_down = get_color_from_state_str(state_str, pos, -Y)
-            if csx == "U" or csz == "U":
-                # White on side
-                # print("Down - side", csx, csz, c_down)
-                n = x*X if csx == "U" else z*Z
-                v = z*Z if csx == "U" else x*X
-                col = csz if csx == "U" else csx
-                m1, m3 = _get_up_turn(get_normal(col), v)
-                to_right = np.cross(v, n)[1] > 0
-                m2 = [get_face_for_normal(n), "D"]
-                if to_right:
-                    m2[0] += "'"
-                    m2[1] += "'"
-                m2.append(neg_move(m2[0]))
-                return m1 + m2 + m3
-            elif c_down == "U":
-                # White down -> just move it on side
-                csx = get_color_from_state_str(state_str, pos, x * X)
-                csz = get_color_from_state_str(state_str, pos, z * Z)
-                # print("Down - down", csx, csz)
-                m1, m3 = _get_up_turn(get_normal(csx), z*Z)  # Rotate around x
-                f = get_face_for_normal(x * X)
-                m2 = [f, "D'", neg_move(f)]
-                if x*z > 0:
-                    m2 = [neg_move(m) for m in m2]
-                # print(m1 + m2 + m3)
-                return m1 + m2 + m3
+    for ix, iz, i_down, side_moves, down_moves in _WHITE_CORNERS_DOWN:
+        csx, csz = state_str[ix], state_str[iz]
+        if csx == "U":  # White on side
+            return side_moves[True, csz]
+        if csz == "U":
+            return side_moves[False, csx]
+        if state_str[i_down] == "U":  # White down -> just move it on side
+            return down_moves[csx]
     # Up corners -> move it down
-    for x in (-1, 1):
-        for z in (-1, 1):
-            pos = np.array([x, 1, z])
-            cu = get_color_from_state_str(state_str, pos, Y)
-            csx = get_color_from_state_str(state_str, pos, x * X)
-            csz = get_color_from_state_str(state_str, pos, z * Z)
-            if cu != "U" or csx != get_face_for_normal(x*X) or csz != get_face_for_normal(z*Z):
-                # print("Corner wrongly oriented")
-                n = x*X if csx == "U" else z*Z
-                v = z*Z if csx == "U" else x*X
-                m2 = [get_face_for_normal(n), "D", neg_move(get_face_for_normal(n))]
-                to_right = np.cross(v, n)[1] > 0
-                if to_right:
-                    m2 = [neg_move(m) for m in m2]
-                return m2
+    for iu, ix, iz, fx, fz, moves in _WHITE_CORNERS_UP:
+        csx = state_str[ix]
+        if state_str[iu] != "U" or csx != fx or state_str[iz] != fz:
+            return moves[csx == "U"]
     raise ValueError("No move found: is white face finished?")
 
 
-def rotate_moves_about_y(moves, normal):
-    ORDER = ["F", "L", "B", "R"]
-    di = round(angle(Z, normal, ignore_axis=1) / np.pi * 2) + 4
-    res = []
-    for m in moves:
-        l = m[0]
-        ll = m[1:]
-        if l in ORDER:
-            move = ORDER[(ORDER.index(l) + di) % 4] + ll
-            res.append(move)
-        else:
-            res.append(m)
-    return res
-
-
-def flip_left_right(moves):
-    res = []
-    for m in moves:
-        if "R" in m:
-            move = "L" + neg_move(m)[1:]
-        elif "L" in m:
-            move = "R" + neg_move(m)[1:]
-        else:
-            move = neg_move(m)
-        res.append(move)
-    return res
-
-
-def flip_up_down(moves):
-    res = []
-    for m in moves:
-        if "U" in m:
-            move = "D" + neg_move(m)[1:]
-        elif "D" in m:
-            move = "U" + neg_move(m)[1:]
-        else:
-            move = neg_move(m)
-        res.append(move)
-    return res
-
-
 BASE_SECOND_CROWN_MOVE = ["D'", "R'", "D", "R", "D", "F", "D'", "F'"]
 
 
-def second_crown(state_str):
-    for x, z, n in [(-1, 0, -X), (1, 0, X), (0, -1, -Z), (0, 1, Z)]:
+def _compute_second_crown_tables():
+    # Down edges: (side sticker, down sticker, moves for (side color, down color))
+    down = []
+    for x, z, n in EDGE_SLOTS:
         pos = np.array([x, -1, z])
-        c_side = get_color_from_state_str(state_str, pos, n)
-        c_down = get_color_from_state_str(state_str, pos, -Y)
-        if "D" not in [c_side, c_down]:  # Down edges
-            # print("Down edge", c_down, c_side)
+        moves = {}
+        for c_side in FACE_ORDER:
             # Move in front of c_side color
             theta = angle(n, get_normal(c_side), ignore_axis=1)
             theta = (np.round(theta / np.pi * 2) * 90) % 360
@@ -268,27 +245,32 @@ def second_crown(state_str):
                 m1 = ["D2"]
             if theta == 270:
                 m1 = ["D"]
-            # is_right if c_down is to its right
-            to_left = np.cross(get_normal(c_side), get_normal(c_down))[1] > 0
-            moves = BASE_SECOND_CROWN_MOVE
-            if not to_left:
-                # print("to_right")
-                moves = flip_left_right(moves)
-            moves = rotate_moves_about_y(moves, get_normal(c_side))
-            return m1 + moves
-    for x in (-1, 1):
-        for z in (-1, 1):
-            pos = np.array([x, 0, z])
-            cs1 = get_color_from_state_str(state_str, pos, x*X)
-            cs2 = get_color_from_state_str(state_str, pos, z*Z)
-            if cs1 != get_face_for_normal(x*X) or cs2 != get_face_for_normal(z*Z):  # Wrong place / orientation
-                # print("Edge misplaced", cs1, cs2, x, z)
-                if x * z == -1:
-                    rotate_about = x * X
-                else:
-                    rotate_about = z * Z
-                moves = rotate_moves_about_y(BASE_SECOND_CROWN_MOVE, rotate_about)
-                return moves
+            for c_down in FACE_ORDER:
+                to_left = np.cross(get_normal(c_side), get_normal(c_down))[1] > 0
+                algorithm = BASE_SECOND_CROWN_MOVE if to_left else flip_left_right(BASE_SECOND_CROWN_MOVE)
+                moves[c_side, c_down] = _moves(m1) + _rotated(algorithm, get_normal(c_side))
+        down.append((_index(pos, n), _index(pos, -Y), moves))
+    # Second crown edges: (sticker along X, along Z, their colors when in place, moves if misplaced)
+    middle = []
+    for x, z in CORNER_SLOTS:
+        pos = np.array([x, 0, z])
+        rotate_about = x * X if x * z == -1 else z * Z
+        middle.append((_index(pos, x * X), _index(pos, z * Z), get_face_for_normal(x * X),
+                       get_face_for_normal(z * Z), _rotated(BASE_SECOND_CROWN_MOVE, rotate_about)))
+    return down, middle
+
+
+_SECOND_CROWN_DOWN, _SECOND_CROWN_MIDDLE = _compute_second_crown_tables()
+
+
+def second_crown(state_str):
+    for i_side, i_down, moves in _SECOND_CROWN_DOWN:
+        c_side, c_down = state_str[i_side], state_str[i_down]
+        if c_side != "D" and c_down != "D":  # Down edges
+            return moves[c_side, c_down]
+    for i1, i2, f1, f2, moves in _SECOND_CROWN_MIDDLE:
+        if state_str[i1] != f1 or state_str[i2] != f2:  # Wrong place / orientation
+            return moves
     raise ValueError("No edge for second crown, is second crown done?")
 
 
@@ -296,86 +278,81 @@ BASE_YELLOW_CROSS = ["F", "L", "D", "L'", "D'", "F'"]
 BASE_YELLOW_CROSS2 = ["F", "D", "L", "D'", "L'", "F'"]
 
 
+# Rotation of 3 pi / 8 around Y, the direction of the yellow corner case is rotated by it
+_ROTATION_3PI_8 = np.array([[np.cos(3 * np.pi / 8), 0, np.sin(3 * np.pi / 8)],
+                            [0, 1, 0],
+                            [-np.sin(3 * np.pi / 8), 0, np.cos(3 * np.pi / 8)]])
+
+
+def _yellow_cross_case(is_down_x, is_down_mx, is_down_z, is_down_mz):
+    if not (is_down_x or is_down_mx or is_down_z or is_down_mz):  # No yellow
+        return _moves(BASE_YELLOW_CROSS)
+    elif is_down_x and is_down_mx:  # Line along X
+        return _rotated(BASE_YELLOW_CROSS, X)
+    elif is_down_z and is_down_mz:  # Line along Z
+        return _moves(BASE_YELLOW_CROSS)
+    # Yellow corner
+    corner = is_down_x * X + is_down_mx * (-X) + is_down_z * Z + is_down_mz * (-Z)
+    n = _ROTATION_3PI_8 @ corner
+    return _rotated(BASE_YELLOW_CROSS2, -n)
+
+
+_YELLOW_CROSS_STICKERS = itemgetter(*[_index(-Y + n, -Y) for n in (X, -X, Z, -Z)])
+# Moves for each case: D stickers of the edges along X, -X, Z, -Z are D or not
+_YELLOW_CROSS = {case: _yellow_cross_case(*case) for case in product((False, True), repeat=4)}
+
+
 def yellow_cross(state_str):
-    posx = -Y + X
-    posmx = -Y - X
-    posz = -Y + Z
-    posmz = -Y - Z
-    col_x = get_color_from_state_str(state_str, posx, -Y)
-    col_mx = get_color_from_state_str(state_str, posmx, -Y)
-    col_z = get_color_from_state_str(state_str, posz, -Y)
-    col_mz = get_color_from_state_str(state_str, posmz, -Y)
-    if "D" not in [col_x, col_mx, col_z, col_mz]:
-        # print("No yellow")
-        return BASE_YELLOW_CROSS
-    elif col_x == col_mx == "D":
-        # print("Line along X")
-        return rotate_moves_about_y(BASE_YELLOW_CROSS, X)
-    elif col_z == col_mz == "D":
-        # print("Line along Z")
-        return BASE_YELLOW_CROSS
-    else:
-        # print("Yellow corner")
-        corner = (col_x == "D") * X + (col_mx == "D") * (-X) + (col_z == "D") * Z + (col_mz == "D") * (-Z)
-        n = Rotation.from_rotvec(Y * np.pi * 3 / 8).apply(corner)
-        return rotate_moves_about_y(BASE_YELLOW_CROSS2, -n)
+    return _YELLOW_CROSS[tuple(c == "D" for c in _YELLOW_CROSS_STICKERS(state_str))]
 
 
 CHAIR = ["L", "D2", "L'", "D'", "L", "D'", "L'"]
+_ALL_DIRECTIONS = [X, -Z, -X, Z]
+_AIM_COLORS = [get_face_for_normal(n) for n in _ALL_DIRECTIONS]
 
 
-def orient_yellow_cross(state_str):
-    ALL_DIRECTIONS = [X, -Z, -X, Z]
+def _orient_yellow_cross_case(colors):
     # Check if just one color already aligned
-    colors = [get_color_from_state_str(state_str, -Y + n, n) for n in ALL_DIRECTIONS]
-    aim_colors = [get_face_for_normal(n) for n in ALL_DIRECTIONS]
-    is_rightly_positioned = [c == cc for c, cc in zip(colors, aim_colors)]
+    is_rightly_positioned = [c == cc for c, cc in zip(colors, _AIM_COLORS)]
     if sum(is_rightly_positioned) == 1:
-        # print("One is right")
         i = is_rightly_positioned.index(True)
-        to_right = colors[(i + 1)%4] == aim_colors[(i + 3)%4]
+        to_right = colors[(i + 1) % 4] == _AIM_COLORS[(i + 3) % 4]
         moves = CHAIR if not to_right else flip_left_right(CHAIR)
-        # print(to_right)
-        return rotate_moves_about_y(moves, ALL_DIRECTIONS[i])
-
+        return _rotated(moves, _ALL_DIRECTIONS[i])
     # Else try to rotate Up
     for shift in range(4):
-        is_rightly_positioned = [c == cc for c, cc in
-                                 zip(rotate_list(colors, shift), aim_colors)]
+        is_rightly_positioned = [c == cc for c, cc in zip(rotate_list(colors, shift), _AIM_COLORS)]
         if sum(is_rightly_positioned) == 1:
-            # print(f"Turn down {shift} times")
             # Just turn they go back to start of function
-            return ["D"] * shift
+            return _moves(["D"] * shift)
     # Else run CHAIR
-    return CHAIR
+    return _moves(CHAIR)
+
+
+_ORIENT_YELLOW_CROSS_STICKERS = itemgetter(*[_index(-Y + n, n) for n in _ALL_DIRECTIONS])
+# Moves for each case: colors of the side stickers of the D edges, in _ALL_DIRECTIONS order
+_ORIENT_YELLOW_CROSS = {colors: _orient_yellow_cross_case(list(colors)) for colors in product(FACE_ORDER, repeat=4)}
+
+
+def orient_yellow_cross(state_str):
+    return _ORIENT_YELLOW_CROSS[_ORIENT_YELLOW_CROSS_STICKERS(state_str)]
 
 
 BELGIUM = ["L", "D'", "R'", "D", "L'", "D'", "R", "D"]
+_BELGIUM = _moves(BELGIUM)
+# Belgium algorithms keeping the corner below SIDE_FACES[i] in place, indexed by [i][to_right]
+_BELGIUMS = [[_rotated(BELGIUM if not to_right else flip_left_right(BELGIUM),
+                       get_normal(SIDE_FACES[(i + to_right) % 4])) for to_right in (False, True)] for i in range(4)]
 
 
 def yellow_corners(state_str):
-    side_faces = ["F", "R", "B", "L"]
-    aim_corners = [{"D", side_faces[i], side_faces[(i+1) % 4]} for i in range(4)]
-    corners = []
-    for f in side_faces:
-        n = get_normal(f)
-        m = np.cross(Y, n)
-        pos = -Y + n + m
-        corners.append({
-            get_color_from_state_str(state_str, pos, -Y),
-            get_color_from_state_str(state_str, pos, n),
-            get_color_from_state_str(state_str, pos, m)
-        })
-    is_rightly_positioned = [c == cc for c, cc in zip(aim_corners, corners)]
+    corners = _yellow_corners(state_str)
+    is_rightly_positioned = [c == cc for c, cc in zip(_AIM_CORNERS, corners)]
     if sum(is_rightly_positioned) == 1:
         i = is_rightly_positioned.index(True)  # Belgium
-        # print("One belgium found", i)
-        to_right = aim_corners[(i + 1) % 4] == corners[(i + 3) % 4]
-        # print(f"{to_right=}")
-        moves = BELGIUM if not to_right else flip_left_right(BELGIUM)
-        return rotate_moves_about_y(moves, get_normal(side_faces[(i + to_right)%4]))
-    # print("Not belgium found")
-    return BELGIUM
+        to_right = _AIM_CORNERS[(i + 1) % 4] == corners[(i + 3) % 4]
+        return _BELGIUMS[i][to_right]
+    return _BELGIUM
 
 
 DOUBLE_CHAIR = flip_left_right(CHAIR) + CHAIR
@@ -383,92 +360,123 @@ FLIPPED_CHAIR = ["D", "R2", "D'", "R'", "D", "R'", "D'"]
 FLIPPED_DOUBLE_CHAIR = FLIPPED_CHAIR + flip_up_down(FLIPPED_CHAIR)
 
 
-def orient_yellow_corners(state_str):
-    normals = (Z, X, -Z, -X)
-    # Look for two consecutive misoriented corners
-    for i, n in enumerate(normals):
+def _compute_orient_yellow_corners_table():
+    """For each D corner: (D sticker, D sticker of the next corner, color of the side to its right,
+    moves for two consecutive misoriented corners, moving corners (down, up),
+    moves for two diagonal misoriented corners, moving corners (down, up))."""
+    table = []
+    for n in (Z, X, -Z, -X):
         m = np.cross(Y, n)  # Right
         pos = -Y + n + m
-        c_down = get_color_from_state_str(state_str, pos, -Y)
-        if c_down != "D":
-            # print(f"Corner wrongly oriented {i} - {c_down}")
-            if get_color_from_state_str(state_str, pos - 2*n, -Y) != "D":
-                # print("Next corner also misoriented")
-                if c_down == get_face_for_normal(m):
-                    # print("Moving corners down")
-                    return rotate_moves_about_y(FLIPPED_DOUBLE_CHAIR, n)
-                else:
-                    # print("Moving corners up")
-                    return rotate_moves_about_y(DOUBLE_CHAIR, n)
+        face = get_face_for_normal(m)
+        consecutive = (_rotated(FLIPPED_DOUBLE_CHAIR, n), _rotated(DOUBLE_CHAIR, n))
+        diagonal = tuple(_moves([neg_move(face)]) + _rotated(moves, m) + _moves([face])
+                         for moves in (FLIPPED_DOUBLE_CHAIR, DOUBLE_CHAIR))
+        table.append((_index(pos, -Y), _index(pos - 2 * n, -Y), face, consecutive, diagonal))
+    return table
+
+
+_ORIENT_YELLOW_CORNERS = _compute_orient_yellow_corners_table()
+
+
+def orient_yellow_corners(state_str):
+    # Look for two consecutive misoriented corners
+    for i_down, i_next, face, consecutive, _ in _ORIENT_YELLOW_CORNERS:
+        c_down = state_str[i_down]
+        if c_down != "D" and state_str[i_next] != "D":
+            return consecutive[c_down != face]
     # Else only two diagonal misoriented corners
-    for i, n in enumerate(normals):
-        m = np.cross(Y, n)  # Right
-        pos = -Y + n + m
-        c_down = get_color_from_state_str(state_str, pos, -Y)
+    for i_down, _, face, _, diagonal in _ORIENT_YELLOW_CORNERS:
+        c_down = state_str[i_down]
         if c_down != "D":
-            # print("Diagonal")
-            moves = FLIPPED_DOUBLE_CHAIR if c_down == get_face_for_normal(m) else DOUBLE_CHAIR
-            return [neg_move(get_face_for_normal(m))] + rotate_moves_about_y(moves, m) + [get_face_for_normal(m)]
+            return diagonal[c_down != face]
     raise ValueError("No misoriented corner: is cube done?")
 
 
-def concatenate_moves(moves):
-    mm_to_i = {"": 1, "2": 2, "'": 3}
-    i_to_mm = {v: k for k, v in mm_to_i.items()}
-    m = moves[0][0]
-    I = sum(mm_to_i[move[1:]] for move in moves) % 4
-    if I == 0:
-        return None
-    mm = i_to_mm[I]
-    return m + mm
-
-
-def optimise(moves):
-    res = []
-    N = len(moves)
-    i = 0
-    while i < N:
-        m = moves[i]
-        same_moves = [m]
-        i += 1
-        while i < N and moves[i][0] == m[0]:
-            same_moves.append(moves[i])
-            i += 1
-        r = concatenate_moves(same_moves)
-        if r is not None:
-            res.append(r)
-    print(f"Optimized: {len(moves)} -> {len(res)} (ratio saved {1 - len(res) / len(moves): .2%})")
-    return res
-
-
-def solve(state_str):
-    stages = {
-        "White cross": (is_white_cross_done, white_cross),
-        "White corners": (is_white_corners_done, white_corners),
-        "Second crown": (is_second_crown_done, second_crown),
-        "Yellow cross": (is_yellow_cross_done, yellow_cross),
-        "Orienting yellow cross": (is_yellow_cross_oriented, orient_yellow_cross),
-        "Yellow corners": (is_yellow_corners_positioned, yellow_corners),
-        "Orienting yellow corners": (is_yellow_corners_oriented, orient_yellow_corners)
-    }
-    c = RubiksCube()
-    c.load_state(state_str)
-    all_moves = []
-    for stage_name, (is_done, compute) in stages.items():
-        print(stage_name)
-        while not is_done(c.state_string):
-            moves = compute(c.state_string)
-            all_moves += moves
-            for m in moves:
-                c.move(m, lazy=True)
-            c._compute_state_string()
-
-    return optimise(all_moves)
+def optimise(moves, optimiser=None):
+    """Shortens moves with optimiser (a MoveOptimiser, which counts the moves saved), or a new one."""
+    return (optimiser or MoveOptimiser()).optimise(moves)
+
+
+STAGES = {
+    "White cross": (is_white_cross_done, white_cross),
+    "White corners": (is_white_corners_done, white_corners),
+    "Second crown": (is_second_crown_done, second_crown),
+    "Yellow cross": (is_yellow_cross_done, yellow_cross),
+    "Orienting yellow cross": (is_yellow_cross_oriented, orient_yellow_cross),
+    "Yellow corners": (is_yellow_corners_positioned, yellow_corners),
+    "Orienting yellow corners": (is_yellow_corners_oriented, orient_yellow_corners)
+}
+
+# Permutation of the state string for each algorithm the stages can return, as an itemgetter
+_PERMUTATIONS = {}
+
+
+def _apply(state_str, moves):
+    permutation = _PERMUTATIONS.get(moves)
+    if permutation is None:
+        permutation = itemgetter(*compose_moves(moves, cubie=False, cubes=False).facelets.tolist())
+        _PERMUTATIONS[moves] = permutation
+    return "".join(permutation(state_str))
+
+
+def solve_stages(state_str, metrics=None):
+    """Returns the moves of each stage (list of tuples of Moves, in STAGES order), without optimisation.
+    Runs of the stages are recorded in metrics (a SolverMetrics) if given."""
+    if metrics is not None:
+        return _solve_stages_measured(state_str, metrics)
+    stages_moves = []
+    for is_done, compute in STAGES.values():
+        moves = ()
+        while not is_done(state_str):
+            algorithm = compute(state_str)
+            moves += algorithm
+            state_str = _apply(state_str, algorithm)
+        stages_moves.append(moves)
+    return stages_moves
+
+
+def _solve_stages_measured(state_str, metrics):
+    """solve_stages recording in metrics: iterations are the algorithms applied, and model calls the state checks,
+    case lookups and permutations of the state, counted as they are made."""
+    stages_moves = []
+    for name, (is_done, compute) in STAGES.items():
+        with metrics.stage(name) as timer:
+            moves = ()
+            while True:
+                timer.model_calls += 1
+                if is_done(state_str):
+                    break
+                timer.model_calls += 1
+                algorithm = compute(state_str)
+                moves += algorithm
+                timer.model_calls += 1
+                state_str = _apply(state_str, algorithm)
+                timer.iterations += 1
+            timer.moves = len(moves)
+        stages_moves.append(moves)
+    return stages_moves
+
+
+def solve(state_str, optimiser=None, metrics=None):
+    moves = [m for stage_moves in solve_stages(state_str, metrics) for m in stage_moves]
+    with stage_timer(metrics, "Optimisation") as timer:
+        solution = optimise(moves, optimiser)
+        timer.iterations = 1
+        timer.moves = len(solution)
+    return solution
 
 
 class BasicSolver:
-    def __init__(self):
+    """Beginner method solver, states near solved are solved with the table of tables_dir (see near_solved_table).
+    Solves and stages are recorded in metrics (a SolverMetrics) if given."""
+    def __init__(self, tables_dir=None, metrics=None):
         self._solution = ""
+        self.optimiser = MoveOptimiser()  # optimiser.info() reports the moves saved
+        self.tables_dir = tables_dir
+        self.metrics = metrics
+        if metrics is not None and metrics.solver is None:
+            metrics.solver = type(self).__name__
 
     @property
     def solution_str(self):
@@ -484,12 +492,18 @@ class BasicSolver:
         return len(self._solution) == 0
 
     def compute_solution(self, state, prev_move=None, callback=None):
-        if state == RubiksCube.SOLVED_STR:
-            solution = []
-        elif prev_move is not None and len(self._solution) > 1 and self._solution[0] == prev_move:
-            solution = self._solution[1:]
-        else:
-            solution = solve(state)
+        with solve_timer(self.metrics) as timer:
+            if state == RubiksCube.SOLVED_STR:
+                solution = []
+            elif prev_move is not None and len(self._solution) > 1 and self._solution[0] == prev_move:
+                solution = self._solution[1:]
+            else:
+                with stage_timer(self.metrics, "Near solved table") as lookup:
+                    solution = solve_near_solved(state, self.tables_dir)
+                    lookup.moves = 0 if solution is None else len(solution)
+                if solution is None:
+                    solution = solve(state, self.optimiser, self.metrics)
+            timer.moves = len(solution)
         self._solution = solution
         if callback is not None:
             callback(solution)
@@ -0,0 +1,146 @@
+"""Solver agnostic cache of solutions.
+
+States are keyed by rubiks_cube.encoding.canonical_key: the 24 rotations of a state (with colors relabelled)
+share one entry, stored for the rotation with the smallest key. Solutions are stored as move indexes for that
+canonical state, and remapped with the moves of the rotation (ROTATION_MOVES) on the way in and out.
+When a solution is computed, the states along it are stored too, with the rest of the solution: following a
+solution move by move only hits the cache.
+"""
+import sqlite3
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from rubiks_cube.constants import FACE_MOVES
+from rubiks_cube.cubic_mathematics import INV_TABLE
+from rubiks_cube.cubie import CubieCube
+from rubiks_cube.encoding import canonical_key, key_to_bytes
+from rubiks_cube.facelets import ROTATION_MOVES, move_facelets, state_str_to_facelets
+from rubiks_cube.moves import Move
+from rubiks_cube.rubikscube import RubiksCube
+
+MOVES = [Move(m) for m in FACE_MOVES]
+CacheInfo = namedtuple("CacheInfo", ["hits", "disk_hits", "misses", "size", "maxsize"])
+
+
+class SqliteStore:
+    """On-disk store of solutions, one table row per (namespace, key). Can be shared by several threads."""
+    def __init__(self, path):
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        self._connection.execute("CREATE TABLE IF NOT EXISTS solutions "
+                                 "(namespace TEXT, key BLOB, moves BLOB, PRIMARY KEY (namespace, key))")
+        self._connection.commit()
+        self._lock = threading.Lock()
+
+    def get(self, namespace, key):
+        with self._lock:
+            row = self._connection.execute("SELECT moves FROM solutions WHERE namespace = ? AND key = ?",
+                                           (namespace, key)).fetchone()
+        return None if row is None else row[0]
+
+    def put(self, namespace, entries):
+        """Store the (key, moves) entries in a single transaction."""
+        with self._lock:
+            self._connection.executemany("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?)",
+                                         [(namespace, key, moves) for key, moves in entries])
+            self._connection.commit()
+
+    def close(self):
+        self._connection.close()
+
+
+class CachedSolver:
+    """Wraps a solver (KociembaSolver, BasicSolver...) with the same interface, caching its solutions in a bounded
+    in-memory LRU, and optionally in a sqlite file shared between runs (entries are namespaced by solver class).
+    prev_move is accepted for compatibility with BasicSolver and not needed: after a move of the last solution, the
+    new state is a cache hit (see _solution_entries)."""
+    def __init__(self, solver, maxsize=1024, path=None):
+        self.solver = solver
+        self.maxsize = maxsize
+        self._memory = OrderedDict()  # key bytes -> move indexes bytes, for the canonical state
+        self._store = SqliteStore(path) if path is not None else None
+        self._namespace = type(solver).__name__
+        self._lock = threading.Lock()
+        self._solution = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @property
+    def solution_str(self):
+        return " ".join(self._solution)
+
+    def get_next_move(self, i=0):
+        return self._solution[i] if not self.is_solved() else None
+
+    def get_all_moves(self):
+        return self._solution if not self.is_solved() else []
+
+    def is_solved(self):
+        return len(self._solution) == 0
+
+    def cache_info(self):
+        return CacheInfo(self.hits, self.disk_hits, self.misses, len(self._memory), self.maxsize)
+
+    def compute_solution(self, state, prev_move=None, callback=None):
+        if state == RubiksCube.SOLVED_STR:
+            self._solution = []
+        else:
+            # Keys do not encode the last twist, the last flip and the parity: invalid states have to be rejected
+            CubieCube.from_state_str(state, check=True)
+            facelets = state_str_to_facelets(state)
+            key, rotation = canonical_key(facelets)
+            key = key_to_bytes(key)
+            moves = self._get(key)
+            if moves is None:
+                self.solver.compute_solution(state)
+                entries = _solution_entries(facelets, [Move(m).index for m in self.solver.get_all_moves()])
+                self._put(entries)
+                moves = entries[-1][1]
+            inverse_moves = ROTATION_MOVES[INV_TABLE[rotation]]
+            self._solution = [MOVES[i] for i in inverse_moves[np.frombuffer(moves, dtype=np.uint8)].tolist()]
+        if callback is not None:
+            callback(self._solution)
+
+    def _get(self, key):
+        with self._lock:
+            moves = self._memory.get(key)
+            if moves is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return moves
+        moves = None if self._store is None else self._store.get(self._namespace, key)
+        with self._lock:
+            if moves is None:
+                self.misses += 1
+            else:
+                self.disk_hits += 1
+                self._remember(key, moves)
+        return moves
+
+    def _put(self, entries):
+        with self._lock:
+            for key, moves in entries:
+                self._remember(key, moves)
+        if self._store is not None:
+            self._store.put(self._namespace, entries)
+
+    def _remember(self, key, moves):
+        self._memory[key] = moves
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+
+def _solution_entries(facelets, indices):
+    """(key, moves) cache entries of the states along the solution (move indexes) of facelets, from the last one
+    to facelets itself."""
+    states = [facelets]
+    for i in indices[:-1]:
+        states.append(move_facelets(states[-1], i))
+    entries = []
+    for k in reversed(range(len(states))):
+        key, rotation = canonical_key(states[k])
+        entries.append((key_to_bytes(key), ROTATION_MOVES[rotation][indices[k:]].astype(np.uint8).tobytes()))
+    return entries
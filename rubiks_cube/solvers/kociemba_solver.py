@@ -1,10 +1,28 @@
+import time
+
 import kociemba
 
+from rubiks_cube.cubie import CubieCube
 from rubiks_cube.rubikscube import RubiksCube
+from rubiks_cube.solvers.metrics import stage_timer, solve_timer
+from rubiks_cube.solvers.near_solved_table import solve_near_solved
+from rubiks_cube.solvers.two_phase_solver import TwoPhaseSearch
 
 
 class KociembaSolver:
-    def __init__(self):
+    """Solves with the kociemba library.
+
+    With max_length and/or timeout (in seconds), solving is anytime: the solution is improved until one of at most
+    max_length moves is found or the time is up, and the shortest one found is kept (see iter_solutions).
+    Solves and stages are recorded in metrics (a SolverMetrics) if given."""
+    def __init__(self, max_length=None, timeout=None, tables_dir=None, metrics=None):
+        self.max_length = max_length
+        self.timeout = timeout
+        self.tables_dir = tables_dir
+        self.metrics = metrics
+        if metrics is not None and metrics.solver is None:
+            metrics.solver = type(self).__name__
+        self._search = None  # Loaded on first anytime solve
         self._solution = None
 
     @property
@@ -21,10 +39,59 @@ class KociembaSolver:
         return len(self._solution) == 0
 
     def compute_solution(self, state, callback=None):
-        if state == RubiksCube.SOLVED_STR:
-            self._solution = []
-        else:
-            solution = kociemba.solve(state).split(" ")
-            self._solution = solution
+        with solve_timer(self.metrics) as timer:
+            if self.max_length is not None or self.timeout is not None:
+                for solution in self.iter_solutions(state, self.timeout, self.max_length):
+                    self._solution = solution
+            elif state == RubiksCube.SOLVED_STR:
+                self._solution = []
+            elif (solution := self._solve_near_solved(state)) is not None:
+                self._solution = solution
+            else:
+                self._solution = self._solve_kociemba(state)
+            timer.moves = len(self._solution)
         if callback is not None:
             callback(self._solution)
+
+    def iter_solutions(self, state, timeout=None, max_length=None):
+        """Yields solutions of decreasing lengths: first the one of the kociemba library, then shorter ones found
+        by the native two-phase search, until one of at most max_length moves is found or timeout is elapsed.
+        States of the near solved table (see near_solved_table) get their optimal solution at once.
+        The first solution is always yielded, even if late or too long. Without bounds, the search goes on
+        until the solution is optimal, which may be very long: the caller can stop iterating at any time.
+        The kociemba library cannot be interrupted once called, hence the native search for the improvements."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        solution = [] if state == RubiksCube.SOLVED_STR else self._solve_near_solved(state)
+        if solution is not None:  # Already optimal
+            yield solution
+            return
+        best = self._solve_kociemba(state)
+        yield best
+        if max_length is not None and len(best) <= max_length:
+            return
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0:
+            return
+        if self._search is None:
+            self._search = TwoPhaseSearch(self.tables_dir)
+        cubie = CubieCube.from_state_str(state, check=True)
+        # Includes the time the caller spends between two solutions
+        with stage_timer(self.metrics, "Two-phase search") as timer:
+            for solution in self._search.solutions(cubie, len(best) - 1, remaining):
+                timer.iterations += 1
+                timer.moves = len(solution)
+                yield solution
+                if max_length is not None and len(solution) <= max_length:
+                    return
+
+    def _solve_near_solved(self, state):
+        with stage_timer(self.metrics, "Near solved table") as timer:
+            solution = solve_near_solved(state, self.tables_dir)
+            timer.moves = 0 if solution is None else len(solution)
+        return solution
+
+    def _solve_kociemba(self, state):
+        with stage_timer(self.metrics, "Kociemba") as timer:
+            solution = kociemba.solve(state).split(" ")
+            timer.moves = len(solution)
+        return solution
@@ -0,0 +1,176 @@
+"""Instrumentation of solvers: wall time, iterations, moves emitted and cube model calls of each stage.
+
+Solvers given a SolverMetrics (BasicSolver, KociembaSolver) record each solve and each stage run into it.
+Without one (the default), they time nothing: each stage only enters NULL_TIMER, a no-op context manager.
+Metrics can be exported as JSON or in the Prometheus text format, and on_stage is called after each stage run,
+e.g. to log the slow ones.
+Model calls are the calls to the state string model of BasicSolver stages, counted as they are made: stages which
+do not use it (table lookups, the kociemba library) report none.
+"""
+import json
+import time
+from threading import Lock
+
+
+class StageTimer:
+    """Context manager measuring one run of a stage (or of a whole solve, then name is None).
+    iterations, moves and model_calls are set by the solver while it runs."""
+    __slots__ = ("name", "iterations", "moves", "model_calls", "seconds", "failed", "_record", "_start")
+
+    def __init__(self, record, name):
+        self.name = name
+        self.iterations = 0
+        self.moves = 0
+        self.model_calls = 0
+        self.seconds = 0.0
+        self.failed = False
+        self._record = record
+
+    def __repr__(self):
+        return (f"<StageTimer {self.name}: {self.seconds * 1000:.3f}ms, {self.iterations} iterations, "
+                f"{self.moves} moves, {self.model_calls} model calls{', failed' if self.failed else ''}>")
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.seconds = time.perf_counter() - self._start
+        # A generator closed between two solutions did not fail
+        self.failed = exc_type is not None and not issubclass(exc_type, GeneratorExit)
+        self._record(self)
+        return False
+
+
+class _NullTimer:
+    """Stands for a StageTimer when metrics are disabled: attributes set on it are ignored, and read as 0
+    (so that counters can be incremented)."""
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        return 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+NULL_TIMER = _NullTimer()
+
+
+def stage_timer(metrics, name):
+    """Timer of a run of stage name, or NULL_TIMER if metrics is None."""
+    return NULL_TIMER if metrics is None else metrics.stage(name)
+
+
+def solve_timer(metrics):
+    """Timer of a whole solve, or NULL_TIMER if metrics is None."""
+    return NULL_TIMER if metrics is None else metrics.solve()
+
+
+class StageStats:
+    """Totals of the runs of a stage."""
+    FIELDS = ["runs", "failures", "seconds", "max_seconds", "iterations", "moves", "model_calls"]
+
+    def __init__(self):
+        self.runs = 0
+        self.failures = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.iterations = 0
+        self.moves = 0
+        self.model_calls = 0
+
+    def add(self, run: StageTimer):
+        self.runs += 1
+        self.failures += run.failed
+        self.seconds += run.seconds
+        self.max_seconds = max(self.max_seconds, run.seconds)
+        self.iterations += run.iterations
+        self.moves += run.moves
+        self.model_calls += run.model_calls
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+
+# (name, type, help) of the exported metrics, for the whole solves then for each stage
+_SOLVE_METRICS = [("runs", "counter", "Number of solves"),
+                  ("failures", "counter", "Number of solves which raised an exception"),
+                  ("seconds", "counter", "Total wall time of the solves"),
+                  ("max_seconds", "gauge", "Longest solve"),
+                  ("moves", "counter", "Total number of moves of the solutions")]
+_STAGE_METRICS = [("runs", "counter", "Number of runs of the stage"),
+                  ("failures", "counter", "Number of runs of the stage which raised an exception"),
+                  ("seconds", "counter", "Total wall time of the stage"),
+                  ("max_seconds", "gauge", "Longest run of the stage"),
+                  ("iterations", "counter", "Total number of iterations of the stage"),
+                  ("moves", "counter", "Total number of moves emitted by the stage"),
+                  ("model_calls", "counter", "Total number of calls to the cube model by the stage")]
+
+
+def _escape(label):
+    return label.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class SolverMetrics:
+    """Metrics of the solves of a solver, by stage. Can be shared by solvers running in several threads.
+    solver labels the exported metrics, it defaults to the class name of the first solver using it."""
+    def __init__(self, solver=None, on_stage=None):
+        self.solver = solver
+        self.on_stage = on_stage
+        self._lock = Lock()
+        self.solves = StageStats()
+        self.stages = {}  # stage name -> StageStats, in the order stages first ran
+
+    def stage(self, name):
+        return StageTimer(self._record_stage, name)
+
+    def solve(self):
+        return StageTimer(self._record_solve, None)
+
+    def _record_stage(self, run):
+        with self._lock:
+            if run.name not in self.stages:
+                self.stages[run.name] = StageStats()
+            self.stages[run.name].add(run)
+        if self.on_stage is not None:
+            self.on_stage(run)
+
+    def _record_solve(self, run):
+        with self._lock:
+            self.solves.add(run)
+
+    def reset(self):
+        with self._lock:
+            self.solves = StageStats()
+            self.stages = {}
+
+    def to_dict(self):
+        with self._lock:
+            return {"solver": self.solver, "solves": self.solves.to_dict(),
+                    "stages": {name: stats.to_dict() for name, stats in self.stages.items()}}
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_prometheus(self, prefix="rubiks_cube_solver"):
+        """Metrics in the Prometheus text exposition format."""
+        metrics = self.to_dict()
+        solver = _escape(str(metrics["solver"]))
+        lines = []
+        for field, kind, description in _SOLVE_METRICS:
+            name = f"{prefix}_solve_{field}" + ("_total" if kind == "counter" else "")
+            lines += [f"# HELP {name} {description}.", f"# TYPE {name} {kind}",
+                      f'{name}{{solver="{solver}"}} {metrics["solves"][field]}']
+        for field, kind, description in _STAGE_METRICS:
+            name = f"{prefix}_stage_{field}" + ("_total" if kind == "counter" else "")
+            lines += [f"# HELP {name} {description}.", f"# TYPE {name} {kind}"]
+            lines += [f'{name}{{solver="{solver}",stage="{_escape(stage)}"}} {stats[field]}'
+                      for stage, stats in metrics["stages"].items()]
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,177 @@
+"""Table of all the states within a few moves of solved, with an optimal first move for each of them, so that
+solvers return an optimal solution for such states without searching.
+
+The table is built by a breadth first search from the solved state, and keys are the ones of
+rubiks_cube.encoding, split as key = hi << 64 | lo (see encode_cubie_arrays). It is saved in the tables
+directory (see two_phase_tables.TABLES_DIR) as three arrays, memory mapped when loaded:
+ - near_solved_keys: lo of all keys, sorted by (hi, lo)
+ - near_solved_offsets: keys with hi = h are near_solved_keys[offsets[h]:offsets[h + 1]]
+ - near_solved_moves: index in FACE_MOVES of an optimal first move for each key (NO_MOVE for solved)
+A lookup is a binary search in one bucket. Numbers of states at depth 0, 1, 2... are 1, 18, 243, 3240, 43239,
+574908, 7618438, 100803036: depth 6 gives 8.2M states (74MB), depth 7 109M states (1GB, and much more memory
+while building).
+
+Unlike the other tables, it is not generated on first use; generate it with
+    python -m rubiks_cube.solvers.near_solved_table --depth 6
+"""
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from rubiks_cube.constants import FACE_MOVES
+from rubiks_cube.cubie import CORNER_PERM_MOVES, CORNER_ORI_MOVES, EDGE_PERM_MOVES, EDGE_ORI_MOVES, \
+    N_CORNERS, N_EDGES, SOLVED_CP, SOLVED_EP, CubieCube
+from rubiks_cube.encoding import NUM_STATES, encode, encode_cubie_arrays
+from rubiks_cube.moves import Move
+from rubiks_cube.solvers.two_phase_tables import TABLES_DIR, save_table
+
+MOVES = [Move(m) for m in FACE_MOVES]
+NO_MOVE = 255
+DEFAULT_DEPTH = 6
+_LOADED_TABLES = {}  # tables_dir -> NearSolvedTable, only for tables found (they may be generated later)
+N_BUCKETS = ((NUM_STATES - 1) >> 64) + 1
+TABLE_NAMES = ["near_solved_keys", "near_solved_offsets", "near_solved_moves"]
+_LOW_64 = (1 << 64) - 1
+
+
+def _expand(frontier):
+    """Neighbours of the states of frontier, a (cp, co, ep, eo, first_moves) tuple of arrays, in the same format.
+    Moves on the face of the previous move are skipped, they cannot lead to new states."""
+    cp, co, ep, eo, first_moves = frontier
+    faces = first_moves // 3
+    neighbours = []
+    for m, move in enumerate(MOVES):
+        keep = faces != m // 3
+        p = CORNER_PERM_MOVES[m]
+        new_co = (co[keep][:, p] + CORNER_ORI_MOVES[m]) % 3
+        new_cp = cp[keep][:, p]
+        p = EDGE_PERM_MOVES[m]
+        new_eo = (eo[keep][:, p] + EDGE_ORI_MOVES[m]) % 2
+        new_ep = ep[keep][:, p]
+        new_first_moves = np.full(len(new_cp), move.inverse.index, dtype=np.uint8)
+        neighbours.append((new_cp, new_co, new_ep, new_eo, new_first_moves))
+    return tuple(np.concatenate(arrays) for arrays in zip(*neighbours))
+
+
+def _split(frontier, chunk_size):
+    return [tuple(a[i:i + chunk_size] for a in frontier) for i in range(0, len(frontier[0]), chunk_size)]
+
+
+def _new_states(hi, lo, visited):
+    """Mask of the first occurrence of each key which is not in visited (a list of sorted lo arrays per hi)."""
+    order = np.lexsort((lo, hi))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = (hi[order][1:] != hi[order][:-1]) | (lo[order][1:] != lo[order][:-1])
+    mask = np.zeros(len(order), dtype=bool)
+    mask[order[first]] = True
+    for h in range(N_BUCKETS):
+        in_bucket = mask & (hi == h)
+        mask[in_bucket] = ~np.isin(lo[in_bucket], visited[h], assume_unique=True)
+    return mask
+
+
+def compute_table(depth=DEFAULT_DEPTH, workers=None, chunk_size=1 << 16, verbose=False):
+    """Breadth first search of all the states within depth moves of solved, expanding each level in workers
+    processes (os.cpu_count() by default). Returns the dict of arrays of TABLE_NAMES."""
+    frontier = (SOLVED_CP[None], np.zeros((1, N_CORNERS), dtype=np.int8),
+                SOLVED_EP[None], np.zeros((1, N_EDGES), dtype=np.int8), np.array([NO_MOVE], dtype=np.uint8))
+    hi, lo = encode_cubie_arrays(*frontier[:4])
+    levels = [(hi, lo, frontier[4])]
+    visited = [np.sort(lo[hi == h]) for h in range(N_BUCKETS)]
+    with ProcessPoolExecutor(workers) as executor:
+        for d in range(1, depth + 1):
+            start = time.perf_counter()
+            chunks = list(executor.map(_expand, _split(frontier, chunk_size)))
+            neighbours = tuple(np.concatenate(arrays) for arrays in zip(*chunks))
+            hi, lo = encode_cubie_arrays(*neighbours[:4])
+            mask = _new_states(hi, lo, visited)
+            frontier = tuple(a[mask] for a in neighbours)
+            hi, lo = hi[mask], lo[mask]
+            levels.append((hi, lo, frontier[4]))
+            visited = [np.sort(np.concatenate([visited[h], lo[hi == h]])) for h in range(N_BUCKETS)]
+            if verbose:
+                print(f"Depth {d}: {len(lo)} states ({time.perf_counter() - start:.1f}s)")
+    hi, lo, first_moves = (np.concatenate(arrays) for arrays in zip(*levels))
+    order = np.lexsort((lo, hi))
+    offsets = np.searchsorted(hi[order], np.arange(N_BUCKETS + 1))
+    return {"near_solved_keys": lo[order], "near_solved_offsets": offsets.astype(np.int64),
+            "near_solved_moves": first_moves[order]}
+
+
+def generate_table(tables_dir=None, depth=DEFAULT_DEPTH, workers=None, verbose=False):
+    tables_dir = Path(tables_dir or TABLES_DIR)
+    for name, table in compute_table(depth, workers, verbose=verbose).items():
+        save_table(tables_dir / f"{name}.npy", table)
+    _LOADED_TABLES.pop(tables_dir, None)
+
+
+class NearSolvedTable:
+    """Lookups in the arrays of TABLE_NAMES."""
+    def __init__(self, tables):
+        self.keys = tables["near_solved_keys"]
+        self.offsets = tables["near_solved_offsets"].tolist()
+        self.moves = tables["near_solved_moves"]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def first_move(self, key):
+        """Index in FACE_MOVES of an optimal first move for the state of given key, NO_MOVE if solved,
+        or None if the state is not in the table."""
+        start, end = self.offsets[key >> 64], self.offsets[(key >> 64) + 1]
+        lo = np.uint64(key & _LOW_64)
+        i = start + int(np.searchsorted(self.keys[start:end], lo))
+        if i < end and self.keys[i] == lo:
+            return int(self.moves[i])
+        return None
+
+    def solve(self, cubie: CubieCube):
+        """Returns an optimal solution (list of Moves) if the state is in the table, else None."""
+        cubie = cubie.copy()
+        solution = []
+        while (m := self.first_move(encode(cubie))) != NO_MOVE:
+            if m is None:
+                return None
+            solution.append(MOVES[m])
+            cubie.move(m)
+        return solution
+
+
+def load_table(tables_dir=None):
+    """Memory maps the table, returns a NearSolvedTable or None if the table was not generated (yet: a table
+    generated later, even by another process, is then loaded)."""
+    tables_dir = Path(tables_dir or TABLES_DIR)
+    table = _LOADED_TABLES.get(tables_dir)
+    if table is None:
+        if not all((tables_dir / f"{name}.npy").exists() for name in TABLE_NAMES):
+            return None
+        table = NearSolvedTable({name: np.load(tables_dir / f"{name}.npy", mmap_mode="r") for name in TABLE_NAMES})
+        _LOADED_TABLES[tables_dir] = table
+    return table
+
+
+def solve_near_solved(state_str, tables_dir=None):
+    """Optimal solution (list of Moves) of state_str if it is in the table, else None (also if no table)."""
+    table = load_table(tables_dir)
+    if table is None:
+        return None
+    return table.solve(CubieCube.from_state_str(state_str, check=True))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate the table of the states near solved.")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH, help="Maximum number of moves from solved")
+    parser.add_argument("--workers", type=int, default=None, help="Number of processes (default: all CPUs)")
+    parser.add_argument("--tables-dir", default=None, help=f"Output directory (default: {TABLES_DIR})")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    generate_table(args.tables_dir, args.depth, args.workers, verbose=True)
+    elapsed = time.perf_counter() - start
+    tables_dir = Path(args.tables_dir or TABLES_DIR)
+    size = sum((tables_dir / f"{name}.npy").stat().st_size for name in TABLE_NAMES)
+    print(f"{len(load_table(args.tables_dir))} states within {args.depth} moves, {size / 2 ** 20:.1f}MB "
+          f"in {tables_dir}, built in {elapsed:.1f}s")
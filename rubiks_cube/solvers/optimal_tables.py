@@ -0,0 +1,290 @@
+"""Move tables and pattern databases of the optimal solver (see optimal_solver).
+
+A pattern database gives, for every state of a subset of the pieces, the exact number of moves needed to solve
+those pieces only: this is a lower bound of the distance of the whole cube to solved.
+Conjugating a state by a symmetry (see rubiks_cube.symmetries) does not change its distance, so databases have one
+entry per class of symmetric states. Each class is represented by the conjugate with the smallest coordinate, and a
+class table gives, for each coordinate, its class and the symmetry sending it to the representative:
+ - corners: the 8! corner permutations are reduced by the 16 symmetries keeping the UD axis, to N_CORNER_CLASSES
+   classes. The twist of the representative is then read in the twist_conj table (those symmetries only move
+   twists along with the corners), hence 2768 * 3^7 = 6,053,616 entries instead of 8! * 3^7 = 88,179,840.
+ - edges: n_edges edges of EDGE_GROUP (6 by default), reduced by the symmetries keeping this group. The first 6 edges
+   go around the cube like a belt, they are kept by 12 symmetries: 3,564,800 entries instead of 12! / 6! * 2^6 =
+   42,577,920. Symmetries also permute the orientation bits of the group, and flip some of them depending on the
+   positions of the edges: the class table holds those flips, and edge{n}_flip_conj the permutations.
+A representative kept by some symmetries has several entries for the same class of states, all get the distance.
+Distances are at most 15, so entries are packed 4 bits each: 3 MB for corners, 1.8 MB for 6 edges.
+
+Tables are computed once with numpy (a few seconds), saved next to the two-phase tables and memory mapped in the
+same way (see two_phase_tables).
+"""
+from functools import lru_cache
+from itertools import permutations
+from math import perm
+from pathlib import Path
+
+import numpy as np
+
+from rubiks_cube.cubie import CORNER_PERM_MOVES, CORNER_ORI_MOVES, EDGE_PERM_MOVES, EDGE_ORI_MOVES, N_EDGES
+from rubiks_cube.encoding import oris_to_coords, perms_to_coords
+from rubiks_cube.solvers import two_phase_tables
+from rubiks_cube.solvers.two_phase_tables import (
+    TABLES_DIR, N_MOVES, N_TWIST, N_CORNERS, compute_ori_moves, compute_perm_moves, save_table, get_corners,
+    get_twist, _all_oris)
+from rubiks_cube.symmetries import (
+    N_SYMMETRIES, UD_SYMMETRIES, IS_MIRROR, CORNER_SYMMETRIES, EDGE_SYMMETRIES, conjugate_cubie_arrays)
+
+# UR, UF, DL, DB, FR, BL: the edges crossed by the plane through the center orthogonal to the UFL-DBR diagonal
+EDGE_GROUP = [0, 1, 6, 7, 8, 10, 4]
+MAX_EDGES = len(EDGE_GROUP)
+N_UD_SYMMETRIES = len(UD_SYMMETRIES)
+N_CORNER_CLASSES = 2768
+SYMMETRY_BITS = 6  # Bits of the index of a symmetry in edge class tables (there are at most N_SYMMETRIES)
+
+
+def n_edge_positions(n_edges):
+    return perm(N_EDGES, n_edges)
+
+
+def positions_to_coords(positions, n=N_EDGES):
+    """Rank of (N, k) arrays of k distinct positions among n, in lexicographic order."""
+    positions = np.asarray(positions)
+    k = positions.shape[1]
+    coords = np.zeros(len(positions), dtype=np.int64)
+    for i in range(k):
+        smaller_before = (positions[:, :i] < positions[:, i:i + 1]).sum(axis=1)
+        coords += (positions[:, i] - smaller_before) * perm(n - 1 - i, k - 1 - i)
+    return coords
+
+
+def get_corner_state(cubie):
+    """(permutation, twist) coordinates of the corners."""
+    return get_corners(cubie), get_twist(cubie)
+
+
+def get_edge_state(cubie, n_edges):
+    """(positions coordinate, orientation bits) of the edges of the group, with edge EDGE_GROUP[j] on bit j."""
+    ep, eo = cubie.ep.tolist(), cubie.eo.tolist()
+    positions = [ep.index(e) for e in EDGE_GROUP[:n_edges]]
+    ori = sum(eo[p] << j for j, p in enumerate(positions))
+    return positions_to_coords(np.array([positions]))[0].item(), ori
+
+
+def edge_symmetries(n_edges):
+    """Symmetries keeping the edges of the group among themselves."""
+    group = set(EDGE_GROUP[:n_edges])
+    return [s for s in range(N_SYMMETRIES) if set(EDGE_SYMMETRIES[s, EDGE_GROUP[:n_edges]].tolist()) == group]
+
+
+def corner_index(corner_classes, twist_conj, cp, co):
+    """Index in the corners pattern database of the (permutation, twist) coordinates (ints or arrays)."""
+    entry = corner_classes[cp]
+    return (entry >> 4) * N_TWIST + twist_conj[co * N_UD_SYMMETRIES + (entry & 15)]
+
+
+def edge_index(edge_classes, flip_conj, n_edges, position, ori):
+    """Index in the edges pattern database of the (positions, orientation bits) coordinates (ints or arrays)."""
+    entry = edge_classes[position]
+    symmetry = entry >> n_edges & ((1 << SYMMETRY_BITS) - 1)
+    return (entry >> (n_edges + SYMMETRY_BITS) << n_edges) | (flip_conj[(symmetry << n_edges) | ori]
+                                                              ^ (entry & ((1 << n_edges) - 1)))
+
+
+def _compute_edge_moves(n_edges):
+    """Returns the (positions coordinate, move) -> positions coordinate table, and the table of orientation bits
+    flipped by each move."""
+    positions = np.array(list(permutations(range(N_EDGES), n_edges)))
+    destinations = np.argsort(EDGE_PERM_MOVES, axis=1)  # Where the piece at each position is sent
+    position_moves = np.zeros((len(positions), N_MOVES), dtype=np.uint32)
+    flip_moves = np.zeros((len(positions), N_MOVES), dtype=np.uint8)
+    for m in range(N_MOVES):
+        new_positions = destinations[m][positions]
+        position_moves[:, m] = positions_to_coords(new_positions)
+        flip_moves[:, m] = (EDGE_ORI_MOVES[m][new_positions] << np.arange(n_edges)).sum(axis=1)
+    return position_moves, flip_moves
+
+
+def _compute_classes(conjugates):
+    """From the (n_symmetries, n_coords) array of the conjugates of all coordinates (by the identity first),
+    returns the representatives (smallest conjugates) of the classes, the class and the index of the symmetry
+    sending each coordinate to its representative, and the (class, symmetry index) pairs of the other symmetries
+    keeping a representative unchanged."""
+    symmetries = conjugates.argmin(axis=0)
+    smallest = conjugates[symmetries, np.arange(conjugates.shape[1])]
+    representatives = np.unique(smallest)
+    indices, classes = np.nonzero(conjugates[1:, representatives] == representatives)
+    return representatives, np.searchsorted(representatives, smallest), symmetries, (classes, indices + 1)
+
+
+def _equivalent_entries(classes, entry_conj, n_entries):
+    """(a, b) arrays of indices of database entries standing for symmetric states, where entry_conj is the
+    (len(classes), n_entries) array of the conjugates of the n_entries of each class.
+    A representative kept by a symmetry has several entries per class of states: they are equal."""
+    a = (classes[:, None] * n_entries + np.arange(n_entries)).ravel()
+    b = (classes[:, None] * n_entries + entry_conj).ravel()
+    keep = a != b
+    return a[keep], b[keep]
+
+
+def compute_corner_classes():
+    """Returns the representatives of the classes of corner permutations, the class table (class << 4 | index of
+    the symmetry in UD_SYMMETRIES), the twist_conj table (twist * N_UD_SYMMETRIES + symmetry index ->
+    twist of the conjugate), and the equivalent entries of the database (see _equivalent_entries)."""
+    perms = np.array(list(permutations(range(8))))
+    conjugates = []
+    for s in UD_SYMMETRIES:
+        # The corner at position i is sent to position p[i], and becomes corner p[corner]
+        p = CORNER_SYMMETRIES[s]
+        conjugates.append(perms_to_coords(p[perms][:, np.argsort(p)]))
+    representatives, classes, symmetries, (symmetric, kept_by) = _compute_classes(np.array(conjugates))
+    assert len(representatives) == N_CORNER_CLASSES
+    oris = _all_oris(N_TWIST, 8, 3)
+    twist_conj = np.zeros((N_TWIST, N_UD_SYMMETRIES), dtype=np.uint16)
+    for i, s in enumerate(UD_SYMMETRIES):
+        new_oris = np.empty_like(oris)
+        new_oris[:, CORNER_SYMMETRIES[s]] = -oris % 3 if IS_MIRROR[s] else oris
+        twist_conj[:, i] = oris_to_coords(new_oris, 3)
+    equivalents = _equivalent_entries(symmetric, twist_conj[:, kept_by].T.astype(np.int64), N_TWIST)
+    return representatives, (classes << 4 | symmetries).astype(np.uint16), twist_conj.ravel(), equivalents
+
+
+def _compute_flip_changes(symmetry):
+    """(edge, position) -> orientation flip of edge at position when conjugating by symmetry."""
+    edges, positions = np.divmod(np.arange(N_EDGES * N_EDGES), N_EDGES)
+    ep = np.zeros((len(edges), N_EDGES), dtype=np.int64)
+    ep[np.arange(len(edges)), positions] = edges  # Other positions do not matter
+    no_twist = np.zeros((len(edges), 8), dtype=np.int64)
+    cp = np.broadcast_to(np.arange(8), no_twist.shape)
+    _, _, _, eo = conjugate_cubie_arrays(cp, no_twist, ep, np.zeros_like(ep), symmetry)
+    return eo[np.arange(len(edges)), EDGE_SYMMETRIES[symmetry, positions]].reshape(N_EDGES, N_EDGES)
+
+
+def compute_edge_classes(n_edges):
+    """Returns the representatives of the classes of positions of the group, the class table
+    (class << (n_edges + SYMMETRY_BITS) | symmetry index << n_edges | orientation bits flipped by the symmetry),
+    the flip_conj table (symmetry index << n_edges | orientation bits -> permuted bits), and the equivalent entries
+    of the database (see _equivalent_entries)."""
+    group = EDGE_GROUP[:n_edges]
+    positions = np.array(list(permutations(range(N_EDGES), n_edges)))
+    symmetries = edge_symmetries(n_edges)
+    conjugates, flips, flip_conj = [], [], []
+    bits = np.arange(1 << n_edges)[:, None] >> np.arange(n_edges) & 1
+    for s in symmetries:
+        p = EDGE_SYMMETRIES[s]
+        target = [group.index(e) for e in p[group].tolist()]  # Edge j of the group becomes edge target[j]
+        new_positions = np.empty_like(positions)
+        new_positions[:, target] = p[positions]
+        conjugates.append(positions_to_coords(new_positions))
+        flips.append((_compute_flip_changes(s)[group, positions] << np.array(target)).sum(axis=1))
+        flip_conj.append((bits << np.array(target)).sum(axis=1))
+    representatives, classes, indices, (symmetric, kept_by) = _compute_classes(np.array(conjugates))
+    flips, flip_conj = np.array(flips), np.array(flip_conj)
+    equivalents = _equivalent_entries(symmetric, flip_conj[kept_by] ^ flips[kept_by, representatives[symmetric], None],
+                                      1 << n_edges)
+    flips = flips[indices, np.arange(len(positions))]
+    dtype = np.uint32 if len(representatives) << (n_edges + SYMMETRY_BITS) <= 1 << 32 else np.uint64
+    table = (classes << (n_edges + SYMMETRY_BITS) | indices << n_edges | flips).astype(dtype)
+    return representatives, table, flip_conj.astype(np.uint8).ravel(), equivalents
+
+
+def _compute_pattern_database(n_states, solved, neighbours, equivalents, chunk_size=1 << 20):
+    """Breadth first search from solved, where neighbours(states) returns the (len(states), N_MOVES) array of
+    neighbour states, and equivalents are the (a, b) arrays of states at the same distance. Returns the uint8 array
+    of distances.
+    When there are more states in the frontier than unvisited ones, each level is rather computed backwards
+    (as moves are closed under inversion, also between classes): unvisited states with a neighbour in the frontier
+    are the next level."""
+    table = np.full(n_states, 255, dtype=np.uint8)
+    table[solved] = 0
+    n_unvisited = n_states - 1
+    frontier_size = 1
+    depth = 0
+    while n_unvisited:
+        if frontier_size <= n_unvisited:
+            states = np.flatnonzero(table == depth)
+            for start in range(0, len(states), chunk_size):
+                reached = neighbours(states[start:start + chunk_size]).ravel()
+                table[reached[table[reached] == 255]] = depth + 1
+        else:
+            states = np.flatnonzero(table == 255)
+            for start in range(0, len(states), chunk_size):
+                chunk = states[start:start + chunk_size]
+                table[chunk[(table[neighbours(chunk)] == depth).any(axis=1)]] = depth + 1
+        depth += 1
+        a, b = equivalents
+        reached = b[table[a] == depth]
+        table[reached[table[reached] == 255]] = depth
+        frontier_size = int(np.count_nonzero(table == depth))
+        n_unvisited -= frontier_size
+    return table
+
+
+def pack(table):
+    """Pack 4 bits entries, two per byte (low bits first)."""
+    if len(table) % 2:
+        table = np.append(table, 0)
+    return (table[0::2] | (table[1::2] << 4)).astype(np.uint8)
+
+
+def unpack(packed):
+    return np.stack([packed & 15, packed >> 4], axis=1).ravel()
+
+
+def compute_corner_tables():
+    twist_moves = compute_ori_moves(N_TWIST, 8, 3, CORNER_PERM_MOVES, CORNER_ORI_MOVES)
+    corner_moves = compute_perm_moves(8, CORNER_PERM_MOVES)
+    representatives, corner_classes, twist_conj, equivalents = compute_corner_classes()
+    corner_classes_64, twist_conj_64 = corner_classes.astype(np.int64), twist_conj.astype(np.int64)
+
+    def neighbours(states):
+        classes, co = np.divmod(states, N_TWIST)
+        return corner_index(corner_classes_64, twist_conj_64, corner_moves[representatives[classes]], twist_moves[co])
+
+    database = _compute_pattern_database(N_CORNER_CLASSES * N_TWIST, 0, neighbours, equivalents)
+    return {"corner_moves": corner_moves.astype(np.uint16), "corner_classes": corner_classes,
+            "twist_conj": twist_conj, "corners_sym_pdb": pack(database)}
+
+
+def compute_edge_tables(n_edges):
+    position_moves, flip_moves = _compute_edge_moves(n_edges)
+    representatives, edge_classes, flip_conj, equivalents = compute_edge_classes(n_edges)
+    position_moves_64, edge_classes_64 = position_moves.astype(np.int64), edge_classes.astype(np.int64)
+    flip_conj_64 = flip_conj.astype(np.int64)
+
+    def neighbours(states):
+        positions = representatives[states >> n_edges]
+        ori = states & ((1 << n_edges) - 1)
+        return edge_index(edge_classes_64, flip_conj_64, n_edges, position_moves_64[positions],
+                          ori[:, None] ^ flip_moves[positions])
+
+    solved = edge_index(edge_classes_64, flip_conj_64, n_edges,
+                        positions_to_coords(np.array([EDGE_GROUP[:n_edges]]))[0], 0)
+    database = _compute_pattern_database(len(representatives) << n_edges, solved, neighbours, equivalents)
+    return {f"edge{n_edges}_moves": position_moves, f"edge{n_edges}_flips": flip_moves,
+            f"edge{n_edges}_classes": edge_classes, f"edge{n_edges}_flip_conj": flip_conj,
+            f"edges{n_edges}_sym_pdb": pack(database)}
+
+
+def _table_names(n_edges):
+    return ["corner_moves", "corner_classes", "twist_conj", "corners_sym_pdb",
+            f"edge{n_edges}_moves", f"edge{n_edges}_flips", f"edge{n_edges}_classes", f"edge{n_edges}_flip_conj",
+            f"edges{n_edges}_sym_pdb"]
+
+
+@lru_cache(maxsize=None)
+def load_tables(tables_dir=None, n_edges=6):
+    """Memory map all tables (generating them first if needed), returns a dict of read-only arrays.
+    The twist move table is the one of the two-phase solver."""
+    if not 1 <= n_edges <= MAX_EDGES:
+        raise ValueError(f"n_edges should be between 1 and {MAX_EDGES}, got {n_edges}")
+    tables_dir = Path(tables_dir or TABLES_DIR)
+    names = _table_names(n_edges)
+    if not all((tables_dir / f"{name}.npy").exists() for name in names[:4]):
+        for name, table in compute_corner_tables().items():
+            save_table(tables_dir / f"{name}.npy", table)
+    if not all((tables_dir / f"{name}.npy").exists() for name in names[4:]):
+        for name, table in compute_edge_tables(n_edges).items():
+            save_table(tables_dir / f"{name}.npy", table)
+    tables = {name: np.load(tables_dir / f"{name}.npy", mmap_mode="r") for name in names}
+    tables["twist_moves"] = two_phase_tables.load_tables(tables_dir)["twist_moves"]
+    return tables
@@ -0,0 +1,90 @@
+"""Solve many states at once over a pool of processes.
+
+Each worker builds its solver once (in the pool initializer), so that tables are loaded (memory mapped, see
+two_phase_tables) once per process, then solves chunks of states.
+"""
+import os
+import time
+from collections import namedtuple, deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from rubiks_cube.cubie import CubieCube
+from rubiks_cube.solvers.basic_solver import BasicSolver
+from rubiks_cube.solvers.kociemba_solver import KociembaSolver
+from rubiks_cube.solvers.optimal_solver import OptimalSolver
+from rubiks_cube.solvers.two_phase_solver import TwoPhaseSolver
+
+SOLVERS = {"kociemba": KociembaSolver, "basic": BasicSolver, "two_phase": TwoPhaseSolver, "optimal": OptimalSolver}
+
+# moves is None and error holds the exception description when the solver failed
+SolveResult = namedtuple("SolveResult", ["state", "moves", "elapsed", "error"])
+
+_solver = None  # Solver of the current worker process
+
+
+def _init_worker(solver, solver_kwargs):
+    global _solver
+    solver = SOLVERS[solver] if isinstance(solver, str) else solver
+    _solver = solver(**solver_kwargs)
+
+
+def _solve_chunk(states):
+    results = []
+    for state in states:
+        start = time.perf_counter()
+        try:
+            CubieCube.from_state_str(state, check=True)  # Some solvers never end on invalid states
+            _solver.compute_solution(state)
+            moves, error = [str(m) for m in _solver.get_all_moves()], None
+        except Exception as e:
+            moves, error = None, f"{type(e).__name__}: {e}"
+        results.append(SolveResult(state, moves, time.perf_counter() - start, error))
+    return results
+
+
+def _chunks(states, chunk_size):
+    chunk = []
+    for state in states:
+        chunk.append(state)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def solve_many(states, solver="kociemba", workers=None, chunk_size=16, ordered=True, **solver_kwargs):
+    """Solve state strings with workers processes (os.cpu_count() by default, 1 solves in the current process),
+    and yields SolveResult(state, moves, elapsed, error) as soon as they are available: in the order of states
+    if ordered, else in completion order.
+    solver is a name in SOLVERS or a solver class, instantiated in each worker with solver_kwargs.
+    A failure on one state (including an invalid state) is reported in its result and does not stop the others.
+    At most 2 chunks per worker are submitted ahead of the consumer: closing the generator early cancels the rest."""
+    if workers == 1:
+        _init_worker(solver, solver_kwargs)
+        for chunk in _chunks(states, chunk_size):
+            yield from _solve_chunk(chunk)
+        return
+    workers = workers or os.cpu_count()
+    chunks = _chunks(states, chunk_size)
+    executor = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(solver, solver_kwargs))
+    try:
+        pending = deque() if ordered else set()
+        submit = pending.append if ordered else pending.add
+        for chunk in chunks:
+            submit(executor.submit(_solve_chunk, chunk))
+            if len(pending) == 2 * workers:
+                break
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                pending -= done
+            for future in done:
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    submit(executor.submit(_solve_chunk, chunk))
+                yield from future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
@@ -1,34 +1,22 @@
-from time import time
 import pandas as pd
-from rubiks_cube.rubikscube import RubiksCube
-from rubiks_cube.solvers.basic_solver import BasicSolver
-from rubiks_cube.solvers.kociemba_solver import KociembaSolver
 
-N = 1000
+from rubiks_cube.batch_rubikscube import BatchRubiksCube
+from rubiks_cube.solvers.parallel import solve_many
 
-c = RubiksCube()
-ko = KociembaSolver()
-basic = BasicSolver()
+N = 1000
 
-solvers = {"kociemba": ko, "basic": basic}
+if __name__ == '__main__':
+    cubes = BatchRubiksCube(N)
+    cubes.shuffle()
+    states = cubes.state_strings
 
-results = []
-for i in range(N):
-    c.shuffle()
-    for name, s in solvers.items():
-        try:
-            start = time()
-            s.compute_solution(c.state_string)
-            stop = time()
-            res = dict(
-                solver=name,
-                time=stop - start,
-                n=len(s._solution.split(" "))
-            )
-            results.append(res)
-        except (Exception, KeyboardInterrupt) as e:
-            print(f"Failed: {c.state_string}")
-            raise e
+    results = []
+    for name in ["kociemba", "basic"]:
+        for state, moves, elapsed, error in solve_many(states, solver=name):
+            if error is not None:
+                print(f"Failed: {state} ({error})")
+                continue
+            results.append(dict(solver=name, time=elapsed, n=len(moves)))
 
-df = pd.DataFrame(results)
-df.to_csv(f"../../data/solvers_comparison-{N}-v5.csv")
+    df = pd.DataFrame(results)
+    df.to_csv(f"../../data/solvers_comparison-{N}-v5.csv")
@@ -0,0 +1,177 @@
+"""Native implementation of Kociemba's two-phase algorithm.
+
+Phase 1 searches (IDA*) move sequences bringing the cube into G1 = <U, D, R2, L2, F2, B2>, phase 2 then solves
+the cube with G1 moves only. Coordinates and tables are described in two_phase_tables: they are memory mapped,
+so that a pool of solver processes shares a single copy of them.
+"""
+import time
+
+from rubiks_cube.constants import FACE_MOVES
+from rubiks_cube.cubie import CubieCube
+from rubiks_cube.moves import Move
+from rubiks_cube.rubikscube import RubiksCube
+from rubiks_cube.solvers.two_phase_tables import (
+    load_tables, flat_view, get_twist, get_flip, get_slice, get_corners, get_ud_edges, get_slice_sorted,
+    N_MOVES, N_PHASE2_MOVES, PHASE2_MOVES, N_TWIST, N_FLIP, N_CORNERS)
+
+MOVES = [Move(m) for m in FACE_MOVES]
+_FACE = [m // 3 for m in range(N_MOVES)]  # Index of the face of each move in FACE_ORDER (U R F D L B)
+_PHASE2_FACE = [_FACE[m] for m in PHASE2_MOVES]
+_IS_PHASE2_MOVE = [m in PHASE2_MOVES for m in range(N_MOVES)]
+
+
+def _is_redundant(face, last_face):
+    """Same face twice in a row, or opposite faces in non canonical order (D U instead of U D)."""
+    return face == last_face or face == last_face - 3
+
+
+# Moves worth trying after a move on last_face, indexed by last_face + 1 (so that -1 stands for no previous move):
+# (index in FACE_MOVES, face) for all moves, (index in phase 2 tables, index in FACE_MOVES, face) in phase 2
+NEXT_MOVES = [[(m, _FACE[m]) for m in range(N_MOVES) if not _is_redundant(_FACE[m], last_face)]
+              for last_face in range(-1, 6)]
+_PHASE2_NEXT = [[(k, PHASE2_MOVES[k], _PHASE2_FACE[k]) for k in range(N_PHASE2_MOVES)
+                 if not _is_redundant(_PHASE2_FACE[k], last_face)] for last_face in range(-1, 6)]
+
+
+class TwoPhaseSearch:
+    """Two-phase search on the tables loaded from tables_dir (see two_phase_tables.TABLES_DIR)."""
+    def __init__(self, tables_dir=None):
+        tables = load_tables(tables_dir)
+        self.twist_moves = flat_view(tables["twist_moves"])
+        self.flip_moves = flat_view(tables["flip_moves"])
+        self.slice_moves = flat_view(tables["slice_moves"])
+        self.corners_moves = flat_view(tables["corners_moves"])
+        self.ud_edges_moves = flat_view(tables["ud_edges_moves"])
+        self.slice_sorted_moves = flat_view(tables["slice_sorted_moves"])
+        self.slice_twist_pruning = flat_view(tables["slice_twist_pruning"])
+        self.slice_flip_pruning = flat_view(tables["slice_flip_pruning"])
+        self.slice_sorted_corners_pruning = flat_view(tables["slice_sorted_corners_pruning"])
+        self.slice_sorted_ud_edges_pruning = flat_view(tables["slice_sorted_ud_edges_pruning"])
+        self._cubie = None
+        self._deadline = None
+        self._best = None
+        self._path = []
+
+    def solve(self, cubie: CubieCube, max_length=24, timeout=None):
+        """Returns the first solution found of at most max_length moves, or None."""
+        return next(self.solutions(cubie, max_length, timeout), None)
+
+    def solutions(self, cubie: CubieCube, max_length=24, timeout=None):
+        """Yields solutions (lists of Moves) of decreasing lengths, all of at most max_length moves.
+        The search stops when timeout (in seconds) is elapsed, or when no shorter solution can be found:
+        without timeout, this may be very long."""
+        self._cubie = cubie
+        self._deadline = None if timeout is None else time.monotonic() + timeout
+        self._best = max_length + 1
+        self._path = []
+        twist, flip, slice_ = get_twist(cubie), get_flip(cubie), get_slice(cubie)
+        depth = self._phase1_distance(twist, flip, slice_)
+        while depth < self._best and not self._is_timed_out():
+            yield from self._phase1(twist, flip, slice_, depth, -1)
+            depth += 1
+
+    def _is_timed_out(self):
+        return self._deadline is not None and time.monotonic() > self._deadline
+
+    def _phase1_distance(self, twist, flip, slice_):
+        return max(self.slice_twist_pruning[slice_ * N_TWIST + twist], self.slice_flip_pruning[slice_ * N_FLIP + flip])
+
+    def _phase1(self, twist, flip, slice_, togo, last_face):
+        if togo == 0:
+            # Phase 1 solutions ending with a G1 move were already found at lower depth
+            if twist == flip == slice_ == 0 and (not self._path or not _IS_PHASE2_MOVE[self._path[-1]]):
+                solution = self._start_phase2(last_face)
+                if solution is not None:
+                    yield solution
+            return
+        if self._is_timed_out():
+            return
+        for m, face in NEXT_MOVES[last_face + 1]:
+            new_twist = self.twist_moves[twist * N_MOVES + m]
+            new_flip = self.flip_moves[flip * N_MOVES + m]
+            new_slice = self.slice_moves[slice_ * N_MOVES + m]
+            if self._phase1_distance(new_twist, new_flip, new_slice) < togo:
+                self._path.append(m)
+                yield from self._phase1(new_twist, new_flip, new_slice, togo - 1, face)
+                self._path.pop()
+                if len(self._path) >= self._best:  # A shorter solution was found meanwhile
+                    return
+
+    def _phase2_distance(self, corners, ud_edges, slice_sorted):
+        return max(self.slice_sorted_corners_pruning[slice_sorted * N_CORNERS + corners],
+                   self.slice_sorted_ud_edges_pruning[slice_sorted * N_CORNERS + ud_edges])
+
+    def _start_phase2(self, last_face):
+        cubie = self._cubie.copy()
+        for m in self._path:
+            cubie.move(m)
+        corners, ud_edges, slice_sorted = get_corners(cubie), get_ud_edges(cubie), get_slice_sorted(cubie)
+        phase1_length = len(self._path)
+        depth = self._phase2_distance(corners, ud_edges, slice_sorted)
+        while phase1_length + depth < self._best and not self._is_timed_out():
+            if self._phase2(corners, ud_edges, slice_sorted, depth, last_face):
+                self._best = len(self._path)
+                solution = [MOVES[m] for m in self._path]
+                del self._path[phase1_length:]
+                return solution
+            depth += 1
+        return None
+
+    def _phase2(self, corners, ud_edges, slice_sorted, togo, last_face):
+        """Returns True if solved, then self._path holds the whole solution."""
+        if togo == 0:
+            return corners == ud_edges == slice_sorted == 0
+        if self._is_timed_out():
+            return False
+        # Hot loop: tables are bound to locals and distances inlined
+        corners_pruning, ud_edges_pruning = self.slice_sorted_corners_pruning, self.slice_sorted_ud_edges_pruning
+        corners_moves, ud_edges_moves, slice_sorted_moves = \
+            self.corners_moves, self.ud_edges_moves, self.slice_sorted_moves
+        corners, ud_edges, slice_sorted = \
+            corners * N_PHASE2_MOVES, ud_edges * N_PHASE2_MOVES, slice_sorted * N_PHASE2_MOVES
+        for k, m, face in _PHASE2_NEXT[last_face + 1]:
+            new_corners = corners_moves[corners + k]
+            new_slice_sorted = slice_sorted_moves[slice_sorted + k]
+            if corners_pruning[new_slice_sorted * N_CORNERS + new_corners] >= togo:
+                continue
+            new_ud_edges = ud_edges_moves[ud_edges + k]
+            if ud_edges_pruning[new_slice_sorted * N_CORNERS + new_ud_edges] >= togo:
+                continue
+            self._path.append(m)
+            if self._phase2(new_corners, new_ud_edges, new_slice_sorted, togo - 1, face):
+                return True
+            self._path.pop()
+        return False
+
+
+class TwoPhaseSolver:
+    """Same interface as KociembaSolver, with the native two-phase search."""
+    def __init__(self, max_length=24, timeout=None, tables_dir=None):
+        self.max_length = max_length
+        self.timeout = timeout
+        self._search = TwoPhaseSearch(tables_dir)
+        self._solution = None
+
+    @property
+    def solution_str(self):
+        return " ".join(self._solution)
+
+    def get_next_move(self, i):
+        return self._solution[i] if not self.is_solved() else None
+
+    def get_all_moves(self):
+        return self._solution if not self.is_solved() else []
+
+    def is_solved(self):
+        return len(self._solution) == 0
+
+    def compute_solution(self, state, callback=None):
+        if state == RubiksCube.SOLVED_STR:
+            self._solution = []
+        else:
+            solution = self._search.solve(CubieCube.from_state_str(state, check=True), self.max_length, self.timeout)
+            if solution is None:
+                raise ValueError(f"No solution of at most {self.max_length} moves found for {state}")
+            self._solution = solution
+        if callback is not None:
+            callback(self._solution)
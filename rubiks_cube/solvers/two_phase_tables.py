@@ -0,0 +1,181 @@
+"""Coordinates, move tables and pruning tables of the two-phase algorithm (see two_phase_solver).
+
+Phase 1 brings the cube into the subgroup G1 = <U, D, R2, L2, F2, B2> using the coordinates
+ - twist: corner orientations, as in rubiks_cube.encoding
+ - flip: edge orientations, as in rubiks_cube.encoding
+ - slice: positions of the 4 UD-slice edges (FR, FL, BL, BR), whatever their order (0 in G1)
+Phase 2 solves the cube with the moves of G1 only, using the coordinates
+ - corners: corner permutation
+ - ud_edges: permutation of the 8 U and D edges
+ - slice_sorted: permutation of the 4 UD-slice edges inside the slice
+
+Tables are generated once with numpy (about a second), saved with np.save in a tables directory, and
+loaded with np.load(mmap_mode="r"): all the processes loading them share one physical copy.
+The tables directory is TABLES_DIR, which can be set with the RUBIKS_CUBE_TABLES_DIR environment variable.
+"""
+import os
+from functools import lru_cache
+from itertools import combinations, permutations
+from pathlib import Path
+
+import numpy as np
+
+from rubiks_cube.constants import FACE_MOVES
+from rubiks_cube.cubie import CORNER_PERM_MOVES, CORNER_ORI_MOVES, EDGE_PERM_MOVES, EDGE_ORI_MOVES, N_EDGES
+from rubiks_cube.encoding import N_CORNER_PERM, N_CORNER_TWIST, N_EDGE_FLIP, perms_to_coords, oris_to_coords
+
+TABLES_DIR = Path(os.environ.get("RUBIKS_CUBE_TABLES_DIR", Path(__file__).parents[2] / "tables"))
+
+N_MOVES = len(FACE_MOVES)
+# Moves of G1, phase 2 tables are indexed by position in this list
+PHASE2_MOVES = [FACE_MOVES.index(m) for m in ["U", "U2", "U'", "R2", "F2", "D", "D2", "D'", "L2", "B2"]]
+N_PHASE2_MOVES = len(PHASE2_MOVES)
+
+N_TWIST = N_CORNER_TWIST
+N_FLIP = N_EDGE_FLIP
+N_SLICE = 495  # 12 choose 4
+N_CORNERS = N_CORNER_PERM
+N_UD_EDGES = 40320  # 8!
+N_SLICE_SORTED = 24  # 4!
+FIRST_SLICE_EDGE = 8  # Edges 8 to 11 belong to the UD slice
+
+# Combinations of 4 positions among 12, sorted so that the solved one (8, 9, 10, 11) is 0
+SLICE_POSITIONS = np.array(sorted(combinations(range(N_EDGES), 4), reverse=True))
+_SLICE_FOR_MASK = np.full(1 << N_EDGES, -1, dtype=np.int64)
+_SLICE_FOR_MASK[(1 << SLICE_POSITIONS).sum(axis=1)] = np.arange(N_SLICE)
+_SLICE_FOR_MASK_LIST = _SLICE_FOR_MASK.tolist()
+
+
+def get_twist(cubie):
+    return oris_to_coords(cubie.co[None], 3)[0].item()
+
+
+def get_flip(cubie):
+    return oris_to_coords(cubie.eo[None], 2)[0].item()
+
+
+def get_slice(cubie):
+    return _SLICE_FOR_MASK_LIST[sum(1 << i for i, e in enumerate(cubie.ep.tolist()) if e >= FIRST_SLICE_EDGE)]
+
+
+def get_corners(cubie):
+    return perms_to_coords(cubie.cp[None])[0].item()
+
+
+def get_ud_edges(cubie):
+    """Only meaningful in G1, where U and D edges are in U and D positions."""
+    return perms_to_coords(cubie.ep[None, :FIRST_SLICE_EDGE])[0].item()
+
+
+def get_slice_sorted(cubie):
+    """Only meaningful in G1, where slice edges are in slice positions."""
+    return perms_to_coords(cubie.ep[None, FIRST_SLICE_EDGE:] - FIRST_SLICE_EDGE)[0].item()
+
+
+def _all_oris(n_coords, n, base):
+    """Orientations of all coordinate values, as a (n_coords, n) array."""
+    oris = np.zeros((n_coords, n), dtype=np.int64)
+    coords = np.arange(n_coords)
+    for i in range(n - 2, -1, -1):
+        coords, oris[:, i] = np.divmod(coords, base)
+    oris[:, -1] = -oris.sum(axis=1) % base
+    return oris
+
+
+def compute_ori_moves(n_coords, n, base, perm_moves, ori_moves):
+    """Move table of the orientation coordinate of n pieces, as a (n_coords, n_moves) array."""
+    oris = _all_oris(n_coords, n, base)
+    new_oris = (oris[:, perm_moves] + ori_moves[None]) % base  # (n_coords, N_MOVES, n)
+    return oris_to_coords(new_oris.reshape(-1, n), base).reshape(n_coords, N_MOVES)
+
+
+def _compute_slice_moves():
+    is_slice = np.zeros((N_SLICE, N_EDGES), dtype=bool)
+    is_slice[np.arange(N_SLICE)[:, None], SLICE_POSITIONS] = True
+    new_is_slice = is_slice[:, EDGE_PERM_MOVES]  # (N_SLICE, N_MOVES, N_EDGES)
+    masks = (new_is_slice << np.arange(N_EDGES)).sum(axis=2)
+    return _SLICE_FOR_MASK[masks]
+
+
+def compute_perm_moves(n, perm_moves):
+    """Move table of the permutation coordinate of n pieces, as a (n!, n_moves) array.
+    perm_moves are the permutations of the moves (which must keep those pieces among themselves)."""
+    perms = np.array(list(permutations(range(n))))  # Lexicographic order is the order of Lehmer ranks
+    new_perms = perms[:, perm_moves]
+    return perms_to_coords(new_perms.reshape(-1, n)).reshape(len(perms), len(perm_moves))
+
+
+def _compute_pruning_table(moves_a, moves_b):
+    """Breadth first search on the product of two coordinates (both 0 when solved), returns the (n_a, n_b)
+    table of distances to solved."""
+    n_a, n_b = len(moves_a), len(moves_b)
+    moves_a, moves_b = np.asarray(moves_a, dtype=np.int64), np.asarray(moves_b, dtype=np.int64)
+    table = np.full(n_a * n_b, 255, dtype=np.uint8)
+    table[0] = 0
+    frontier = np.array([0])
+    depth = 0
+    while len(frontier):
+        a, b = np.divmod(frontier, n_b)
+        neighbours = (moves_a[a] * n_b + moves_b[b]).ravel()
+        depth += 1
+        table[neighbours[table[neighbours] == 255]] = depth
+        frontier = np.flatnonzero(table == depth)
+    return table.reshape(n_a, n_b)
+
+
+def compute_tables():
+    """Compute all tables, returns a dict of arrays."""
+    corner_perms = CORNER_PERM_MOVES[PHASE2_MOVES]
+    ud_edge_perms = EDGE_PERM_MOVES[PHASE2_MOVES, :FIRST_SLICE_EDGE]
+    slice_edge_perms = EDGE_PERM_MOVES[PHASE2_MOVES, FIRST_SLICE_EDGE:] - FIRST_SLICE_EDGE
+    tables = {
+        "twist_moves": compute_ori_moves(N_TWIST, 8, 3, CORNER_PERM_MOVES, CORNER_ORI_MOVES),
+        "flip_moves": compute_ori_moves(N_FLIP, N_EDGES, 2, EDGE_PERM_MOVES, EDGE_ORI_MOVES),
+        "slice_moves": _compute_slice_moves(),
+        "corners_moves": compute_perm_moves(8, corner_perms),
+        "ud_edges_moves": compute_perm_moves(8, ud_edge_perms),
+        "slice_sorted_moves": compute_perm_moves(4, slice_edge_perms),
+    }
+    tables["slice_twist_pruning"] = _compute_pruning_table(tables["slice_moves"], tables["twist_moves"])
+    tables["slice_flip_pruning"] = _compute_pruning_table(tables["slice_moves"], tables["flip_moves"])
+    tables["slice_sorted_corners_pruning"] = _compute_pruning_table(tables["slice_sorted_moves"],
+                                                                    tables["corners_moves"])
+    tables["slice_sorted_ud_edges_pruning"] = _compute_pruning_table(tables["slice_sorted_moves"],
+                                                                     tables["ud_edges_moves"])
+    return {name: table.astype(np.uint8 if "pruning" in name else np.uint16) for name, table in tables.items()}
+
+
+TABLE_NAMES = ["twist_moves", "flip_moves", "slice_moves", "corners_moves", "ud_edges_moves", "slice_sorted_moves",
+               "slice_twist_pruning", "slice_flip_pruning",
+               "slice_sorted_corners_pruning", "slice_sorted_ud_edges_pruning"]
+
+
+def save_table(path, table):
+    """np.save under a temporary name then rename, so that processes loading the table concurrently
+    never see a partial file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npy")
+    np.save(tmp_path, table)
+    os.replace(tmp_path, path)
+
+
+def generate_tables(tables_dir=None):
+    """Compute and save all tables."""
+    tables_dir = Path(tables_dir or TABLES_DIR)
+    for name, table in compute_tables().items():
+        save_table(tables_dir / f"{name}.npy", table)
+
+
+def flat_view(table):
+    """Flat view on a (memory mapped) table. Indexing it returns Python ints, which is much faster than numpy."""
+    return memoryview(np.ascontiguousarray(table)).cast("B").cast(table.dtype.char)
+
+
+@lru_cache(maxsize=None)
+def load_tables(tables_dir=None):
+    """Memory map all tables (generating them first if needed), returns a dict of read-only arrays."""
+    tables_dir = Path(tables_dir or TABLES_DIR)
+    if not all((tables_dir / f"{name}.npy").exists() for name in TABLE_NAMES):
+        generate_tables(tables_dir)
+    return {name: np.load(tables_dir / f"{name}.npy", mmap_mode="r") for name in TABLE_NAMES}
@@ -0,0 +1,62 @@
+"""The 48 symmetries of the cube: the 24 rotations (indexed like CubicRotation), then the same rotations composed
+with the central inversion, which turn the cube into its mirror image.
+
+A symmetry acts on a state by conjugation: the cube is transformed as a whole, then colors are relabelled so that
+centers are in place again (rotate_facelets in rubiks_cube.facelets does it for rotations). The result is a state
+at the same distance from solved: conjugating after move m is conjugating before SYMMETRY_MOVES[s, m]
+(mirrors reverse the direction of turns, R becomes L').
+"""
+import numpy as np
+
+from rubiks_cube.constants import FACE_ORDER, FACE_MOVES, NORMAL_FOR_FACE
+from rubiks_cube.core import get_facelet_index
+from rubiks_cube.cubic_mathematics import ROTATION_MATRICES
+from rubiks_cube.cubie import CORNER_COLORS, EDGE_COLORS, cubie_arrays_to_facelets, facelets_to_cubie_arrays
+from rubiks_cube.facelets import N_FACELETS, STICKERS
+
+SYMMETRY_MATRICES = np.concatenate([ROTATION_MATRICES, -ROTATION_MATRICES])
+SYMMETRY_MATRICES.flags.writeable = False
+N_SYMMETRIES = len(SYMMETRY_MATRICES)
+_INDEX_FOR_MATRIX = {tuple(m.ravel()): i for i, m in enumerate(SYMMETRY_MATRICES)}
+INV_SYMMETRY = np.array([_INDEX_FOR_MATRIX[tuple(m.T.ravel())] for m in SYMMETRY_MATRICES])
+IS_MIRROR = np.array([round(np.linalg.det(m)) < 0 for m in SYMMETRY_MATRICES])
+# The 16 symmetries keeping the UD axis: U and D stickers stay on U and D, so that corner twists are only moved
+# (and reversed by mirrors) along with the corners
+UD_SYMMETRIES = [s for s, m in enumerate(SYMMETRY_MATRICES) if abs(m[1, 1]) == 1]
+_INDEX_FOR_NORMAL = {tuple(NORMAL_FOR_FACE[f]): i for i, f in enumerate(FACE_ORDER)}
+
+
+def _compute_facelet_permutation(matrix):
+    """Returns perm such that facelets[perm] is the cube transformed by matrix (see facelets.ROTATION_FACELETS)."""
+    perm = np.arange(N_FACELETS)
+    for i, (pos, direction) in enumerate(STICKERS):
+        perm[get_facelet_index(matrix @ pos, matrix @ direction)] = i
+    return perm
+
+
+def _compute_piece_permutation(piece_colors):
+    """Position where each symmetry sends each piece position, as a (N_SYMMETRIES, n_pieces) array."""
+    positions = [tuple(sum(NORMAL_FOR_FACE[c] for c in colors)) for colors in piece_colors]
+    index = {p: i for i, p in enumerate(positions)}
+    return np.array([[index[tuple(m @ p)] for p in positions] for m in SYMMETRY_MATRICES])
+
+
+SYMMETRY_FACELETS = np.array([_compute_facelet_permutation(m) for m in SYMMETRY_MATRICES])
+# SYMMETRY_COLORS[s, f] is the index in FACE_ORDER of the image of face f
+SYMMETRY_COLORS = np.array([[_INDEX_FOR_NORMAL[tuple(m @ NORMAL_FOR_FACE[f])] for f in FACE_ORDER]
+                            for m in SYMMETRY_MATRICES], dtype=np.uint8)
+_POWERS = np.arange(len(FACE_MOVES)) % 3  # Quarter turn, half turn, inverse quarter turn
+SYMMETRY_MOVES = (SYMMETRY_COLORS[:, np.arange(len(FACE_MOVES)) // 3] * 3
+                  + np.where(IS_MIRROR[:, None], 2 - _POWERS, _POWERS))
+CORNER_SYMMETRIES = _compute_piece_permutation(CORNER_COLORS)
+EDGE_SYMMETRIES = _compute_piece_permutation(EDGE_COLORS)
+
+
+def conjugate_facelets(facelets, symmetry):
+    """Conjugate of a facelets array by symmetry (an index in SYMMETRY_MATRICES), also works on (N, 54) arrays."""
+    return SYMMETRY_COLORS[symmetry][facelets[..., SYMMETRY_FACELETS[symmetry]]]
+
+
+def conjugate_cubie_arrays(cp, co, ep, eo, symmetry):
+    """Conjugate of (cp, co, ep, eo) by symmetry, also works on (N, 8) and (N, 12) arrays."""
+    return facelets_to_cubie_arrays(conjugate_facelets(cubie_arrays_to_facelets(cp, co, ep, eo), symmetry))
@@ -0,0 +1,46 @@
+import numpy as np
+
+from rubiks_cube.algorithms import rotate_moves_about_y, flip_left_right, flip_up_down, compile_moves
+from rubiks_cube.batch_rubikscube import BatchRubiksCube
+from rubiks_cube.constants import X, Z
+from rubiks_cube.rubikscube import RubiksCube
+
+BELGIUM = ["L", "D'", "R'", "D", "L'", "D'", "R", "D"]
+
+
+def test_symmetries():
+    assert rotate_moves_about_y(["F", "R2", "U'"], Z) == ["F", "R2", "U'"]
+    assert rotate_moves_about_y(["F", "R2", "U'"], X) == ["R", "B2", "U'"]
+    assert flip_left_right(["R", "L2", "F"]) == ["L'", "R2", "F'"]
+    assert flip_up_down(["U", "D'", "F"]) == ["D'", "U", "F'"]
+
+
+def test_compile_moves():
+    compiled = compile_moves(BELGIUM)
+    assert compile_moves(BELGIUM) is compiled
+    assert compiled.moves == tuple(BELGIUM)
+    compiled = compile_moves(BELGIUM, rotate_about=X, flip=True)
+    assert list(compiled.moves) == rotate_moves_about_y(flip_left_right(BELGIUM), X)
+
+
+def test_apply_algorithm():
+    for backend in RubiksCube.BACKENDS:
+        reference = RubiksCube()
+        reference.shuffle()
+        cube = RubiksCube(reference.state_string, backend=backend)
+        cube.apply_algorithm(BELGIUM, rotate_about=-X)
+        for m in rotate_moves_about_y(BELGIUM, -X):
+            reference.move(m)
+        assert cube.state_string == reference.state_string
+        cube._compute_state_string()  # From backend model
+        assert cube.state_string == reference.state_string
+        assert list(cube.history_moves) == rotate_moves_about_y(BELGIUM, -X)
+
+
+def test_batch_apply_algorithm():
+    batch = BatchRubiksCube(4)
+    batch.shuffle()
+    expected = BatchRubiksCube(facelets=batch.facelets)
+    batch.apply_algorithm(BELGIUM, flip=True)
+    expected.apply(flip_left_right(BELGIUM))
+    assert np.array_equal(batch.facelets, expected.facelets)
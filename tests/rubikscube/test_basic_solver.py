@@ -0,0 +1,23 @@
+import json
+from pathlib import Path
+
+from rubiks_cube.rubikscube import RubiksCube
+from rubiks_cube.solvers.basic_solver import solve, solve_stages
+
+# States with the moves of each stage and the solution of the geometric implementation of the stages,
+# which the table driven one has to reproduce exactly
+REGRESSION_CASES = json.loads((Path(__file__).parent / "data" / "basic_solver_regression.json").read_text())
+
+
+def test_solve_stages_regression():
+    for case in REGRESSION_CASES:
+        assert [" ".join(moves) for moves in solve_stages(case["state"])] == case["stages"]
+
+
+def test_solve_regression():
+    for case in REGRESSION_CASES:
+        solution = solve(case["state"])
+        assert " ".join(solution) == case["solution"]
+        cube = RubiksCube(case["state"])
+        cube.apply(solution)
+        assert cube.state_string == RubiksCube.SOLVED_STR
@@ -0,0 +1,42 @@
+import numpy as np
+
+from rubiks_cube.batch_rubikscube import BatchRubiksCube, moves_to_indices
+from rubiks_cube.core import neg_move
+from rubiks_cube.rubikscube import RubiksCube
+
+
+def test_moves_to_indices():
+    assert moves_to_indices("U") == 0
+    assert list(moves_to_indices(["U'", "R", "U'"])) == [2, 3, 2]
+    assert list(moves_to_indices(np.array([1, 2]))) == [1, 2]
+
+
+def test_move():
+    batch = BatchRubiksCube(3)
+    assert batch.is_solved().all()
+    batch.move("F")
+    assert batch.state_strings == ["UUUUUULLLURRURRURRFFFFFFFFFRRRDDDDDDLLDLLDLLDBBBBBBBBB"] * 3
+    batch.move(["F'", "F", "F'"])
+    assert list(batch.is_solved()) == [True, False, True]
+
+
+def test_shuffle():
+    batch = BatchRubiksCube(10)
+    moves = batch.shuffle(20)
+    assert moves.shape == (10, 20)
+    for state, cube_moves in zip(batch.state_strings, moves):
+        cube = RubiksCube(backend="facelets")
+        for m in cube_moves:
+            cube.move(m)
+        assert cube.state_string == state
+
+
+def test_from_state_strings():
+    cube = RubiksCube()
+    moves = cube.shuffle()
+    batch = BatchRubiksCube.from_state_strings([RubiksCube.SOLVED_STR, cube.state_string])
+    batch.apply([neg_move(m) for m in moves[::-1]])
+    assert list(batch.is_solved()) == [False, True]
+    batch = BatchRubiksCube(2)
+    batch.apply(np.array([moves, moves]))
+    assert batch.state_strings == [cube.state_string] * 2
@@ -0,0 +1,148 @@
+import random
+
+import pytest
+
+from rubiks_cube.cubie import CubieCube
+from rubiks_cube.encoding import canonical_key
+from rubiks_cube.facelets import facelets_to_state_str, rotate_facelets, state_str_to_facelets
+from rubiks_cube.rubikscube import RubiksCube
+from rubiks_cube.solvers.cached_solver import CachedSolver, CacheInfo
+from rubiks_cube.solvers.kociemba_solver import KociembaSolver
+
+
+class CountingSolver(KociembaSolver):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def compute_solution(self, state, callback=None):
+        self.calls += 1
+        super().compute_solution(state, callback)
+
+
+def _states(n, seed=0):
+    rng = random.Random(seed)
+    states = []
+    for _ in range(n):
+        cube = RubiksCube()
+        cube.apply([rng.choice("UDLRFB") + rng.choice(["", "'", "2"]) for _ in range(20)])
+        states.append(cube.state_string)
+    return states
+
+
+def _moved(moves):
+    cube = RubiksCube()
+    cube.apply(moves)
+    return cube.state_string
+
+
+def _solves(state, moves):
+    cube = RubiksCube()
+    cube.load_state(state)
+    cube.apply(moves)
+    return cube.is_solved()
+
+
+def test_rotated_states():
+    solver = CountingSolver()
+    cached = CachedSolver(solver)
+    state, = _states(1)
+    cached.compute_solution(state)
+    assert _solves(state, cached.get_all_moves())
+    size = len(cached.get_all_moves())  # One entry per state along the solution
+
+    for r in range(1, 24):
+        rotated = facelets_to_state_str(rotate_facelets(state_str_to_facelets(state), r))
+        cached.compute_solution(rotated)
+        assert _solves(rotated, cached.get_all_moves())
+    assert solver.calls == 1
+    assert cached.cache_info() == CacheInfo(hits=23, disk_hits=0, misses=1, size=size, maxsize=1024)
+
+
+def test_following_solution():
+    solver = CountingSolver()
+    cached = CachedSolver(solver)
+    state, = _states(1)
+    cached.compute_solution(state)
+    cube = RubiksCube()
+    cube.load_state(state)
+    solution = cached.get_all_moves()
+    for i, move in enumerate(solution):
+        cube.apply([move])
+        cached.compute_solution(cube.state_string, prev_move=move)
+        assert cached.get_all_moves() == solution[i + 1:]
+    assert cube.is_solved()
+    assert solver.calls == 1
+    assert cached.cache_info().hits == len(solution) - 1
+
+
+def test_solved():
+    cached = CachedSolver(CountingSolver())
+    cached.compute_solution(RubiksCube.SOLVED_STR)
+    assert cached.is_solved()
+    assert cached.cache_info().misses == 0
+
+
+def _twisted(state, corner=None, edge=None, twist=1):
+    cubie = CubieCube.from_state_str(state)
+    if corner is not None:
+        cubie.co[corner] = (cubie.co[corner] + twist) % 3
+    if edge is not None:
+        cubie.eo[edge] ^= 1
+    return cubie.to_state_str()
+
+
+def test_invalid_states():
+    solver = CountingSolver()
+    cached = CachedSolver(solver)
+    state, = _states(1)
+    cached.compute_solution(state)
+    invalid_states = [_twisted(state, edge=e) for e in range(12)] \
+        + [_twisted(state, corner=c, twist=t) for c in range(8) for t in (1, 2)]
+    # Keys do not encode the last flip and the last twist
+    key = canonical_key(state_str_to_facelets(state))[0]
+    assert any(canonical_key(state_str_to_facelets(invalid))[0] == key for invalid in invalid_states)
+    for invalid in invalid_states:
+        with pytest.raises(ValueError):
+            cached.compute_solution(invalid)
+    assert solver.calls == 1
+    assert cached.cache_info().hits == 0
+
+
+def test_eviction():
+    solver = CountingSolver()
+    cached = CachedSolver(solver, maxsize=2)
+    a, b, c = [_moved([move]) for move in ["R", "R2", "R'"]]  # Solutions of 1 move: 1 entry each
+    for state in [a, b, a, c]:  # a is used again before c is added: b is the least recently used
+        cached.compute_solution(state)
+    assert solver.calls == 3
+    assert cached.cache_info() == CacheInfo(hits=1, disk_hits=0, misses=3, size=2, maxsize=2)
+
+    cached.compute_solution(a)
+    assert solver.calls == 3
+    cached.compute_solution(b)
+    assert solver.calls == 4
+    assert _solves(b, cached.get_all_moves())
+    assert cached.cache_info() == CacheInfo(hits=2, disk_hits=0, misses=4, size=2, maxsize=2)
+
+
+@pytest.mark.parametrize("maxsize", [1, 1024])
+def test_sqlite(tmp_path, maxsize):
+    path = tmp_path / "solutions.sqlite"
+    states = _states(2)
+    cached = CachedSolver(CountingSolver(), maxsize=maxsize, path=path)
+    for state in states:
+        cached.compute_solution(state)
+
+    solver = CountingSolver()
+    reopened = CachedSolver(solver, maxsize=maxsize, path=path)
+    for state in states:
+        reopened.compute_solution(state)
+        assert _solves(state, reopened.get_all_moves())
+    assert solver.calls == 0
+    assert reopened.cache_info() == CacheInfo(hits=0, disk_hits=2, misses=0, size=min(2, maxsize), maxsize=maxsize)
+
+    # Entries are namespaced by solver class
+    other = CachedSolver(KociembaSolver(), path=path)
+    other.compute_solution(states[0])
+    assert other.cache_info().misses == 1
@@ -1,8 +1,11 @@
 import numpy as np
+import pytest
 
 from rubiks_cube.constants import Z, Y, X, FACE_ORDER
 from rubiks_cube.core import state_str_to_state_description, get_normal, get_up_on_face, get_face_for_normal, \
-    get_color_from_state_str, get_rot_from_basis, neg_move, get_rot, get_cube_ids_on_face, get_permutation
+    get_color_from_state_str, get_rot_from_basis, neg_move, get_rot, get_cube_ids_on_face, get_permutation, \
+    get_facelet_index, get_facelet_indices, get_colors_from_state_str, _compute_facelet_index
+from rubiks_cube.facelets import state_str_to_facelets
 
 
 def test_state_str_to_state_description():
@@ -59,6 +62,33 @@ def test_get_color_from_state_str():
                         assert get_color_from_state_str(state, pos, n) == get_face_for_normal(n)
 
 
+def test_get_facelet_index():
+    positions, directions = [], []
+    for x in (-1, 0, 1):
+        for y in (-1, 0, 1):
+            for z in (-1, 0, 1):
+                pos = np.array([x, y, z])
+                for n in (x*X, y*Y, z*Z):
+                    if np.linalg.norm(n) != 0:
+                        assert get_facelet_index(pos, n) == _compute_facelet_index(pos, n)
+                        positions.append(pos)
+                        directions.append(n)
+    indices = get_facelet_indices(positions, directions)
+    assert sorted(indices) == list(range(54))
+    with pytest.raises(ValueError):
+        get_facelet_index(np.array([1, 1, 0]), Z)
+
+
+def test_get_colors_from_state_str():
+    state = "UUUUUULLLURRURRURRFFFFFFFFFRRRDDDDDDLLDLLDLLDBBBBBBBBB"
+    positions = [np.array([1, 1, -1]), np.array([-1, 1, 1]), np.array([0, -1, 0])]
+    directions = [Y, Y, -Y]
+    expected = "".join(get_color_from_state_str(state, p, d) for p, d in zip(positions, directions))
+    assert get_colors_from_state_str(state, positions, directions) == expected == "ULD"
+    facelets = get_colors_from_state_str(state_str_to_facelets(state), positions, directions)
+    assert list(facelets) == [0, 4, 3]
+
+
 def test_get_rot_from_basis():
     canonical = [X, Y, Z]
     test_cases = [
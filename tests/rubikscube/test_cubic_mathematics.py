@@ -0,0 +1,56 @@
+import numpy as np
+
+from rubiks_cube.constants import X, Y, Z, FACE_ORDER
+from rubiks_cube.cubic_mathematics import CubicRotation, ROTATION_MATRICES, MUL_TABLE, INV_TABLE, CUBIE_POSITIONS, \
+    N_ROTATIONS
+
+
+def test_rotation_group():
+    assert N_ROTATIONS == 24
+    assert np.array_equal(ROTATION_MATRICES[0], np.eye(3))
+    for i in range(N_ROTATIONS):
+        assert MUL_TABLE[i, INV_TABLE[i]] == 0
+        assert round(np.linalg.det(ROTATION_MATRICES[i])) == 1
+    # Every row of the multiplication table is a permutation
+    for row in MUL_TABLE:
+        assert sorted(row) == list(range(N_ROTATIONS))
+
+
+def test_interned():
+    assert CubicRotation() is CubicRotation.identity()
+    assert CubicRotation(np.eye(3)) is CubicRotation.identity()
+    assert CubicRotation.rx * CubicRotation.rx.inv() is CubicRotation.identity()
+    assert CubicRotation(CubicRotation.ry.as_matrix()) is CubicRotation.ry
+
+
+def test_from_rotvec():
+    assert np.array_equal(CubicRotation.rx.apply(Y), Z)
+    assert np.array_equal(CubicRotation.ry.apply(Z), X)
+    assert np.array_equal(CubicRotation.rz.apply(X), Y)
+    assert CubicRotation.from_rotvec(np.pi * X) == CubicRotation.rx * CubicRotation.rx
+    assert CubicRotation.from_rotvec(-np.pi / 2 * Z) == CubicRotation.rz.inv()
+
+
+def test_mul_same_as_matrices():
+    for a in (CubicRotation.rx, CubicRotation.ry * CubicRotation.rz, CubicRotation.rz.inv()):
+        for b in (CubicRotation.ry, CubicRotation.rx * CubicRotation.rx):
+            assert np.array_equal((a * b).as_matrix(), np.dot(a.as_matrix(), b.as_matrix()))
+
+
+def test_apply_tables():
+    rot = CubicRotation.ry * CubicRotation.rx
+    for i, pos in enumerate(CUBIE_POSITIONS):
+        assert np.array_equal(CUBIE_POSITIONS[rot.apply_to_position(i)], rot.apply(pos))
+    assert [CubicRotation.ry.apply_to_face(f) for f in FACE_ORDER] == ["U", "B", "R", "D", "F", "L"]
+
+
+def test_pickle():
+    import pickle
+    assert pickle.loads(pickle.dumps(CubicRotation.rx)) is CubicRotation.rx
+
+
+def test_eq_other_types():
+    assert CubicRotation.rx == CubicRotation.rx
+    assert CubicRotation.rx != CubicRotation.ry
+    assert CubicRotation.rx != None  # noqa: E711
+    assert CubicRotation.rx != "x"
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from rubiks_cube.constants import FACE_MOVES
+from rubiks_cube.cubie import CubieCube, CORNER_PERM_MOVES, EDGE_PERM_MOVES, cubie_arrays_to_facelets, \
+    facelets_to_cubie_arrays
+from rubiks_cube.facelets import SOLVED_FACELETS
+from rubiks_cube.rubikscube import RubiksCube
+
+
+def test_move_tables():
+    for i in range(len(FACE_MOVES)):
+        assert sorted(CORNER_PERM_MOVES[i]) == list(range(8))
+        assert sorted(EDGE_PERM_MOVES[i]) == list(range(12))
+    cube = CubieCube()
+    for move in ["R", "R2", "R"]:
+        cube.move(move)
+    assert cube.is_solved()
+
+
+def test_to_state_str():
+    cube = CubieCube()
+    assert cube.to_state_str() == RubiksCube.SOLVED_STR
+    cube.move("F")
+    assert cube.to_state_str() == "UUUUUULLLURRURRURRFFFFFFFFFRRRDDDDDDLLDLLDLLDBBBBBBBBB"
+
+
+def test_same_as_cubes():
+    cube = RubiksCube()
+    cubie = CubieCube()
+    for move in np.random.choice(FACE_MOVES, 50):
+        cube.move(move)
+        cubie.move(move)
+        assert cubie.to_state_str() == cube.state_string
+
+
+def test_from_state_str():
+    cube = RubiksCube()
+    cube.shuffle()
+    cubie = CubieCube.from_state_str(cube.state_string)
+    assert cubie.to_state_str() == cube.state_string
+
+
+def test_check_state_str():
+    CubieCube.from_state_str(RubiksCube.SOLVED_STR, check=True)
+    invalid_states = {
+        "impossible colors": "UUUUUUUUURRRRRRRRRFFFFFFFFFDDDDDDDDDLLLLLLLLLBBBBBBBBU",
+        "Flip": "UUUUURUUURURRRRRRRFFFFFFFFFDDDDDDDDDLLLLLLLLLBBBBBBBBB",
+        "54 letters": "X" * 54,
+    }
+    # Twist URF corner
+    state = list(RubiksCube.SOLVED_STR)
+    state[8], state[9], state[20] = "F", "U", "R"
+    invalid_states["Twist"] = "".join(state)
+    # Swap UR and UF edges
+    state = list(RubiksCube.SOLVED_STR)
+    state[10], state[19] = "F", "R"
+    invalid_states["Parity"] = "".join(state)
+    for name, state_str in invalid_states.items():
+        with pytest.raises(ValueError, match=name):
+            CubieCube.from_state_str(state_str, check=True)
+
+
+def test_facelets_to_cubie_arrays():
+    cube = RubiksCube(backend="cubie")
+    cube.shuffle()
+    cp, co, ep, eo = facelets_to_cubie_arrays(np.array([cube.facelets, SOLVED_FACELETS]))
+    assert np.array_equal(cp[0], cube.cubie.cp) and np.array_equal(eo[0], cube.cubie.eo)
+    assert np.array_equal(ep[1], np.arange(12)) and not co[1].any()
+
+
+def test_cubie_arrays_to_facelets():
+    cube = RubiksCube(backend="cubie")
+    cube.shuffle()
+    c = cube.cubie
+    assert np.array_equal(cubie_arrays_to_facelets(c.cp, c.co, c.ep, c.eo), cube.facelets)
+    facelets = np.array([cube.facelets, SOLVED_FACELETS])
+    assert np.array_equal(cubie_arrays_to_facelets(*facelets_to_cubie_arrays(facelets)), facelets)
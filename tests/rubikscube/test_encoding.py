@@ -0,0 +1,71 @@
+import numpy as np
+
+from rubiks_cube.cubie import CubieCube
+from rubiks_cube.encoding import perm_to_coord, coord_to_perm, ori_to_coord, coord_to_ori, encode, decode, \
+    encode_state_str, decode_state_str, key_to_bytes, key_from_bytes, perms_to_coords, oris_to_coords, \
+    NUM_STATES, KEY_BITS, cubie_to_coords, encode_facelets, canonical_key, \
+    encode_cubie_arrays
+from rubiks_cube.facelets import rotate_facelets
+from rubiks_cube.rubikscube import RubiksCube
+
+
+def test_perm_coord():
+    assert perm_to_coord(range(8)) == 0
+    assert perm_to_coord(range(7, -1, -1)) == 40319
+    for coord in (0, 1, 1234, 40319):
+        assert perm_to_coord(coord_to_perm(coord, 8)) == coord
+
+
+def test_ori_coord():
+    assert ori_to_coord([0] * 8, 3) == 0
+    assert coord_to_ori(0, 8, 3) == [0] * 8
+    for coord in (0, 5, 2186):
+        ori = coord_to_ori(coord, 8, 3)
+        assert sum(ori) % 3 == 0
+        assert ori_to_coord(ori, 3) == coord
+
+
+def test_encode():
+    assert encode(CubieCube()) == 0
+    assert KEY_BITS == 66
+    cube = RubiksCube()
+    keys = set()
+    for _ in range(20):
+        cube.shuffle()
+        key = encode_state_str(cube.state_string)
+        assert 0 <= key < NUM_STATES
+        assert decode_state_str(key) == cube.state_string
+        assert key_from_bytes(key_to_bytes(key)) == key
+        keys.add(key)
+    assert len(keys) == 20
+
+    cubie = CubieCube()
+    cubie.move("R")
+    assert decode(encode(cubie)) == cubie
+
+
+def test_vectorized_coords():
+    cube = RubiksCube(backend="cubie")
+    cubies = []
+    for _ in range(5):
+        cube.shuffle()
+        cubies.append(cube.cubie.copy())
+    expected = np.array([cubie_to_coords(c) for c in cubies])
+    assert np.array_equal(perms_to_coords([c.cp for c in cubies]), expected[:, 0])
+    assert np.array_equal(oris_to_coords([c.co for c in cubies], 3), expected[:, 1])
+    assert np.array_equal(perms_to_coords([c.ep for c in cubies]), expected[:, 2])
+    assert np.array_equal(oris_to_coords([c.eo for c in cubies], 2), expected[:, 3])
+
+    hi, lo = encode_cubie_arrays(*[np.array([getattr(c, name) for c in cubies]) for name in ("cp", "co", "ep", "eo")])
+    assert [int(h) << 64 | int(l) for h, l in zip(hi, lo)] == [encode(c) for c in cubies]
+
+
+def test_canonical_key():
+    cube = RubiksCube()
+    cube.shuffle()
+    assert encode_facelets(cube.facelets[None]) == [encode_state_str(cube.state_string)]
+    key, rotation = canonical_key(cube.facelets)
+    assert key == encode_facelets(rotate_facelets(cube.facelets, rotation)[None])[0]
+    for r in range(24):
+        assert canonical_key(rotate_facelets(cube.facelets, r))[0] == key
+    assert canonical_key(RubiksCube().facelets) == (0, 0)
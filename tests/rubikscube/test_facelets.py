@@ -0,0 +1,38 @@
+import numpy as np
+
+from rubiks_cube.constants import FACE_MOVES
+from rubiks_cube.facelets import state_str_to_facelets, facelets_to_state_str, move_facelets, FACELET_MOVES, \
+    SOLVED_FACELETS, STICKERS
+from rubiks_cube.rubikscube import RubiksCube
+
+
+def test_state_str_conversion():
+    state = "UUUUUULLLURRURRURRFFFFFFFFFRRRDDDDDDLLDLLDLLDBBBBBBBBB"
+    assert facelets_to_state_str(state_str_to_facelets(state)) == state
+    assert np.array_equal(state_str_to_facelets(RubiksCube.SOLVED_STR), SOLVED_FACELETS)
+
+
+def test_stickers():
+    assert len(STICKERS) == 54
+    for pos, direction in STICKERS:
+        axis = np.where(direction != 0)[0][0]
+        assert pos[axis] == direction[axis]
+
+
+def test_move_facelets():
+    for perm in FACELET_MOVES:
+        assert sorted(perm) == list(range(54))
+    facelets = move_facelets(SOLVED_FACELETS, "F")
+    assert facelets_to_state_str(facelets) == "UUUUUULLLURRURRURRFFFFFFFFFRRRDDDDDDLLDLLDLLDBBBBBBBBB"
+    facelets = move_facelets(facelets, "F'")
+    assert np.array_equal(facelets, SOLVED_FACELETS)
+
+
+def test_same_as_cubes():
+    cube = RubiksCube()
+    facelets = SOLVED_FACELETS
+    for move in np.random.choice(FACE_MOVES, 50):
+        cube.move(move)
+        cube._compute_state_string()
+        facelets = move_facelets(facelets, move)
+        assert facelets_to_state_str(facelets) == cube.state_string
@@ -0,0 +1,59 @@
+import random
+import time
+
+import pytest
+
+from rubiks_cube.rubikscube import RubiksCube
+from rubiks_cube.solvers.kociemba_solver import KociembaSolver
+from rubiks_cube.solvers.two_phase_tables import generate_tables
+
+
+@pytest.fixture(scope="module")
+def tables_dir(tmp_path_factory):
+    """Two-phase tables, without near solved table."""
+    tables_dir = tmp_path_factory.mktemp("tables")
+    generate_tables(tables_dir)
+    return tables_dir
+
+
+def _scramble(seed, n_moves=25):
+    rng = random.Random(seed)
+    cube = RubiksCube()
+    cube.apply([rng.choice("UDLRFB") + rng.choice(["", "'", "2"]) for _ in range(n_moves)])
+    return cube.state_string
+
+
+def _solves(state, moves):
+    cube = RubiksCube()
+    cube.load_state(state)
+    cube.apply(moves)
+    return cube.is_solved()
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_iter_solutions(tables_dir, seed):
+    state = _scramble(seed)
+    solver = KociembaSolver(tables_dir=tables_dir)
+    lengths = []
+    for solution in solver.iter_solutions(state, timeout=1):
+        assert _solves(state, solution)
+        lengths.append(len(solution))
+    assert lengths == sorted(lengths, reverse=True)
+
+
+@pytest.mark.parametrize("timeout", [0.2, 1])
+def test_iter_solutions_timeout(tables_dir, timeout):
+    solver = KociembaSolver(tables_dir=tables_dir)
+    start = time.monotonic()
+    # Optimal solutions are out of reach: the search only stops on timeout
+    solutions = list(solver.iter_solutions(_scramble(0), timeout=timeout))
+    assert time.monotonic() - start < timeout + 0.5
+    assert len(solutions) >= 1
+
+
+def test_max_length(tables_dir):
+    state = _scramble(1)
+    solver = KociembaSolver(max_length=21, timeout=10, tables_dir=tables_dir)
+    solver.compute_solution(state)
+    assert len(solver.get_all_moves()) <= 21
+    assert _solves(state, solver.get_all_moves())
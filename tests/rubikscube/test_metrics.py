@@ -0,0 +1,96 @@
+import json
+import random
+
+import pytest
+
+from rubiks_cube.rubikscube import RubiksCube
+from rubiks_cube.solvers.basic_solver import BasicSolver, STAGES, solve_stages
+from rubiks_cube.solvers.kociemba_solver import KociembaSolver
+from rubiks_cube.solvers.metrics import SolverMetrics, NULL_TIMER, stage_timer
+from rubiks_cube.solvers.two_phase_tables import generate_tables
+
+
+@pytest.fixture(scope="module")
+def tables_dir(tmp_path_factory):
+    """Two-phase tables, without near solved table."""
+    tables_dir = tmp_path_factory.mktemp("tables")
+    generate_tables(tables_dir)
+    return tables_dir
+
+
+def test_null_timer():
+    assert stage_timer(None, "Stage") is NULL_TIMER
+    with stage_timer(None, "Stage") as timer:
+        timer.moves = 3
+        timer.iterations += 1
+    assert NULL_TIMER.iterations == 0
+
+
+def test_basic_solver_metrics():
+    runs = []
+    metrics = SolverMetrics(on_stage=runs.append)
+    solver = BasicSolver(metrics=metrics)
+    cube = RubiksCube()
+    cube.shuffle()
+    solver.compute_solution(cube.state_string)
+
+    stats = metrics.to_dict()
+    assert stats["solver"] == "BasicSolver"
+    assert stats["solves"]["runs"] == 1
+    assert stats["solves"]["moves"] == len(solver.get_all_moves())
+    assert set(STAGES) <= set(stats["stages"])
+    assert all(run.seconds >= 0 and not run.failed for run in runs)
+    assert all(stats["stages"][name]["model_calls"] > stats["stages"][name]["iterations"] for name in STAGES)
+    assert stats["stages"]["Near solved table"]["model_calls"] == 0
+    assert json.loads(metrics.to_json()) == stats
+
+    prometheus = metrics.to_prometheus()
+    assert 'rubiks_cube_solver_solve_runs_total{solver="BasicSolver"} 1' in prometheus
+    assert '# TYPE rubiks_cube_solver_stage_max_seconds gauge' in prometheus
+
+    metrics.reset()
+    assert metrics.to_dict()["stages"] == {}
+
+
+def test_kociemba_solver_metrics(tables_dir):
+    metrics = SolverMetrics()
+    solver = KociembaSolver(tables_dir=tables_dir, metrics=metrics)
+    rng = random.Random(0)
+    cube = RubiksCube()
+    cube.apply([rng.choice("UDLRFB") + rng.choice(["", "'", "2"]) for _ in range(25)])
+    solver.compute_solution(cube.state_string)
+    first = solver.get_all_moves()
+
+    stats = metrics.to_dict()
+    assert stats["solver"] == "KociembaSolver"
+    assert stats["solves"]["runs"] == 1
+    assert stats["solves"]["moves"] == len(first)
+    assert set(stats["stages"]) == {"Near solved table", "Kociemba"}
+    assert stats["stages"]["Near solved table"]["runs"] == 1
+    assert stats["stages"]["Near solved table"]["moves"] == 0  # No table in tables_dir
+    assert stats["stages"]["Kociemba"]["runs"] == 1
+    assert stats["stages"]["Kociemba"]["moves"] == len(first)
+
+    solutions = list(solver.iter_solutions(cube.state_string, timeout=10, max_length=len(first) - 1))
+    stats = metrics.to_dict()
+    assert stats["solves"]["runs"] == 1  # iter_solutions is not a whole solve
+    assert stats["stages"]["Kociemba"]["runs"] == 2
+    search = stats["stages"]["Two-phase search"]
+    assert search["runs"] == 1 and search["failures"] == 0
+    assert search["iterations"] == len(solutions) - 1 > 0
+    assert search["moves"] == len(solutions[-1])
+
+
+def test_model_calls():
+    metrics = SolverMetrics("Test")
+    solve_stages(RubiksCube.SOLVED_STR, metrics)
+    # Only the check of each stage
+    assert all(stats["model_calls"] == 1 and stats["iterations"] == 0 for stats in metrics.to_dict()["stages"].values())
+
+
+def test_failed_stage():
+    metrics = SolverMetrics("Test")
+    with pytest.raises(ValueError):
+        with metrics.stage("Stage"):
+            raise ValueError
+    assert metrics.to_dict()["stages"]["Stage"]["failures"] == 1
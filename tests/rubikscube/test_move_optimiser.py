@@ -0,0 +1,44 @@
+import random
+
+from rubiks_cube.move_optimiser import normalise_moves, peephole, shortest_sequences, MoveOptimiser, MOVES
+from rubiks_cube.moves import parse_moves
+from rubiks_cube.rubikscube import RubiksCube
+
+
+def _state(moves):
+    cube = RubiksCube()
+    cube.apply(list(moves))
+    return cube.state_string
+
+
+def test_normalise_moves():
+    assert normalise_moves(parse_moves("L R L'")) == parse_moves("R")
+    assert normalise_moves(parse_moves("R U U' R'")) == []
+    assert normalise_moves(parse_moves("D U D2 U'")) == parse_moves("D'")
+    assert normalise_moves(parse_moves("L R F B' F'")) == parse_moves("R L B'")
+    assert normalise_moves([]) == []
+
+
+def test_shortest_sequences():
+    table = shortest_sequences(2)
+    assert len(table) == 1 + 18 + 243
+    assert all(len(sequence) <= 2 for sequence in table.values())
+
+
+def test_peephole():
+    assert peephole(parse_moves("F2 B2 R2 L2 F2 U2")) == parse_moves("R2 L2 B2 U2")
+    assert peephole(parse_moves("R U R'")) == parse_moves("R U R'")
+
+
+def test_optimise():
+    optimiser = MoveOptimiser()
+    assert optimiser.optimise(parse_moves("F2 B2 R2 L2 F2 U2 L R L'")) == parse_moves("R2 L2 B2 U2 R")
+    rng = random.Random(0)
+    for _ in range(50):
+        moves = [rng.choice(MOVES) for _ in range(rng.randint(0, 30))]
+        optimised = optimiser.optimise(moves)
+        assert len(optimised) <= len(moves)
+        assert _state(optimised) == _state(moves)
+    info = optimiser.info()
+    assert info.calls == 51
+    assert info.saved == info.moves_in - info.moves_out > 0
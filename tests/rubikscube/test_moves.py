@@ -0,0 +1,55 @@
+import pickle
+
+import pytest
+
+from rubiks_cube.constants import FACE_MOVES
+from rubiks_cube.core import neg_move
+from rubiks_cube.moves import Move, MOVES, parse_moves, format_moves
+from rubiks_cube.rubikscube import RubiksCube
+
+
+def test_interned():
+    assert len(MOVES) == 18
+    for name in FACE_MOVES:
+        move = Move(name)
+        assert move is Move(name) is MOVES[name]
+        assert move == name and hash(move) == hash(name)
+        assert FACE_MOVES[move.index] == move
+        assert pickle.loads(pickle.dumps(move)) is move
+    with pytest.raises(ValueError):
+        Move("X")
+
+
+def test_attributes():
+    move = Move("R'")
+    assert (move.face, move.power, move.axis) == ("R", 3, 1)
+    assert move.inverse is Move("R")
+    assert Move("L2").inverse is Move("L2")
+    assert Move("R").flipped_left_right is Move("L'")
+    assert Move("U2").flipped_up_down is Move("D2")
+    assert Move("F").rotated_about_y == (Move("F"), Move("L"), Move("B"), Move("R"))
+    assert neg_move(Move("F")) is Move("F'")
+    assert neg_move("B'") == "B"
+
+
+def test_parse_moves():
+    expected = ["R", "U", "R'", "U2"]
+    assert parse_moves("R U R' U2") == expected
+    assert parse_moves("RUR'U2") == expected
+    assert parse_moves("  R U\nR'U2' ") == expected
+    assert all(isinstance(m, Move) for m in parse_moves("RUR'U2"))
+    assert parse_moves("") == []
+    assert format_moves(expected) == "R U R' U2"
+    assert format_moves(expected, compact=True) == "RUR'U2"
+    for invalid in ["R U X", "R3", "R''", "r"]:
+        with pytest.raises(ValueError):
+            parse_moves(invalid)
+
+
+def test_apply_compact_notation():
+    cube = RubiksCube()
+    cube.apply("RUR'U'")
+    reference = RubiksCube()
+    for m in ["R", "U", "R'", "U'"]:
+        reference.move(m)
+    assert cube.state_string == reference.state_string
@@ -0,0 +1,88 @@
+import random
+import shutil
+from itertools import product
+
+import pytest
+
+from rubiks_cube.constants import FACE_MOVES
+from rubiks_cube.cubie import CubieCube
+from rubiks_cube.rubikscube import RubiksCube
+from rubiks_cube.solvers.basic_solver import BasicSolver
+from rubiks_cube.solvers.near_solved_table import TABLE_NAMES, generate_table, load_table, solve_near_solved
+
+DEPTH = 3
+
+
+@pytest.fixture(scope="module")
+def tables_dir(tmp_path_factory):
+    tables_dir = tmp_path_factory.mktemp("tables")
+    generate_table(tables_dir, depth=DEPTH, workers=1)
+    return tables_dir
+
+
+def _state(moves):
+    cube = RubiksCube()
+    cube.apply(moves)
+    return cube.state_string
+
+
+def _solves(state, moves):
+    cube = RubiksCube()
+    cube.load_state(state)
+    cube.apply(moves)
+    return cube.is_solved()
+
+
+def _distance(state):
+    """Brute force distance to solved, up to DEPTH."""
+    for n in range(DEPTH + 1):
+        if any(_solves(state, moves) for moves in product(FACE_MOVES, repeat=n)):
+            return n
+    return None
+
+
+def test_table_size(tables_dir):
+    assert len(load_table(tables_dir)) == 1 + 18 + 243 + 3240
+
+
+def test_optimal(tables_dir):
+    rng = random.Random(0)
+    for n_moves in [0, 1, 2, 2, 3, 3, 3, 3]:
+        state = _state([rng.choice(FACE_MOVES) for _ in range(n_moves)])
+        solution = solve_near_solved(state, tables_dir)
+        assert _solves(state, solution)
+        assert len(solution) == _distance(state)
+
+
+def test_beyond_depth(tables_dir):
+    state = _state(["R", "U", "F", "L"])
+    assert solve_near_solved(state, tables_dir) is None
+    assert load_table(tables_dir).solve(CubieCube.from_state_str(state)) is None
+
+
+def test_no_table(tmp_path):
+    assert load_table(tmp_path) is None
+    assert solve_near_solved(_state(["R"]), tmp_path) is None
+
+
+def test_table_generated_later(tables_dir, tmp_path):
+    state = _state(["R"])
+    assert solve_near_solved(state, tmp_path) is None
+    # As if generated by another process
+    for name in TABLE_NAMES:
+        shutil.copy(tables_dir / f"{name}.npy", tmp_path)
+    assert len(solve_near_solved(state, tmp_path)) == 1
+    assert load_table(tmp_path) is load_table(str(tmp_path))  # Loaded once
+
+
+def test_basic_solver(tables_dir, tmp_path):
+    state = _state(["R", "U", "F'"])
+    solver = BasicSolver(tables_dir=tables_dir)
+    solver.compute_solution(state)
+    assert [str(m) for m in solver.get_all_moves()] == ["F", "U'", "R'"]
+
+    # Without table, the stages of the beginner method are applied
+    solver = BasicSolver(tables_dir=tmp_path)
+    solver.compute_solution(state)
+    assert len(solver.get_all_moves()) > 3
+    assert _solves(state, solver.get_all_moves())
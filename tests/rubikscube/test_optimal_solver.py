@@ -0,0 +1,105 @@
+import random
+
+import numpy as np
+import pytest
+
+from rubiks_cube.constants import FACE_MOVES
+from rubiks_cube.cubie import CubieCube
+from rubiks_cube.rubikscube import RubiksCube
+from rubiks_cube.solvers.near_solved_table import generate_table, load_table
+from rubiks_cube.solvers.optimal_solver import OptimalSolver
+from rubiks_cube.solvers.optimal_tables import (
+    N_CORNER_CLASSES, corner_index, edge_index, edge_symmetries, get_corner_state, get_edge_state, load_tables, pack,
+    unpack)
+from rubiks_cube.solvers.two_phase_tables import N_TWIST, flat_view
+from rubiks_cube.symmetries import UD_SYMMETRIES, conjugate_cubie_arrays
+
+N_EDGES = 4  # Small edges pattern database, built in no time
+NEAR_SOLVED_DEPTH = 5
+
+
+@pytest.fixture(scope="module")
+def tables_dir(tmp_path_factory):
+    """Pattern databases (loading a solver generates them) and near solved table in a temporary directory."""
+    tables_dir = tmp_path_factory.mktemp("tables")
+    OptimalSolver(n_edges=N_EDGES, tables_dir=tables_dir)
+    generate_table(tables_dir, depth=NEAR_SOLVED_DEPTH, workers=1)
+    return tables_dir
+
+
+def _scramble(rng, n_moves):
+    cube = RubiksCube()
+    cube.apply([rng.choice(FACE_MOVES) for _ in range(n_moves)])
+    return cube.state_string
+
+
+def _solves(state, moves):
+    cube = RubiksCube()
+    cube.load_state(state)
+    cube.apply(moves)
+    return cube.is_solved()
+
+
+@pytest.mark.parametrize("size", [1, 2, 15, 16])
+def test_pack(size):
+    table = np.random.default_rng(size).integers(0, 16, size, dtype=np.uint8)
+    packed = pack(table)
+    assert len(packed) == (size + 1) // 2
+    assert np.array_equal(unpack(packed)[:size], table)
+    # Lookups of the solver
+    packed = flat_view(packed)
+    assert [packed[i >> 1] >> ((i & 1) << 2) & 15 for i in range(size)] == table.tolist()
+
+
+def test_symmetric_states(tables_dir):
+    """Conjugates of a state by the symmetries of a database are in the same class: they have the same distance."""
+    tables = load_tables(tables_dir, N_EDGES)
+    corners_pdb, edges_pdb = unpack(tables["corners_sym_pdb"]), unpack(tables[f"edges{N_EDGES}_sym_pdb"])
+    assert len(tables["corners_sym_pdb"]) == N_CORNER_CLASSES * N_TWIST // 2
+    corner_classes, twist_conj = flat_view(tables["corner_classes"]), flat_view(tables["twist_conj"])
+    edge_classes, flip_conj = flat_view(tables[f"edge{N_EDGES}_classes"]), flat_view(tables[f"edge{N_EDGES}_flip_conj"])
+    rng = random.Random(2)
+    for _ in range(20):
+        cube = CubieCube.from_state_str(_scramble(rng, 8))
+        arrays = (cube.cp, cube.co, cube.ep, cube.eo)
+        corners, edges = set(), set()
+        for s in UD_SYMMETRIES:
+            conjugate = CubieCube(*conjugate_cubie_arrays(*arrays, s))
+            i = corner_index(corner_classes, twist_conj, *get_corner_state(conjugate))
+            corners.add(corners_pdb[i])
+        for s in edge_symmetries(N_EDGES):
+            conjugate = CubieCube(*conjugate_cubie_arrays(*arrays, s))
+            i = edge_index(edge_classes, flip_conj, N_EDGES, *get_edge_state(conjugate, N_EDGES))
+            edges.add(edges_pdb[i])
+        assert len(corners) == 1 and len(edges) == 1
+
+
+def test_optimal(tables_dir):
+    rng = random.Random(0)
+    near_solved = load_table(tables_dir)
+    solver = OptimalSolver(n_edges=N_EDGES, tables_dir=tables_dir)
+    for n_moves in [1, 2, 3, 4, 5, 5, 5, 5]:
+        state = _scramble(rng, n_moves)
+        optimal = near_solved.solve(CubieCube.from_state_str(state))
+        solver.compute_solution(state)
+        assert _solves(state, solver.get_all_moves())
+        assert len(solver.get_all_moves()) == len(optimal)
+
+
+def test_max_length(tables_dir):
+    cube = RubiksCube()
+    cube.apply(["R", "U", "F'", "L2", "D"])
+    with pytest.raises(ValueError):
+        OptimalSolver(max_length=4, n_edges=N_EDGES, tables_dir=tables_dir).compute_solution(cube.state_string)
+
+
+def test_nodes_stats(tables_dir):
+    solver = OptimalSolver(n_edges=N_EDGES, tables_dir=tables_dir)
+    solver.compute_solution(RubiksCube.SOLVED_STR)
+    assert solver.is_solved()
+    assert solver.nodes_expanded == 0
+
+    solver.compute_solution(_scramble(random.Random(1), 8))
+    assert solver.nodes_expanded > 0
+    assert solver.elapsed > 0
+    assert solver.nodes_per_second == pytest.approx(solver.nodes_expanded / solver.elapsed)
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from rubiks_cube.rubikscube import RubiksCube
+from rubiks_cube.solvers.parallel import solve_many, SolveResult
+
+
+def _states(n, seed=0):
+    rng = random.Random(seed)
+    states = []
+    for _ in range(n):
+        cube = RubiksCube()
+        cube.apply([rng.choice("UDLRFB") + rng.choice(["", "'", "2"]) for _ in range(20)])
+        states.append(cube.state_string)
+    return states
+
+
+def _solves(state, moves):
+    cube = RubiksCube()
+    cube.load_state(state)
+    cube.apply(moves)
+    return cube.is_solved()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_ordered(workers):
+    states = _states(10)
+    results = list(solve_many(states, solver="kociemba", workers=workers, chunk_size=3))
+    assert [r.state for r in results] == states
+    for result in results:
+        assert isinstance(result, SolveResult)
+        state, moves, elapsed, error = result
+        assert error is None and elapsed >= 0
+        assert _solves(state, moves)
+
+
+def test_as_completed():
+    states = _states(10)
+    results = list(solve_many(states, solver="basic", workers=2, chunk_size=2, ordered=False))
+    assert sorted(r.state for r in results) == sorted(states)
+    assert all(r.error is None and _solves(r.state, r.moves) for r in results)
+
+
+@pytest.mark.parametrize("solver", ["basic", "kociemba"])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_invalid_state(solver, workers):
+    states = _states(3)
+    states.insert(1, "U" * 54)
+    results = list(solve_many(states, solver=solver, workers=workers, chunk_size=2))
+    assert [r.state for r in results] == states
+    assert results[1].moves is None and results[1].error.startswith("ValueError")
+    assert all(r.error is None for i, r in enumerate(results) if i != 1)
+
+
+def test_close_early():
+    results = solve_many(_states(200), solver="basic", workers=2, chunk_size=1)
+    first = next(results)
+    results.close()  # Does not wait for the whole corpus
+    assert first.error is None
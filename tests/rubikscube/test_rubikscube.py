@@ -35,3 +35,54 @@ def test_load_state():
     c.load_state("UUUUUULLLURRURRURRFFFFFFFFFRRRDDDDDDLLDLLDLLDBBBBBBBBB")
     c.move("F'")
     assert c.is_solved()
+
+
+def test_cubie_backend():
+    c = RubiksCube(backend="cubie")
+    assert c.cubes is None
+    c.move("F")
+    assert c.state_string == "UUUUUULLLURRURRURRFFFFFFFFFRRRDDDDDDLLDLLDLLDBBBBBBBBB"
+    c.move("F'")
+    assert c.is_solved()
+
+    reference = RubiksCube()
+    moves = reference.shuffle()
+    for m in moves:
+        c.move(m)
+    assert c.state_string == reference.state_string
+    c.load_state(reference.state_string)
+    assert c.state_string == reference.state_string
+
+
+def test_facelets_backend():
+    c = RubiksCube(backend="facelets")
+    reference = RubiksCube()
+    for m in reference.shuffle():
+        c.move(m)
+    assert c.state_string == reference.state_string
+    reference._compute_state_string()
+    assert c.state_string == reference.state_string
+
+
+def test_apply():
+    for backend in RubiksCube.BACKENDS:
+        c = RubiksCube(backend=backend)
+        c.apply("F D L' L D' F'")
+        assert c.is_solved()
+        reference = RubiksCube()
+        moves = reference.shuffle()
+        c.apply(moves)
+        assert c.state_string == reference.state_string
+        c._compute_state_string()
+        assert c.state_string == reference.state_string
+
+
+def test_history_size():
+    c = RubiksCube(backend="facelets", history_size=3)
+    c.apply("F D L' L D' F'")
+    assert list(c.history_moves) == ["L", "D'", "F'"]
+    c.apply("F R", record_history=False)
+    assert list(c.history_moves) == ["L", "D'", "F'"]
+    c = RubiksCube(history_size=0)
+    c.shuffle()
+    assert len(c.history_moves) == 0
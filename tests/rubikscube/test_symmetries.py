@@ -0,0 +1,45 @@
+import numpy as np
+
+from rubiks_cube.constants import FACE_MOVES
+from rubiks_cube.cubie import CubieCube, facelets_to_cubie_arrays
+from rubiks_cube.facelets import SOLVED_FACELETS, move_facelets, rotate_facelets
+from rubiks_cube.rubikscube import RubiksCube
+from rubiks_cube.symmetries import N_SYMMETRIES, INV_SYMMETRY, IS_MIRROR, UD_SYMMETRIES, SYMMETRY_MOVES, \
+    conjugate_cubie_arrays, conjugate_facelets
+
+
+def _shuffled_facelets():
+    cube = RubiksCube(backend="facelets")
+    cube.shuffle()
+    return cube.facelets
+
+
+def test_symmetries():
+    assert N_SYMMETRIES == 48
+    assert IS_MIRROR.sum() == 24
+    assert len(UD_SYMMETRIES) == 16
+    facelets = _shuffled_facelets()
+    for s in range(N_SYMMETRIES):
+        assert np.array_equal(conjugate_facelets(SOLVED_FACELETS, s), SOLVED_FACELETS)
+        assert np.array_equal(conjugate_facelets(conjugate_facelets(facelets, s), INV_SYMMETRY[s]), facelets)
+        if not IS_MIRROR[s]:
+            assert np.array_equal(conjugate_facelets(facelets, s), rotate_facelets(facelets, s))
+
+
+def test_symmetry_moves():
+    facelets = _shuffled_facelets()
+    for s in range(N_SYMMETRIES):
+        assert sorted(SYMMETRY_MOVES[s]) == list(range(len(FACE_MOVES)))
+        for m in range(len(FACE_MOVES)):
+            assert np.array_equal(conjugate_facelets(move_facelets(facelets, m), s),
+                                  move_facelets(conjugate_facelets(facelets, s), SYMMETRY_MOVES[s, m]))
+
+
+def test_conjugate_cubie_arrays():
+    facelets = np.array([_shuffled_facelets(), SOLVED_FACELETS])
+    arrays = facelets_to_cubie_arrays(facelets)
+    for s in range(N_SYMMETRIES):
+        cp, co, ep, eo = conjugate_cubie_arrays(*arrays, s)
+        expected = facelets_to_cubie_arrays(conjugate_facelets(facelets, s))
+        assert all(np.array_equal(a, b) for a, b in zip((cp, co, ep, eo), expected))
+        assert CubieCube(cp[0], co[0], ep[0], eo[0]).get_error() is None
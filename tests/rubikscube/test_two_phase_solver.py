@@ -0,0 +1,65 @@
+import random
+import time
+
+import pytest
+
+from rubiks_cube.rubikscube import RubiksCube
+from rubiks_cube.solvers.two_phase_solver import TwoPhaseSolver
+from rubiks_cube.solvers.two_phase_tables import generate_tables
+
+
+@pytest.fixture(scope="module")
+def tables_dir(tmp_path_factory):
+    tables_dir = tmp_path_factory.mktemp("tables")
+    generate_tables(tables_dir)
+    return tables_dir
+
+
+def _scramble(seed, n_moves=25):
+    rng = random.Random(seed)
+    cube = RubiksCube()
+    cube.apply([rng.choice("UDLRFB") + rng.choice(["", "'", "2"]) for _ in range(n_moves)])
+    return cube.state_string
+
+
+def _solves(state, moves):
+    cube = RubiksCube()
+    cube.load_state(state)
+    cube.apply(moves)
+    return cube.is_solved()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_scrambles(tables_dir, seed):
+    state = _scramble(seed)
+    solver = TwoPhaseSolver(tables_dir=tables_dir)
+    solver.compute_solution(state)
+    assert 0 < len(solver.get_all_moves()) <= 24
+    assert _solves(state, solver.get_all_moves())
+
+
+def test_solved(tables_dir):
+    solver = TwoPhaseSolver(tables_dir=tables_dir)
+    solver.compute_solution(RubiksCube.SOLVED_STR)
+    assert solver.is_solved() and solver.get_all_moves() == []
+
+
+def test_max_length(tables_dir):
+    cube = RubiksCube()
+    cube.apply(["R", "U", "F'", "L2", "D"])
+    solver = TwoPhaseSolver(max_length=5, tables_dir=tables_dir)
+    solver.compute_solution(cube.state_string)
+    assert len(solver.get_all_moves()) <= 5
+    assert _solves(cube.state_string, solver.get_all_moves())
+
+    with pytest.raises(ValueError):
+        TwoPhaseSolver(max_length=4, tables_dir=tables_dir).compute_solution(cube.state_string)
+
+
+def test_timeout(tables_dir):
+    # Random states need more than 14 moves, so the search only stops on timeout
+    solver = TwoPhaseSolver(max_length=14, timeout=0.5, tables_dir=tables_dir)
+    start = time.monotonic()
+    with pytest.raises(ValueError):
+        solver.compute_solution(_scramble(0))
+    assert time.monotonic() - start < 2
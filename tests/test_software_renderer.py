@@ -0,0 +1,54 @@
+import struct
+import zlib
+
+import numpy as np
+
+from open_gl.cube_mesh import FACE_COLORS
+from open_gl.software_renderer import SoftwareRenderer, encode_png, NO_QUAD
+from rubiks_cube.moves import parse_moves
+from rubiks_cube.rubikscube import RubiksCube
+
+
+def test_render_solved():
+    renderer = SoftwareRenderer(64, 48)
+    frame = renderer.render(RubiksCube.SOLVED_STR)
+    assert frame.shape == (48, 64, 3) and frame.dtype == np.uint8
+    assert renderer.quad_map()[0, 0] == NO_QUAD
+    # The default view shows the U, F and R faces
+    colors = {tuple(c) for c in frame.reshape(-1, 3)}
+    for face in "UFR":
+        assert tuple(np.rint(np.array(FACE_COLORS[face]) * 255).astype(np.uint8)) in colors
+    for face in "DLB":
+        assert tuple(np.rint(np.array(FACE_COLORS[face]) * 255).astype(np.uint8)) not in colors
+
+
+def test_render_many():
+    renderer = SoftwareRenderer(32, 32)
+    states = []
+    for moves in ["", "R", "R U F'"]:
+        cube = RubiksCube()
+        cube.apply(parse_moves(moves))
+        states.append(cube.state_string)
+    frames = list(renderer.render_many(states, batch_size=2))
+    assert len(frames) == 3
+    for state, frame in zip(states, frames):
+        assert np.array_equal(frame, renderer.render(state))
+    assert not np.array_equal(frames[0], frames[1])
+
+
+def test_animation_frames():
+    renderer = SoftwareRenderer(32, 32, samples=1)
+    frames = list(renderer.animation_frames(RubiksCube.SOLVED_STR, parse_moves("R R'"), fps=10))
+    assert len(frames) == 2 * 9 + 1
+    assert np.array_equal(frames[0], frames[-1])
+    assert not np.array_equal(frames[0], frames[4])
+
+
+def test_encode_png():
+    frame = np.arange(2 * 3 * 3, dtype=np.uint8).reshape(2, 3, 3)
+    png = encode_png(frame)
+    assert png.startswith(b"\x89PNG\r\n\x1a\n")
+    assert struct.unpack(">II", png[16:24]) == (3, 2)
+    length = struct.unpack(">I", png[33:37])[0]
+    rows = zlib.decompress(png[41:41 + length])
+    assert rows == b"\x00" + frame[0].tobytes() + b"\x00" + frame[1].tobytes()
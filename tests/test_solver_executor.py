@@ -0,0 +1,116 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("pygame")  # Needed by events_hub
+
+from events_hub import Event  # noqa: E402
+from ui.solver_executor import SolverExecutor  # noqa: E402
+
+TIMEOUT = 5
+
+
+class FakeHub:
+    def __init__(self):
+        self.events = []
+        self.raised = threading.Event()
+
+    def raise_event(self, event):
+        self.events.append(event)
+        self.raised.set()
+
+    def wait(self):
+        """Waits for the next event."""
+        assert self.raised.wait(TIMEOUT)
+        self.raised.clear()
+
+
+class SlowSolver:
+    """Blocks in compute_solution until released, its solution is the state."""
+    def __init__(self, fail=False):
+        self.states = []
+        self.prev_moves = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.fail = fail
+        self._solution = None
+
+    def compute_solution(self, state_str, prev_move=None):
+        self.states.append(state_str)
+        self.prev_moves.append(prev_move)
+        self.started.set()
+        assert self.release.wait(TIMEOUT)
+        if self.fail:
+            raise ValueError(state_str)
+        self._solution = [state_str]
+
+    def get_all_moves(self):
+        return self._solution
+
+
+def test_latest_result():
+    hub, solver = FakeHub(), SlowSolver()
+    executor = SolverExecutor(hub)
+    executor.submit("slow", solver, "A")
+    assert solver.started.wait(TIMEOUT)
+    executor.submit("slow", solver, "B")  # Cancelled before it starts
+    executor.submit("slow", solver, "C")
+    solver.release.set()
+    hub.wait()
+    executor.shutdown()
+
+    # A was superseded while running, its result is dropped
+    assert solver.states == ["A", "C"]
+    assert [(e.type, e.solver, e.state_str, e.moves, e.error) for e in hub.events] == \
+        [(Event.SOLVER_FINISHED, "slow", "C", ["C"], None)]
+
+
+def test_prev_move():
+    hub, solver = FakeHub(), SlowSolver()
+    executor = SolverExecutor(hub)
+    solver.release.set()
+    executor.submit("slow", solver, "A")
+    hub.wait()
+    executor.submit("slow", solver, "B", prev_move="R")
+    hub.wait()
+    executor.shutdown()
+    assert solver.prev_moves == [None, "R"]
+
+
+def test_error():
+    hub, solver = FakeHub(), SlowSolver(fail=True)
+    executor = SolverExecutor(hub)
+    solver.release.set()
+    executor.submit("slow", solver, "A")
+    hub.wait()
+    executor.shutdown()
+    event, = hub.events
+    assert event.moves is None and isinstance(event.error, ValueError)
+
+
+def test_cancel():
+    hub, solver = FakeHub(), SlowSolver()
+    executor = SolverExecutor(hub)
+    executor.submit("slow", solver, "A")
+    assert solver.started.wait(TIMEOUT)
+    executor.cancel("slow")
+    solver.release.set()
+    # Requests of a solver run one after the other: A is over when D is
+    executor.submit("slow", solver, "D")
+    hub.wait()
+    executor.shutdown()
+    assert [e.state_str for e in hub.events] == ["D"]
+
+
+def test_shutdown():
+    hub, solver = FakeHub(), SlowSolver()
+    executor = SolverExecutor(hub)
+    executor.submit("slow", solver, "A")
+    assert solver.started.wait(TIMEOUT)
+    executor.submit("slow", solver, "B")
+    start = time.monotonic()
+    executor.shutdown()  # Does not wait for the running solve
+    assert time.monotonic() - start < 1
+    solver.release.set()
+    assert solver.states == ["A"]
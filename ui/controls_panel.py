@@ -7,7 +7,9 @@ import numpy as np
 from rubiks_cube.core import state_str_to_state_description
 from rubiks_cube.rubikscube import RubiksCube
 from rubiks_cube.solvers.basic_solver import BasicSolver
+from rubiks_cube.solvers.cached_solver import CachedSolver
 from rubiks_cube.solvers.kociemba_solver import KociembaSolver
+from ui.solver_executor import SolverExecutor
 from ui.custom_widgets import SectionTitle, ArrowButton, MoveButton, WrappedLabel, SolverControls, ToggleButton2
 from events_hub import EventsHub, Event
 
@@ -15,8 +17,10 @@ from events_hub import EventsHub, Event
 class Dashboard(tk.Tk):
     def __init__(self, event_hub: EventsHub):
         super().__init__()
-        self.kociemba_solver = KociembaSolver()
-        self.basic_solver = BasicSolver()
+        self.kociemba_solver = CachedSolver(KociembaSolver())
+        self.basic_solver = CachedSolver(BasicSolver())
+        self.solver_executor = SolverExecutor(event_hub)
+        self.solutions = {"kociemba": [], "basic": []}
 
         self.state_tooltip = Pmw.Balloon(self)
         self.state_tooltip.configure(label_font=("Courier", 8))
@@ -141,6 +145,10 @@ class Dashboard(tk.Tk):
         # Override close protocol to send close signal
         self.event_hub.raise_event(Event(origin=Event.TKINTER, type=Event.QUIT))
 
+    def on_quit(self, event):
+        self.solver_executor.shutdown()
+        self.quit()
+
     def change_state_label(self, state_str):
         self.state.set_text(state_str)
         state_description = state_str_to_state_description(state_str)
@@ -149,13 +157,26 @@ class Dashboard(tk.Tk):
     def on_state_changed(self, event):
         self.change_state_label(event.state_str)
         if event.is_solved:
+            for name in self.solutions:
+                self.solver_executor.cancel(name)
+                self.solutions[name] = []
             self.kociemba.edit_solution(None)
             self.basic.edit_solution(None)
         else:
-            self.kociemba_solver.compute_solution(event.state_str,
-                                                  lambda sol: self.kociemba.edit_solution(sol, fg="black"))
-            self.basic_solver.compute_solution(event.state_str, event.prev_move,
-                                               lambda sol: self.basic.edit_solution(sol, fg="black"))
+            # Solutions are computed in the background, previous ones are greyed out meanwhile
+            self.kociemba.solution.config(fg="grey")
+            self.basic.solution.config(fg="grey")
+            self.solver_executor.submit("kociemba", self.kociemba_solver, event.state_str, event.prev_move)
+            self.solver_executor.submit("basic", self.basic_solver, event.state_str, event.prev_move)
+
+    def on_solver_finished(self, event):
+        controls = {"kociemba": self.kociemba, "basic": self.basic}[event.solver]
+        if event.error is not None:
+            self.solutions[event.solver] = []
+            controls.edit_solution([f"Error: {event.error}"], fg="red")
+        else:
+            self.solutions[event.solver] = event.moves
+            controls.edit_solution(event.moves, fg="black")
 
     def apply_all_moves(self, moves):
         for move in moves:
@@ -163,11 +184,11 @@ class Dashboard(tk.Tk):
                 Event(origin=Event.TKINTER, type=Event.CUBE_MOVE_FACE, face=move)
             )
 
-    def apply_next_move(self, solver):
+    def apply_next_move(self, name):
         # TODO check animation queue to avoid redoing same move
-        move = solver.get_next_move()
-        self.event_hub.raise_event(Event(origin=Event.TKINTER, type=Event.CUBE_MOVE_FACE,
-                                         face=move))
+        if self.solutions[name]:
+            self.event_hub.raise_event(Event(origin=Event.TKINTER, type=Event.CUBE_MOVE_FACE,
+                                             face=self.solutions[name][0]))
 
     def _add_events_raisers(self):
         # Adds all callbacks to hook Tkinter events to event_hub
@@ -235,16 +256,17 @@ class Dashboard(tk.Tk):
                               Event(origin=Event.TKINTER, type=Event.CUBE_MOVE_FACE, face="R'")))
 
         self.kociemba.forward.bind("<Button>",
-                                   lambda ev: self.apply_next_move(self.kociemba_solver))
+                                   lambda ev: self.apply_next_move("kociemba"))
         self.kociemba.fastforward.bind("<Button>",
-                                       lambda ev: self.apply_all_moves(self.kociemba_solver.get_all_moves()))
+                                       lambda ev: self.apply_all_moves(self.solutions["kociemba"]))
         self.basic.forward.bind("<Button>",
-                                lambda ev: self.apply_next_move(self.basic_solver))
+                                lambda ev: self.apply_next_move("basic"))
 
         self.basic.fastforward.bind("<Button>",
-                                    lambda ev: self.apply_all_moves(self.basic_solver.get_all_moves()))
+                                    lambda ev: self.apply_all_moves(self.solutions["basic"]))
 
     def _add_listeners(self):
-        self.event_hub.add_callback(Event.QUIT, lambda ev: self.quit())
+        self.event_hub.add_callback(Event.QUIT, self.on_quit)
         self.event_hub.add_callback(Event.CUBE_STATE_CHANGED, self.on_state_changed)
+        self.event_hub.add_callback(Event.SOLVER_FINISHED, self.on_solver_finished)
         self.event_hub.add_callback(Event.CAMERA_TOGGLE_ROT, self.rot_toggle.toggle)
@@ -7,6 +7,9 @@ from pygame.locals import *
 
 from events_hub import EventsHub, Event
 
+# The window content was lost (uncovered, restored or resized): it has to be drawn again
+EXPOSE_EVENTS = {pg.VIDEOEXPOSE, pg.VIDEORESIZE, pg.WINDOWEXPOSED}
+
 
 class OpenGLApp:
     """Create a basic OpenGL window using pygame."""
@@ -97,21 +100,29 @@ class OpenGLApp:
                 raise ValueError(f"Unknown animation key {source}")
             self.event_hub.raise_event(event)
 
-    def _gather_events(self, newframe_event):
-        """Read input events in pygame and register them to event_hub"""
+    def gather_events(self, newframe_event=None):
+        """Read input events in pygame and register them to event_hub.
+        Returns whether the window has to be drawn again (see EXPOSE_EVENTS)."""
+        exposed = False
         if not self.closed:
             for pg_event in pg.event.get():
+                exposed |= pg_event.type in EXPOSE_EVENTS
                 event = self._pygame_event_to_event(pg_event)
                 if event is not None:
                     self.event_hub.raise_event(event)
             self._add_animation_events()
+        return exposed
+
+    def is_interacting(self):
+        """Whether arrow keys or the mouse button are held, moving the camera on each frame."""
+        return len(self._start_animation_events) > 0
 
     def close(self, close_event):
         self.closed = True
         pg.quit()
 
     def _add_listeners(self):
-        self.event_hub.add_callback(Event.NEWFRAME, self._gather_events)
+        self.event_hub.add_callback(Event.NEWFRAME, self.gather_events)
         self.event_hub.add_callback(Event.QUIT, self.close)
 
     def draw_frame(self, cube):
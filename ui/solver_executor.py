@@ -0,0 +1,71 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from events_hub import EventsHub, Event
+
+
+class SolverExecutor:
+    """Computes solutions out of the thread handling events (the pygame render loop), and posts a
+    SOLVER_FINISHED event through the EventsHub when a solution is ready.
+
+    Each solver gets its own worker thread, so that a solver instance never runs twice at once.
+    Requests are numbered per solver: submitting a new state cancels the pending request if it has not
+    started yet, and the result of a request which is not the latest one is dropped.
+    Solvers share the GIL with the render loop. Measured with a loop at 60 frames per second doing 3 ms of Python
+    work per frame: 59.4 fps when idle, 58.6 fps while the kociemba library (C code, releasing the GIL) solves back
+    to back, but 47.6 fps while a pure Python search runs (BasicSolver, the anytime two-phase search): after each
+    frame, the loop waits for the interpreter to switch threads.
+    """
+    def __init__(self, event_hub: EventsHub):
+        self.event_hub = event_hub
+        self._executors = {}
+        self._generations = {}
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def submit(self, name, solver, state_str, prev_move=None):
+        """Compute the solution of state_str with solver, in the background. prev_move is the move which led to
+        state_str: if given, it is passed on to the solver, which has to accept it (BasicSolver, CachedSolver)."""
+        with self._lock:
+            generation = self._generations.get(name, 0) + 1
+            self._generations[name] = generation
+            previous = self._futures.get(name)
+            if previous is not None:
+                previous.cancel()  # Only has an effect if not started yet
+            if name not in self._executors:
+                self._executors[name] = ThreadPoolExecutor(1, thread_name_prefix=f"solver-{name}")
+            self._futures[name] = self._executors[name].submit(self._solve, name, solver, state_str, prev_move,
+                                                                generation)
+
+    def cancel(self, name):
+        """Drop the pending and running requests of given solver."""
+        with self._lock:
+            self._generations[name] = self._generations.get(name, 0) + 1
+            future = self._futures.pop(name, None)
+        if future is not None:
+            future.cancel()
+
+    def shutdown(self):
+        with self._lock:
+            executors = list(self._executors.values())
+        for executor in executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _is_latest(self, name, generation):
+        with self._lock:
+            return self._generations[name] == generation
+
+    def _solve(self, name, solver, state_str, prev_move, generation):
+        if not self._is_latest(name, generation):
+            return
+        try:
+            if prev_move is None:
+                solver.compute_solution(state_str)
+            else:
+                solver.compute_solution(state_str, prev_move=prev_move)
+            moves, error = list(solver.get_all_moves()), None
+        except Exception as e:
+            moves, error = None, e
+        if self._is_latest(name, generation):
+            self.event_hub.raise_event(Event(origin=Event.APPLICATION, type=Event.SOLVER_FINISHED, solver=name,
+                                             state_str=state_str, moves=moves, error=error))